@@ -0,0 +1,59 @@
+"""add post likes/comments counters
+
+Revision ID: 5c1e7a9d2f4b
+Revises: 193ed6b1bf5d
+Create Date: 2025-10-18 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c1e7a9d2f4b"
+down_revision = "193ed6b1bf5d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "posts",
+        sa.Column("likes_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "posts",
+        sa.Column("comments_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Backfill counters from the existing child rows
+    op.execute(
+        """
+        UPDATE posts
+        SET likes_count = counts.total
+        FROM (
+            SELECT post_id, COUNT(*) AS total
+            FROM post_likes
+            GROUP BY post_id
+        ) AS counts
+        WHERE posts.id = counts.post_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE posts
+        SET comments_count = counts.total
+        FROM (
+            SELECT post_id, COUNT(*) AS total
+            FROM post_comments
+            GROUP BY post_id
+        ) AS counts
+        WHERE posts.id = counts.post_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("posts", "comments_count")
+    op.drop_column("posts", "likes_count")
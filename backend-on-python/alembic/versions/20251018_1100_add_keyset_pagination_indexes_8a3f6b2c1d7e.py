@@ -0,0 +1,44 @@
+"""add keyset pagination indexes for posts and comments
+
+Revision ID: 8a3f6b2c1d7e
+Revises: 5c1e7a9d2f4b
+Create Date: 2025-10-18 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8a3f6b2c1d7e"
+down_revision = "5c1e7a9d2f4b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_posts_created_at_id",
+        "posts",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_posts_author_id_created_at_id",
+        "posts",
+        ["author_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_post_comments_post_id_created_at_id",
+        "post_comments",
+        ["post_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_post_comments_post_id_created_at_id", table_name="post_comments")
+    op.drop_index("ix_posts_author_id_created_at_id", table_name="posts")
+    op.drop_index("ix_posts_created_at_id", table_name="posts")
@@ -0,0 +1,47 @@
+"""add posts full-text search vector
+
+Revision ID: c4d2e8f1a9b3
+Revises: 8a3f6b2c1d7e
+Create Date: 2025-10-18 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4d2e8f1a9b3"
+down_revision = "8a3f6b2c1d7e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "posts",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('english'::regconfig, content)"
+                " || to_tsvector('russian'::regconfig, content)"
+                " || to_tsvector('simple'::regconfig, content)",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_posts_search_vector",
+        "posts",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade():
+    op.drop_index("ix_posts_search_vector", table_name="posts")
+    op.drop_column("posts", "search_vector")
@@ -0,0 +1,81 @@
+"""add GIN and composite indexes for array filters and hot foreign keys
+
+Revision ID: e7b9c3a5d1f2
+Revises: c4d2e8f1a9b3
+Create Date: 2025-10-18 13:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7b9c3a5d1f2"
+down_revision = "c4d2e8f1a9b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Array overlap (&&) filters
+    op.create_index("ix_posts_tags", "posts", ["tags"], unique=False, postgresql_using="gin")
+    op.create_index(
+        "ix_posts_mentions", "posts", ["mentions"], unique=False, postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_users_interests", "users", ["interests"], unique=False, postgresql_using="gin"
+    )
+
+    # Drop duplicate likes before enforcing uniqueness, then resync the counters
+    op.execute(
+        """
+        DELETE FROM post_likes a
+        USING post_likes b
+        WHERE a.post_id = b.post_id
+          AND a.user_id = b.user_id
+          AND a.id > b.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE posts
+        SET likes_count = (
+            SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id
+        )
+        """
+    )
+    op.create_index(
+        "ix_post_likes_post_id_user_id",
+        "post_likes",
+        ["post_id", "user_id"],
+        unique=True,
+    )
+
+    # post_comments.post_id is already covered by ix_post_comments_post_id_created_at_id
+    op.create_index(
+        "ix_test_submission_user_id_test_id",
+        "test_submission",
+        ["user_id", "test_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_test_submission_question_submission_id",
+        "test_submission_question",
+        ["submission_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_questions_test_id_order", "questions", ["test_id", "order"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_questions_test_id_order", table_name="questions")
+    op.drop_index(
+        "ix_test_submission_question_submission_id",
+        table_name="test_submission_question",
+    )
+    op.drop_index("ix_test_submission_user_id_test_id", table_name="test_submission")
+    op.drop_index("ix_post_likes_post_id_user_id", table_name="post_likes")
+    op.drop_index("ix_users_interests", table_name="users")
+    op.drop_index("ix_posts_mentions", table_name="posts")
+    op.drop_index("ix_posts_tags", table_name="posts")
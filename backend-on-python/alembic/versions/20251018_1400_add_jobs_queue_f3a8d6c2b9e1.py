@@ -0,0 +1,80 @@
+"""add jobs queue and test submission analysis status
+
+Revision ID: f3a8d6c2b9e1
+Revises: e7b9c3a5d1f2
+Create Date: 2025-10-18 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3a8d6c2b9e1"
+down_revision = "e7b9c3a5d1f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "RUNNING", "SUCCEEDED", "FAILED", name="job_status_enum"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "run_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_jobs_id"), "jobs", ["id"], unique=False)
+    op.create_index(
+        "ix_jobs_pending_run_at",
+        "jobs",
+        ["run_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+    analysis_status = sa.Enum(
+        "PENDING", "RUNNING", "COMPLETED", "FAILED", name="testsubmissionanalysisstatus"
+    )
+    analysis_status.create(op.get_bind())
+    op.add_column(
+        "test_submission",
+        sa.Column("analysis_status", analysis_status, nullable=True),
+    )
+    # Submissions analysed inline before the queue existed
+    op.execute(
+        """
+        UPDATE test_submission
+        SET analysis_status = 'COMPLETED'
+        WHERE analysis_summary IS NOT NULL
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("test_submission", "analysis_status")
+    sa.Enum(name="testsubmissionanalysisstatus").drop(op.get_bind())
+    op.drop_index("ix_jobs_pending_run_at", table_name="jobs")
+    op.drop_index(op.f("ix_jobs_id"), table_name="jobs")
+    op.drop_table("jobs")
+    sa.Enum(name="job_status_enum").drop(op.get_bind())
@@ -0,0 +1,46 @@
+"""add llm response cache
+
+Revision ID: a9c4e2f7b3d8
+Revises: f3a8d6c2b9e1
+Create Date: 2025-10-18 15:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a9c4e2f7b3d8"
+down_revision = "f3a8d6c2b9e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("family", sa.String(), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("response", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("hit_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        "ix_llm_response_cache_expires_at", "llm_response_cache", ["expires_at"], unique=False
+    )
+    op.create_index(
+        "ix_llm_response_cache_family", "llm_response_cache", ["family"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_llm_response_cache_family", table_name="llm_response_cache")
+    op.drop_index("ix_llm_response_cache_expires_at", table_name="llm_response_cache")
+    op.drop_table("llm_response_cache")
@@ -0,0 +1,67 @@
+"""add institution catalog indexes
+
+Revision ID: b5e1d9a3c7f4
+Revises: a9c4e2f7b3d8
+Create Date: 2025-10-18 16:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b5e1d9a3c7f4"
+down_revision = "a9c4e2f7b3d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Keyset pagination over (name, id), unfiltered and per country or city
+    op.create_index("ix_institutions_name_id", "institutions", ["name", "id"], unique=False)
+    op.create_index(
+        "ix_institutions_country_id_name_id",
+        "institutions",
+        ["country_id", "name", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_institutions_city_id_name_id", "institutions", ["city_id", "name", "id"], unique=False
+    )
+    op.create_index(
+        "ix_institutions_name_trgm",
+        "institutions",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+    op.create_index(
+        "ix_institution_majors_institution_id", "institution_majors", ["institution_id"], unique=False
+    )
+    op.create_index(
+        "ix_institution_majors_category_institution_id",
+        "institution_majors",
+        ["category", "institution_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_institution_majors_learning_language_institution_id",
+        "institution_majors",
+        ["learning_language", "institution_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_institution_majors_learning_language_institution_id", table_name="institution_majors"
+    )
+    op.drop_index("ix_institution_majors_category_institution_id", table_name="institution_majors")
+    op.drop_index("ix_institution_majors_institution_id", table_name="institution_majors")
+    op.drop_index("ix_institutions_name_trgm", table_name="institutions")
+    op.drop_index("ix_institutions_city_id_name_id", table_name="institutions")
+    op.drop_index("ix_institutions_country_id_name_id", table_name="institutions")
+    op.drop_index("ix_institutions_name_id", table_name="institutions")
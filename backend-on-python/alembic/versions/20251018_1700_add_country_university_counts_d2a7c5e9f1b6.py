@@ -0,0 +1,87 @@
+"""add trigger-maintained country university counts
+
+Revision ID: d2a7c5e9f1b6
+Revises: b5e1d9a3c7f4
+Create Date: 2025-10-18 17:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d2a7c5e9f1b6"
+down_revision = "b5e1d9a3c7f4"
+branch_labels = None
+depends_on = None
+
+# Statement-level triggers aggregate the transition tables, so a bulk import
+# touches each country's counter once per statement rather than once per row.
+COUNT_FUNCTION = """
+CREATE FUNCTION apply_country_university_counts() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO country_university_counts AS c (country_id, universities_count)
+        SELECT country_id, count(*) FROM new_rows GROUP BY country_id
+        ON CONFLICT (country_id)
+        DO UPDATE SET universities_count = c.universities_count + EXCLUDED.universities_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE country_university_counts AS c
+        SET universities_count = c.universities_count - d.n
+        FROM (SELECT country_id, count(*) AS n FROM old_rows GROUP BY country_id) AS d
+        WHERE c.country_id = d.country_id;
+    ELSE
+        INSERT INTO country_university_counts AS c (country_id, universities_count)
+        SELECT country_id, sum(n) FROM (
+            SELECT country_id, count(*) AS n FROM new_rows GROUP BY country_id
+            UNION ALL
+            SELECT country_id, -count(*) FROM old_rows GROUP BY country_id
+        ) AS d
+        GROUP BY country_id
+        HAVING sum(n) <> 0
+        ON CONFLICT (country_id)
+        DO UPDATE SET universities_count = c.universities_count + EXCLUDED.universities_count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = {
+    "institutions_country_counts_insert": "AFTER INSERT ON institutions REFERENCING NEW TABLE AS new_rows",
+    "institutions_country_counts_delete": "AFTER DELETE ON institutions REFERENCING OLD TABLE AS old_rows",
+    "institutions_country_counts_update": (
+        "AFTER UPDATE ON institutions REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    ),
+}
+
+
+def upgrade():
+    op.create_table(
+        "country_university_counts",
+        sa.Column("country_id", sa.BigInteger(), nullable=False),
+        sa.Column("universities_count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["country_id"], ["countries.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("country_id"),
+    )
+    op.execute(COUNT_FUNCTION)
+    for name, timing in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {timing} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION apply_country_university_counts()"
+        )
+    op.execute(
+        """
+        INSERT INTO country_university_counts (country_id, universities_count)
+        SELECT country_id, count(*) FROM institutions GROUP BY country_id
+        """
+    )
+
+
+def downgrade():
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON institutions")
+    op.execute("DROP FUNCTION apply_country_university_counts()")
+    op.drop_table("country_university_counts")
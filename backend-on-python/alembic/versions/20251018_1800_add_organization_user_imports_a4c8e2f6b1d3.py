@@ -0,0 +1,63 @@
+"""add organization user imports
+
+Revision ID: a4c8e2f6b1d3
+Revises: d2a7c5e9f1b6
+Create Date: 2025-10-18 18:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a4c8e2f6b1d3"
+down_revision = "d2a7c5e9f1b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "organization_user_imports",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("organization_id", sa.BigInteger(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "PENDING",
+                "RUNNING",
+                "COMPLETED",
+                "FAILED",
+                name="organization_user_import_status_enum",
+            ),
+            nullable=False,
+        ),
+        sa.Column("processed_rows", sa.Integer(), nullable=False),
+        sa.Column("created_count", sa.Integer(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+        sa.Column("errors", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("detail", sa.Text(), nullable=True),
+        sa.Column("content", sa.LargeBinary(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_organization_user_imports_organization_id"),
+        "organization_user_imports",
+        ["organization_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_organization_user_imports_organization_id"),
+        table_name="organization_user_imports",
+    )
+    op.drop_table("organization_user_imports")
+    sa.Enum(name="organization_user_import_status_enum").drop(op.get_bind())
@@ -17,6 +17,7 @@
 import logging.config
 from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from pydantic import AnyHttpUrl, BaseModel, Field, SecretStr, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -31,9 +32,17 @@ class Security(BaseModel):
     jwt_session_token_expire_secs: int = 24 * 3600  # 1d
     refresh_token_expire_secs: int = 28 * 24 * 3600  # 28d
     password_bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    # Processes hashing bulk-imported passwords at full cost; None means one per CPU.
+    # Imports run in the jobs worker, so they do not take CPU from API logins.
+    password_import_hash_workers: Optional[int] = None
+    password_hash_max_queue: int = 64
+    password_hash_queue_timeout_secs: float = 10.0
+    session_check_ttl_secs: int = 30
+    user_profile_cache_ttl_secs: int = 60
     allowed_hosts: list[str] = ["localhost", "127.0.0.1"]
     backend_cors_origins: list[AnyHttpUrl] = []
-    public_paths: list[str] = ["/docs", "/openapi.json", "/auth"]
+    public_paths: list[str] = ["/docs", "/openapi.json", "/api/v1/auth"]
 
 
 class Database(BaseModel):
@@ -49,6 +58,46 @@ class LLM(BaseModel):
     max_universities_for_analysis: int = 10
     model: str = "gpt-3.5-turbo"
     max_tokens: int = 4096
+    # Prompt + completion limit of the model; university analyses are packed to fit it
+    context_window_tokens: int = 16385
+    # Completion tokens reserved per analyzed institution, bounding institutions per call
+    output_tokens_per_institution: int = 700
+    # Institutions per university analysis completion; 1 fans out one request per institution
+    institutions_per_analysis_call: int = 1
+    # Concurrent completions of one university analysis, within max_concurrent_requests
+    analysis_fan_out: int = 8
+    # Point at app/scripts/fake_llm_server.py for local tests and load benchmarks
+    base_url: Optional[str] = None
+    max_concurrent_requests: int = 16
+    max_connections: int = 32
+    request_timeout_secs: float = 60.0
+    max_retries: int = 3
+    retry_base_delay_secs: float = 0.5
+    retry_max_delay_secs: float = 8.0
+
+
+class Jobs(BaseModel):
+    # Run a queue worker inside every API process; turn off when app/scripts/run_jobs_worker.py
+    # is deployed on its own
+    run_in_app: bool = True
+    concurrency: int = 4
+    poll_interval_secs: float = 1.0
+    max_attempts: int = 5
+    retry_base_delay_secs: float = 5.0
+    retry_max_delay_secs: float = 600.0
+    # RUNNING jobs whose worker has not finished within this window are picked up again
+    lock_timeout_secs: int = 300
+
+
+class Cache(BaseModel):
+    # Upper bound on staleness of the process-local test content snapshot
+    test_content_ttl_secs: int = 300
+    llm_response_ttl_secs: int = 7 * 24 * 3600  # 7d
+    llm_response_memory_entries: int = 1024
+    # Upper bound on staleness of the process-local country counts
+    country_counts_ttl_secs: int = 60
+    # Upper bound on staleness of the process-local ranking features
+    institution_features_ttl_secs: int = 3600
 
 
 class PG(BaseModel):
@@ -59,6 +108,8 @@ class Settings(BaseSettings):
     security: Security = Field(default_factory=Security)
     database: Database = Field(default_factory=Database)
     llm: LLM = Field(default_factory=LLM)
+    cache: Cache = Field(default_factory=Cache)
+    jobs: Jobs = Field(default_factory=Jobs)
     pg: PG = Field(default_factory=PG)
 
     log_level: str = "DEBUG"
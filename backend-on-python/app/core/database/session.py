@@ -8,6 +8,11 @@ _ASYNC_SESSIONMAKER = async_sessionmaker(
 )
 
 
+def new_async_session() -> AsyncSession:
+    # For work that outlives the request, e.g. background imports
+    return _ASYNC_SESSIONMAKER()
+
+
 async def get_async_session():
     async with _ASYNC_SESSIONMAKER() as session:
         try:
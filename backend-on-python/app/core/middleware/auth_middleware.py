@@ -1,33 +1,49 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+import re
+
+from fastapi import HTTPException
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Receive, Scope, Send
+
 from app.core.config.config import get_settings
+from app.core.utils.auth_utils import decode_session_token
 
-from app.core.utils.auth_utils import get_current_user
-from app.core.models.users_model import UserRole, SubscriptionType
 
+class AuthMiddleware:
+    """
+    Pure ASGI middleware that decodes the session cookie once per request.
+
+    Puts `session_token`, `claims` (or None) and `auth_error` into
+    `scope["state"]`, where `get_current_claims` picks them up instead of
+    decoding again. Requests under `security.public_paths` are passed through
+    untouched. The middleware never rejects a request itself; endpoints decide
+    whether identity is required.
+    """
 
-class AuthMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next):
-        settings = get_settings()
-        for path_prefix in settings.security.public_paths:
-            if request.url.path.startswith(path_prefix):
-                response = await call_next(request)
-                return response
-
-        claims = get_current_user(request)
-        if claims:
-            request.state.user_id = int(claims.get("sub"))
-            request.state.user_role = UserRole(claims.get("role"))
-            request.state.user_subscription = SubscriptionType(claims.get("subscription"))
-        else:
-            request.state.user_id = None
-            request.state.user_role = None
-            request.state.user_subscription = None
-
-        response = await call_next(request)
-        return response
+        self.app = app
+        prefixes = get_settings().security.public_paths
+        self._public_paths = re.compile(
+            "|".join(re.escape(prefix) for prefix in prefixes) if prefixes else r"(?!)"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self._public_paths.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        session_token = None
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                session_token = cookie_parser(value.decode("latin-1")).get("session_token")
+                break
+
+        state = scope.setdefault("state", {})
+        state["session_token"] = session_token
+        try:
+            state["claims"] = decode_session_token(session_token)
+            state["auth_error"] = None
+        except HTTPException as exc:
+            state["claims"] = None
+            state["auth_error"] = exc.detail
+
+        await self.app(scope, receive, send)
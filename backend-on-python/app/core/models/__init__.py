@@ -1,13 +1,15 @@
 from .base import Base, TimestampMixin
 from .users_model import User, UserSession, UserRole, SubscriptionType, UserAcademic, UserLanguageProficiency, LanguageLevel
-from .organizations_model import Organization, OrganizationUser, OrganizationGroup, OrganizationSubscriptionType, OrganizationUserRole
+from .organizations_model import Organization, OrganizationUser, OrganizationGroup, OrganizationSubscriptionType, OrganizationUserRole, OrganizationUserImport, OrganizationUserImportStatus
 from .countries_model import Country
 from .cities_model import City
 from .interests_model import InterestsEnum
 from .posts_model import Post, Comment, PostLike
 from .tests_models import Test, Question, Answer, TestSubmission, TestSubmissionQuestion
-from .tests_models import PersonalityAnalysis, PersonalityAnalysisAttributeType, PersonalityAnalysisAttributes, PersonalityAnalysisMajors, PersonalityAnalysisMbti, PersonalityAnalysisProfessions, TestSubmissionStatus 
+from .tests_models import PersonalityAnalysis, PersonalityAnalysisAttributeType, PersonalityAnalysisAttributes, PersonalityAnalysisMajors, PersonalityAnalysisMbti, PersonalityAnalysisProfessions, TestSubmissionStatus, TestSubmissionAnalysisStatus
 from .universities_models import InstitutionFinancingType, InstitutionMajorCategory, InstitutionType, EnrollmentRequirementType
-from .universities_models import Institution, InstitutionMajor, InstitutionEnrollmentDocument, InstitutionEnrollmentRequirement
+from .universities_models import Institution, InstitutionMajor, InstitutionEnrollmentDocument, InstitutionEnrollmentRequirement, CountryUniversityCount
 from .universities_models import  UniversitiesAnalysis, UniversitiesAnalysisInstitutes, UniversitiesAnalysisResultsAttributes, UniversitiesAnalysisResultsPlan, AttributeType
 from .professions_model import Professions
+from .jobs_model import Job, JobStatus
+from .llm_cache_model import LLMResponseCache
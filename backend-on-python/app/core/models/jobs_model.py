@@ -0,0 +1,36 @@
+import enum
+
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.models.base import Base
+
+
+class JobStatus(enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class Job(Base):
+    """Durable background work item, claimed by workers with FOR UPDATE SKIP LOCKED."""
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(Enum(JobStatus, name="job_status_enum"), nullable=False, default=JobStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Only due work is ever scanned, so keep the claim index to pending rows
+        Index("ix_jobs_pending_run_at", run_at, postgresql_where=text("status = 'PENDING'")),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.models.base import Base
+
+
+class LLMResponseCache(Base):
+    """Validated LLM responses keyed by a hash of (model, system, user, schema)."""
+
+    __tablename__ = "llm_response_cache"
+
+    key = Column(String(64), primary_key=True)
+    family = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    response = Column(JSONB, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_llm_response_cache_expires_at", expires_at),
+        Index("ix_llm_response_cache_family", family),
+    )
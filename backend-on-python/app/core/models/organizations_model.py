@@ -1,8 +1,9 @@
 from enum import Enum
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import BigInteger, ForeignKey, String
+from sqlalchemy import BigInteger, ForeignKey, Integer, LargeBinary, String, Text
 from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from app.core.models.base import Base, TimestampMixin
@@ -23,6 +24,13 @@ class OrganizationUserRole(str, Enum):
     STUDENT = "STUDENT"
 
 
+class OrganizationUserImportStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
 class Organization(Base, TimestampMixin):
     __tablename__ = "organizations"
 
@@ -80,3 +88,27 @@ class OrganizationGroup(Base, TimestampMixin):
     organization_users: Mapped[List["OrganizationUser"]] = relationship(
         "OrganizationUser", back_populates="group"
     )
+
+
+class OrganizationUserImport(Base, TimestampMixin):
+    """Spreadsheet roster upload, processed by the job worker; progress is polled from here."""
+
+    __tablename__ = "organization_user_imports"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    organization_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("organizations.id", ondelete="CASCADE"), index=True
+    )
+    filename: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[OrganizationUserImportStatus] = mapped_column(
+        SQLEnum(OrganizationUserImportStatus, name="organization_user_import_status_enum", create_type=True),
+        default=OrganizationUserImportStatus.PENDING,
+        nullable=False,
+    )
+    processed_rows: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    errors: Mapped[list] = mapped_column(JSONB, default=list, nullable=False)
+    detail: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # The uploaded file until the import finishes; deferred so progress polls never load it
+    content: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
@@ -1,7 +1,7 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, String, DateTime, ForeignKey, Index, Text
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.models.base import Base
 
@@ -14,6 +14,22 @@ class Post(Base):
     content = Column(Text, nullable=False)
     tags = Column(ARRAY(String), default=[])
     mentions = Column(ARRAY(String), default=[]) # New field for mentions
+    # Denormalized counters, maintained by PostsRepository alongside likes/comments writes
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Full-text index over content, stemmed for English and Russian; "simple" covers Kazakh,
+    # which has no stemmer shipped with Postgres. Deferred so feed queries never fetch it.
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "to_tsvector('english'::regconfig, content)"
+                " || to_tsvector('russian'::regconfig, content)"
+                " || to_tsvector('simple'::regconfig, content)",
+                persisted=True,
+            ),
+        )
+    )
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -24,6 +40,16 @@ class Post(Base):
     #for user preloading
     author_user = relationship("User", back_populates="posts")
 
+    __table_args__ = (
+        # Keyset pagination for the feed, globally and per author
+        Index("ix_posts_created_at_id", created_at.desc(), id.desc()),
+        Index("ix_posts_author_id_created_at_id", author_id, created_at.desc(), id.desc()),
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+        # Array overlap (&&) filters on tags and mentions
+        Index("ix_posts_tags", tags, postgresql_using="gin"),
+        Index("ix_posts_mentions", mentions, postgresql_using="gin"),
+    )
+
 
 
 class Comment(Base):
@@ -39,6 +65,10 @@ class Comment(Base):
     post = relationship("Post", back_populates="comments")
     user = relationship("User", back_populates="comments")
 
+    __table_args__ = (
+        Index("ix_post_comments_post_id_created_at_id", post_id, created_at, id),
+    )
+
 
 class PostLike(Base):
     __tablename__ = "post_likes"
@@ -50,3 +80,8 @@ class PostLike(Base):
 
     post = relationship("Post", back_populates="likes")
     user = relationship("User", back_populates="likes")
+
+    __table_args__ = (
+        # One like per user per post; also serves the viewer's like-state lookups
+        Index("ix_post_likes_post_id_user_id", post_id, user_id, unique=True),
+    )
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Enum,
     Text,
     DateTime,
+    Index,
     func,
 )
 from sqlalchemy.dialects.postgresql import ARRAY
@@ -24,6 +25,13 @@ class TestSubmissionStatus(enum.Enum):
     NOT_STARTED = "NOT_STARTED"
 
 
+class TestSubmissionAnalysisStatus(enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
 class PersonalityAnalysisAttributeType(enum.Enum):
     PROS = "PROS"
     CONS = "CONS"
@@ -38,7 +46,7 @@ class Test(Base):
     tags = Column(ARRAY(String))
     estimated_time_minutes = Column(Integer)
 
-    questions = relationship("Question", back_populates="test")
+    questions = relationship("Question", back_populates="test", order_by="Question.order")
     submissions = relationship("TestSubmission", back_populates="test")
 
 
@@ -51,7 +59,11 @@ class Question(Base):
     order = Column(Integer, nullable=False)
 
     test = relationship("Test", back_populates="questions")
-    answers = relationship("Answer", back_populates="question")
+    answers = relationship("Answer", back_populates="question", order_by="Answer.id")
+
+    __table_args__ = (
+        Index("ix_questions_test_id_order", test_id, order),
+    )
 
 
 class Answer(Base):
@@ -74,11 +86,17 @@ class TestSubmission(Base):
     status = Column(Enum(TestSubmissionStatus), nullable=False)
     analysis_summary = Column(Text)
     analysis_key_factors = Column(ARRAY(String))
+    # Short analysis runs as a background job once the last answer is in
+    analysis_status = Column(Enum(TestSubmissionAnalysisStatus))
 
     test = relationship("Test", back_populates="submissions")
     user = relationship("User")
     submitted_answers = relationship(
-        "TestSubmissionQuestion", back_populates="submission"
+        "TestSubmissionQuestion", back_populates="submission", order_by="TestSubmissionQuestion.id"
+    )
+
+    __table_args__ = (
+        Index("ix_test_submission_user_id_test_id", user_id, test_id),
     )
 
 
@@ -94,6 +112,10 @@ class TestSubmissionQuestion(Base):
     question = relationship("Question")
     answer = relationship("Answer")
 
+    __table_args__ = (
+        Index("ix_test_submission_question_submission_id", submission_id),
+    )
+
 
 class PersonalityAnalysis(Base):
     __tablename__ = "personality_analysis"
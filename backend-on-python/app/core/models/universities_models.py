@@ -1,6 +1,7 @@
 import enum
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
@@ -11,6 +12,7 @@ from sqlalchemy import (
     DateTime,
     func,
     Text,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -82,6 +84,34 @@ class Institution(Base):
         "UniversitiesAnalysisInstitutes", back_populates="institution"
     )
 
+    __table_args__ = (
+        # Keyset pagination of the catalog, unfiltered and per country or city
+        Index("ix_institutions_name_id", "name", "id"),
+        Index("ix_institutions_country_id_name_id", "country_id", "name", "id"),
+        Index("ix_institutions_city_id_name_id", "city_id", "name", "id"),
+        # Substring search on name (ILIKE '%...%')
+        Index(
+            "ix_institutions_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
+
+class CountryUniversityCount(Base):
+    """
+    Institutions per country, kept current by statement-level triggers on
+    institutions (see migration d2a7c5e9f1b6); read instead of aggregating.
+    """
+
+    __tablename__ = "country_university_counts"
+
+    country_id = Column(
+        BigInteger, ForeignKey("countries.id", ondelete="CASCADE"), primary_key=True
+    )
+    universities_count = Column(Integer, nullable=False, default=0, server_default="0")
+
 
 class InstitutionMajor(Base):
     __tablename__ = "institution_majors"
@@ -97,6 +127,17 @@ class InstitutionMajor(Base):
 
     institution = relationship("Institution", back_populates="majors")
 
+    __table_args__ = (
+        Index("ix_institution_majors_institution_id", "institution_id"),
+        # Major filters and facets of the catalog
+        Index("ix_institution_majors_category_institution_id", "category", "institution_id"),
+        Index(
+            "ix_institution_majors_learning_language_institution_id",
+            "learning_language",
+            "institution_id",
+        ),
+    )
+
 
 class InstitutionEnrollmentDocument(Base):
     __tablename__ = "institution_enrollment_documents"
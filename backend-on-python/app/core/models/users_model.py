@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, String, Text, Float
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, Text, Float
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, relationship, mapped_column
@@ -112,6 +112,10 @@ class User(Base, TimestampMixin):
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        Index("ix_users_interests", "interests", postgresql_using="gin"),
+    )
+
 
 class UserAcademic(Base):
     __tablename__ = "users_academic"
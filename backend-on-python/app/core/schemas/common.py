@@ -1,4 +1,4 @@
-from typing import List, Generic, TypeVar
+from typing import List, Generic, Optional, TypeVar
 from fastapi import Query
 from pydantic import BaseModel, Field
 from pydantic.alias_generators import to_camel
@@ -25,3 +25,14 @@ class PaginatedResponse(BaseSchema, Generic[T]):
     page: int
     page_size: int
     items: List[T]
+
+
+class CursorFilter(BaseSchema):
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor returned as `nextCursor` by the previous page")
+    page_size: int = Query(default=10, ge=1, le=1000, description="Number of items per page")
+
+
+class CursorPaginatedResponse(BaseSchema, Generic[T]):
+    page_size: int
+    next_cursor: Optional[str] = None
+    items: List[T]
@@ -1,12 +1,24 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
 import bcrypt
+from fastapi import HTTPException, status
+
 from app.core.config.config import get_settings
 
 
 def hash_password(password: str) -> str:
-    settings = get_settings()
-    salt = bcrypt.gensalt(rounds=settings.security.password_bcrypt_rounds)
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return password_hash.decode('utf-8')
+    return _bcrypt_hash(password, get_settings().security.password_bcrypt_rounds)
+
+
+def _bcrypt_hash(password: str, rounds: int) -> str:
+    # Also runs in the import processes, so it takes the cost as an argument
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,3 +29,136 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         )
     except Exception:
         return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    # bcrypt hashes look like "$2b$<cost>$<salt+hash>"
+    try:
+        cost = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return cost < get_settings().security.password_bcrypt_rounds
+
+
+# bcrypt releases the GIL, so a small thread pool runs hashes in parallel
+# without ever blocking the event loop.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=get_settings().security.password_hash_workers,
+    thread_name_prefix="bcrypt",
+)
+# Caps running + queued jobs; callers beyond that wait, then get a 503
+_SLOTS = asyncio.Semaphore(
+    get_settings().security.password_hash_workers + get_settings().security.password_hash_max_queue
+)
+
+
+class _PasswordHashMetrics:
+    def __init__(self, window: int = 1000):
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._latencies_ms = deque(maxlen=window)
+
+    def observe(self, latency_ms: float):
+        self.completed += 1
+        self._latencies_ms.append(latency_ms)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self._latencies_ms)
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0.0
+
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_ms_p50": percentile(0.50),
+            "latency_ms_p95": percentile(0.95),
+            "latency_ms_max": latencies[-1] if latencies else 0.0,
+        }
+
+
+_METRICS = _PasswordHashMetrics()
+_IMPORT_METRICS = _PasswordHashMetrics()
+
+
+def get_password_hash_metrics() -> dict:
+    return {**_METRICS.snapshot(), "import": _IMPORT_METRICS.snapshot()}
+
+
+async def _run_in_pool(func, *args):
+    _METRICS.waiting += 1
+    try:
+        await asyncio.wait_for(
+            _SLOTS.acquire(), timeout=get_settings().security.password_hash_queue_timeout_secs
+        )
+    except asyncio.TimeoutError:
+        _METRICS.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry",
+        )
+    finally:
+        _METRICS.waiting -= 1
+
+    _METRICS.running += 1
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, func, *args)
+    finally:
+        _METRICS.running -= 1
+        _METRICS.observe((time.perf_counter() - started) * 1000)
+        _SLOTS.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+_import_executor: Optional[ProcessPoolExecutor] = None
+_import_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_import_pool():
+    # Created on first import, so API processes that never import spawn nothing
+    global _import_executor, _import_slots
+    if _import_executor is None:
+        workers = get_settings().security.password_import_hash_workers or os.cpu_count() or 1
+        _import_executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _import_slots = asyncio.Semaphore(workers)
+    return _import_executor, _import_slots
+
+
+async def _run_import_hash(password: str, rounds: int) -> str:
+    executor, slots = _get_import_pool()
+    _IMPORT_METRICS.waiting += 1
+    try:
+        # Only as many hashes as processes are submitted; the rest of the chunk waits here
+        await slots.acquire()
+    finally:
+        _IMPORT_METRICS.waiting -= 1
+
+    _IMPORT_METRICS.running += 1
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, _bcrypt_hash, password, rounds)
+    finally:
+        _IMPORT_METRICS.running -= 1
+        _IMPORT_METRICS.observe((time.perf_counter() - started) * 1000)
+        slots.release()
+
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    # Bulk imports hash at the full cost on a process pool sized to the CPUs,
+    # so throughput scales with cores instead of the interactive thread pool
+    rounds = get_settings().security.password_bcrypt_rounds
+    return await asyncio.gather(*(_run_import_hash(password, rounds) for password in passwords))
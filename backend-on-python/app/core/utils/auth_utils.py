@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta
-from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID, uuid4
 
@@ -9,6 +8,8 @@ from jose import jwt
 from app.core.config.config import get_settings
 from app.core.database.session import get_async_session
 from app.core.models.users_model import UserRole, SubscriptionType
+from app.core.utils.cache_utils import TTLCache
+from app.modules.auth.auth_repository import AuthRepository
 from app.modules.users.users_repository import UserRepository
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -48,10 +49,29 @@ def clear_auth_cookies(response: Response):
     response.delete_cookie(key="session_token")
 
 
-async def get_current_user(
-    request: Request, session: AsyncSession = Depends(get_async_session)
-) -> dict:
-    session_token = request.cookies.get("session_token")
+# Tokens revoked by this process (logout); kept until they would have expired anyway
+_REVOKED_TOKENS = TTLCache(
+    maxsize=100_000, ttl=get_settings().security.jwt_session_token_expire_secs
+)
+# Tokens whose user_sessions row was recently confirmed, so the table is hit at most once per TTL
+_ACTIVE_SESSIONS = TTLCache(
+    maxsize=100_000, ttl=get_settings().security.session_check_ttl_secs
+)
+_USER_PROFILES = TTLCache(
+    maxsize=10_000, ttl=get_settings().security.user_profile_cache_ttl_secs
+)
+
+
+def revoke_session_token(token: str):
+    _ACTIVE_SESSIONS.pop(token)
+    _REVOKED_TOKENS.set(token, True)
+
+
+def invalidate_user_profile(user_id: int):
+    _USER_PROFILES.pop(user_id)
+
+
+def decode_session_token(session_token: Optional[str]) -> dict:
     if not session_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
@@ -61,39 +81,105 @@ async def get_current_user(
         payload = jwt.decode(
             session_token, settings.security.jwt_secret_key.get_secret_value(), algorithms=["HS256"]
         )
-        user_id: int = int(payload.get("sub"))
-        if user_id is None:
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired"
+        )
+    except jwt.JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        )
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
+        )
+    return {
+        "id": int(payload["sub"]),
+        "role": payload.get("role"),
+        "subscription": payload.get("subscription"),
+    }
+
+
+async def _ensure_session_active(token: str, session: AsyncSession):
+    if token in _REVOKED_TOKENS:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session revoked"
+        )
+    if token in _ACTIVE_SESSIONS:
+        return
+
+    user_session = await AuthRepository(session).get_user_session_by_token(token)
+    if not user_session or user_session.expires_at.replace(tzinfo=None) < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session revoked"
+        )
+    _ACTIVE_SESSIONS.set(token, True)
+
+
+async def get_current_claims(
+    request: Request, session: AsyncSession = Depends(get_async_session)
+) -> dict:
+    """
+    Builds the current-user context from the session token alone.
+
+    The user row is never loaded; the token is only checked against
+    `user_sessions` once per `session_check_ttl_secs`. Claims already
+    decoded by `AuthMiddleware` are reused from the request state.
+    """
+    state = request.scope.get("state", {})
+    if "claims" in state:
+        if state["claims"] is None:
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
+                status_code=status.HTTP_401_UNAUTHORIZED, detail=state["auth_error"]
             )
-        
-        user_repo = UserRepository(session)
-        user = await user_repo.get_user_by_id(user_id)
-        if not user:
+        session_token, claims = state["session_token"], state["claims"]
+    else:
+        session_token = request.cookies.get("session_token")
+        claims = decode_session_token(session_token)
+    await _ensure_session_active(session_token, session)
+    return claims
+
+
+async def get_optional_claims(
+    request: Request, session: AsyncSession = Depends(get_async_session)
+) -> Optional[dict]:
+    """Like `get_current_claims`, but None instead of 401 for anonymous requests."""
+    try:
+        return await get_current_claims(request, session)
+    except HTTPException:
+        return None
+
+
+async def get_current_user(
+    claims: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> dict:
+    """
+    Token claims plus profile fields (names, email) for endpoints that need them.
+
+    Profile rows are cached in-process for `user_profile_cache_ttl_secs`.
+    """
+    profile = _USER_PROFILES.get(claims["id"])
+    if profile is None:
+        users = await UserRepository(session).get_users_by_ids([claims["id"]])
+        if not users:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
             )
-        
+        user = users[0]
+
         organization_name = None
         # if user.organization_id:
         #     organization = await user_repo.get_organization_by_id(user.organization_id) # Assuming this method exists or can be added
         #     if organization:
         #         organization_name = organization.name
 
-        return {
-            "id": user.id,
+        profile = {
             "first_name": user.first_name,
             "last_name": user.last_name,
             "email": user.email,
-            "role": user.role.value,
-            "subscription": user.subscription.value,
             "organization_name": organization_name,
         }
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired"
-        )
-    except jwt.JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-        )
+        _USER_PROFILES.set(claims["id"], profile)
+
+    return {**claims, **profile}
@@ -0,0 +1,27 @@
+import hashlib
+from typing import Optional
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks an If-None-Match header against the current ETag.
+
+    Args:
+        if_none_match: Raw header value; may list several tags or be "*".
+        etag: ETag of the current representation.
+
+    Returns:
+        True if the client's copy is current and a 304 can be sent.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # GET uses weak comparison, so W/"x" matches "x"
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
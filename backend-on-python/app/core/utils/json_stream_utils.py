@@ -0,0 +1,147 @@
+import json
+from typing import Any, List, NamedTuple, Optional
+
+_WHITESPACE = " \t\r\n"
+
+
+class JSONStreamEvent(NamedTuple):
+    """
+    A piece of a JSON object that became complete while streaming.
+
+    Args:
+        key: Top-level member name.
+        value: The member value, or the array element for "item" events.
+        index: Position within the top-level array for "item" events, else None.
+    """
+
+    key: str
+    value: Any
+    index: Optional[int] = None
+
+    @property
+    def is_item(self) -> bool:
+        return self.index is not None
+
+
+class PartialJSONObjectParser:
+    """
+    Incremental parser for a streamed top-level JSON object.
+
+    Text is fed as it arrives; every top-level member is reported as soon as
+    its value is closed, and elements of top-level arrays are reported one by
+    one before the array itself is complete. Only the completed slices are
+    decoded, so each character is scanned once.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # key -> colon -> value -> in_value -> comma, for members of the top-level object
+        self._expecting = "key"
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start = 0
+        self._value_is_array = False
+        self._value_is_scalar = False
+        self._item_start: Optional[int] = None
+        self._item_is_scalar = False
+        # Position of the current element, counted by separators so every element has one
+        self._item_index = 0
+
+    def feed(self, text: str) -> List[JSONStreamEvent]:
+        self.buffer += text
+        events: List[JSONStreamEvent] = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                self._scan_string_char(char, i, events)
+                continue
+            if self._value_is_scalar and (char == "," or (char == "}" and self._depth == 1)):
+                self._emit_member(json.loads(buffer[self._value_start:i]), events)
+            if self._item_is_scalar and self._depth == 2 and char in ",]":
+                self._emit_item(json.loads(buffer[self._item_start:i]), events)
+            if char == '"':
+                self._start_string(i)
+            elif char in "{[":
+                self._open(char, i)
+            elif char in "}]":
+                self._close(i, events)
+            elif self._depth == 1 and char == ":" and self._expecting == "colon":
+                self._expecting = "value"
+            elif self._depth == 1 and char == "," and self._expecting == "comma":
+                self._expecting = "key"
+            elif self._depth == 1 and self._expecting == "value" and char not in _WHITESPACE:
+                self._value_start = i
+                self._value_is_scalar = True
+                self._expecting = "in_value"
+            elif self._depth == 2 and self._value_is_array and char == ",":
+                self._item_index += 1
+            elif (
+                self._depth == 2
+                and self._value_is_array
+                and self._item_start is None
+                and char not in _WHITESPACE
+            ):
+                # A number, true, false or null element; ends at the next "," or "]"
+                self._item_start = i
+                self._item_is_scalar = True
+        self._pos = len(buffer)
+        return events
+
+    def _scan_string_char(self, char: str, i: int, events: List[JSONStreamEvent]) -> None:
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._depth == 1 and self._expecting == "key_end":
+                self._key = json.loads(self.buffer[self._key_start:i + 1])
+                self._expecting = "colon"
+            elif self._depth == 1 and self._expecting == "in_value":
+                self._emit_member(json.loads(self.buffer[self._value_start:i + 1]), events)
+            elif self._depth == 2 and self._value_is_array and self._item_start is not None:
+                self._emit_item(json.loads(self.buffer[self._item_start:i + 1]), events)
+
+    def _start_string(self, i: int) -> None:
+        self._in_string = True
+        if self._depth == 1 and self._expecting == "key":
+            self._key_start = i
+            self._expecting = "key_end"
+        elif self._depth == 1 and self._expecting == "value":
+            self._value_start = i
+            self._expecting = "in_value"
+        elif self._depth == 2 and self._value_is_array:
+            self._item_start = i
+
+    def _open(self, char: str, i: int) -> None:
+        if self._depth == 1 and self._expecting == "value":
+            self._value_start = i
+            self._value_is_array = char == "["
+            self._expecting = "in_value"
+        elif self._depth == 2 and self._value_is_array:
+            self._item_start = i
+        self._depth += 1
+
+    def _close(self, i: int, events: List[JSONStreamEvent]) -> None:
+        self._depth -= 1
+        if self._depth == 2 and self._value_is_array and self._item_start is not None:
+            self._emit_item(json.loads(self.buffer[self._item_start:i + 1]), events)
+        elif self._depth == 1 and self._expecting == "in_value":
+            self._emit_member(json.loads(self.buffer[self._value_start:i + 1]), events)
+
+    def _emit_member(self, value: Any, events: List[JSONStreamEvent]) -> None:
+        events.append(JSONStreamEvent(self._key, value))
+        self._expecting = "comma"
+        self._value_is_array = False
+        self._value_is_scalar = False
+        self._item_index = 0
+
+    def _emit_item(self, value: Any, events: List[JSONStreamEvent]) -> None:
+        events.append(JSONStreamEvent(self._key, value, self._item_index))
+        self._item_start = None
+        self._item_is_scalar = False
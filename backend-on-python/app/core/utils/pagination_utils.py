@@ -1,6 +1,12 @@
-from typing import List, TypeVar, Generic
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple, TypeVar, Generic
 
-from app.core.schemas.common import PaginatedResponse
+from fastapi import HTTPException, status
+
+from app.core.schemas.common import CursorPaginatedResponse, PaginatedResponse
 
 T = TypeVar("T")
 
@@ -23,3 +29,100 @@ def paginate(items: List[T], total: int, page: int, page_size: int) -> Paginated
         page_size=page_size,
         items=items
     )
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    Encodes a keyset position into an opaque, URL-safe cursor.
+
+    Args:
+        created_at: Sort key of the last item on the page.
+        id: Primary key of the last item on the page, used as a tie-breaker.
+
+    Returns:
+        The encoded cursor string.
+    """
+    raw = json.dumps([created_at.isoformat(), id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: The opaque cursor string.
+
+    Returns:
+        A `(created_at, id)` tuple.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def encode_name_cursor(name: str, id: int) -> str:
+    """
+    Encodes a keyset position over (name, id) into an opaque, URL-safe cursor.
+
+    Args:
+        name: Sort key of the last item on the page.
+        id: Primary key of the last item on the page, used as a tie-breaker.
+
+    Returns:
+        The encoded cursor string.
+    """
+    raw = json.dumps([name, id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_name_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decodes a cursor produced by `encode_name_cursor`.
+
+    Args:
+        cursor: The opaque cursor string.
+
+    Returns:
+        A `(name, id)` tuple.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(name, str):
+            raise ValueError(name)
+        return name, int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def cursor_paginate(items: List[T], page_size: int, next_cursor: Optional[str]) -> CursorPaginatedResponse[T]:
+    """
+    Creates a cursor-paginated response object.
+
+    Args:
+        items: The list of items for the current page.
+        page_size: The maximum number of items per page.
+        next_cursor: Cursor for the following page, or None on the last page.
+
+    Returns:
+        A CursorPaginatedResponse object.
+    """
+    return CursorPaginatedResponse(
+        page_size=page_size,
+        next_cursor=next_cursor,
+        items=items
+    )
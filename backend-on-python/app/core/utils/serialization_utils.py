@@ -27,6 +27,7 @@ def serialize_user_profile(user: User) -> dict:
 
 def serialize_institution(institution: Institution) -> dict:
     return {
+        "id": institution.id,
         "name": institution.name,
         "short_name": institution.short_name,
         "description": institution.description,
@@ -0,0 +1,65 @@
+import csv
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+SPREADSHEET_EXTENSIONS = (".csv", ".xlsx")
+
+
+def iter_spreadsheet_rows(path: str, filename: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Lazily yields data rows of a .csv or .xlsx file keyed by the header row.
+
+    The workbook is opened in openpyxl read-only mode, which parses the sheet
+    XML incrementally, so memory does not grow with the number of rows.
+
+    Args:
+        path: Location of the file on disk.
+        filename: Original file name, used to pick the parser by extension.
+
+    Returns:
+        Iterator of (1-based row number in the file, {lower-cased header: value}).
+        Fully empty rows are skipped.
+    """
+    extension = Path(filename).suffix.lower()
+    if extension == ".csv":
+        yield from _iter_csv_rows(path)
+    elif extension == ".xlsx":
+        yield from _iter_xlsx_rows(path)
+    else:
+        raise ValueError(f"Unsupported file type, expected one of {', '.join(SPREADSHEET_EXTENSIONS)}")
+
+
+def take_chunk(rows: Iterator, size: int) -> List:
+    return list(islice(rows, size))
+
+
+def skip_rows(rows: Iterator, count: int) -> None:
+    deque(islice(rows, count), maxlen=0)
+
+
+def _keyed_rows(rows: Iterator[tuple]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    header = next(rows, None)
+    if header is None:
+        return
+    keys = [str(cell).strip().lower() if cell is not None else "" for cell in header]
+    for row_number, values in enumerate(rows, start=2):
+        if all(value is None or str(value).strip() == "" for value in values):
+            continue
+        yield row_number, dict(zip(keys, values))
+
+
+def _iter_csv_rows(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        yield from _keyed_rows(iter(csv.reader(file)))
+
+
+def _iter_xlsx_rows(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from _keyed_rows(workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
@@ -0,0 +1,28 @@
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from app.core.utils.json_stream_utils import JSONStreamEvent
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}\n\n"
+
+
+def format_partial_json_event(event: JSONStreamEvent) -> str:
+    # "institutes.item" carries one array element as soon as it is complete; "institutes" the whole array
+    if event.is_item:
+        return format_sse_event(f"{event.key}.item", {"index": event.index, "value": event.value})
+    return format_sse_event(event.key, event.value)
+
+
+def sse_response(events) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
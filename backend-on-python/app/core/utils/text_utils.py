@@ -1,5 +1,7 @@
+import math
 import re
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 def extract_hashtags(text: str) -> List[str]:
     """
@@ -30,3 +32,36 @@ def extract_mentions(text: str) -> List[str]:
     mentions = re.findall(r"@(\w+)", text)
     # Convert to set to get unique mentions, then back to list
     return list(set(mentions))
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Counts the tokens `text` occupies in a model's context.
+
+    Uses tiktoken when it is installed and knows the model; otherwise falls
+    back to a character heuristic (~4 ASCII characters per token, ~2 for
+    other scripts such as Cyrillic), which is close enough for budgeting.
+
+    Args:
+        text: The prompt or payload text.
+        model: Model name used to pick the tiktoken encoding.
+
+    Returns:
+        The exact or estimated number of tokens.
+    """
+    encoding = _get_token_encoding(model) if model else None
+    if encoding is not None:
+        return len(encoding.encode(text))
+    non_ascii = len(text) - len(text.encode("ascii", "ignore"))
+    return math.ceil((len(text) - non_ascii) / 4 + non_ascii / 2)
+
+
+@lru_cache(maxsize=None)
+def _get_token_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return None
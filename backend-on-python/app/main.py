@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -5,6 +8,20 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from app.api.api_router import api_router, auth_router
 from app.core.config.config import get_settings
 from app.core.middleware.auth_middleware import AuthMiddleware
+from app.modules.jobs.jobs_worker import run_worker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not get_settings().jobs.run_in_app:
+        yield
+        return
+    stop = asyncio.Event()
+    worker = asyncio.create_task(run_worker(stop))
+    yield
+    stop.set()
+    await worker
+
 
 app = FastAPI(
     title="minimal fastapi postgres template",
@@ -12,11 +29,15 @@ app = FastAPI(
     description="https://github.com/rafsaf/minimal-fastapi-postgres-template",
     openapi_url="/openapi.json",
     docs_url="/",
+    lifespan=lifespan,
 )
 
 app.include_router(auth_router)
 app.include_router(api_router)
 
+# Decodes the session cookie once per request; registered first so it runs inside CORS
+app.add_middleware(AuthMiddleware)
+
 # Sets all CORS enabled origins
 app.add_middleware(
     CORSMiddleware,
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database.session import get_async_session
-from app.core.utils.auth_utils import get_current_user, clear_auth_cookies # Updated import
+from app.core.utils.auth_utils import get_current_claims, clear_auth_cookies
 from app.modules.auth.auth_schemas import (
     UserSignupRequest,
     UserLoginRequest,
@@ -55,7 +55,7 @@ async def logout(
 
 @router.get("/me", response_model=CurrentUserResponse)
 async def get_me(
-    current_user: dict = Depends(get_current_user), # Using the new dependency
+    current_user: dict = Depends(get_current_claims),
     session: AsyncSession = Depends(get_async_session),
 ):
     service = AuthService(session)
@@ -65,7 +65,7 @@ async def get_me(
 @router.post("/onboarding", response_model=CurrentUserResponse)
 async def onboarding(
     user_data: UserOnboardingRequest,
-    current_user: dict = Depends(get_current_user),  # Using the new dependency
+    current_user: dict = Depends(get_current_claims),
     session: AsyncSession = Depends(get_async_session),
 ):
     service = AuthService(session)
@@ -84,6 +84,12 @@ class AuthRepository:
         result = await self.session.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def update_user_password(self, user: User, hashed_password: str) -> User:
+        user.password = hashed_password
+        self.session.add(user)
+        await self.session.commit()
+        return user
+
     async def update_user_onboarding(
         self, user: User, onboarding_data: UserOnboardingRequest
     ) -> User:
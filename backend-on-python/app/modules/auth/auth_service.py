@@ -6,8 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config.config import get_settings
 from app.core.models.users_model import User, UserSession, SubscriptionType
-from app.core.security.password import hash_password, verify_password
-from app.core.utils.auth_utils import create_session_token, set_auth_cookies, clear_auth_cookies
+from app.core.security.password import hash_password_async, password_needs_rehash, verify_password_async
+from app.core.utils.auth_utils import create_session_token, set_auth_cookies, clear_auth_cookies, revoke_session_token
 from app.modules.auth.auth_repository import AuthRepository
 from app.modules.auth.auth_schemas import (
     UserSignupRequest,
@@ -32,7 +32,7 @@ class AuthService:
                 detail="User with this email or username already exists",
             )
 
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         user = await self.repository.create_user(user_data, hashed_password)
         session_token = create_session_token(user.id, user.role, user.subscription)
         expires_at = datetime.utcnow() + timedelta(
@@ -47,11 +47,14 @@ class AuthService:
 
     async def login_user(self, response: Response, user_data: UserLoginRequest) -> TokenResponse:
         user = await self.repository.get_user_by_email_or_username(user_data.emailOrUsername)
-        if not user or not verify_password(user_data.password, user.password):
+        if not user or not await verify_password_async(user_data.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials",
             )
+        if password_needs_rehash(user.password):
+            # Hashes made before password_bcrypt_rounds was raised
+            await self.repository.update_user_password(user, await hash_password_async(user_data.password))
 
         session_token = create_session_token(user.id, user.role, user.subscription)
         expires_at = datetime.utcnow() + timedelta(
@@ -70,6 +73,7 @@ class AuthService:
         user_session = await self.repository.get_user_session_by_token(token)
         if user_session:
             await self.repository.delete_user_session(user_session)
+        revoke_session_token(token)
         clear_auth_cookies(response)
 
     async def get_current_user(self, user_id: int) -> CurrentUserResponse:
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.jobs_model import Job, JobStatus
+
+
+class JobsRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, kind: str, payload: dict, max_attempts: int) -> Job:
+        # Joins the caller's transaction, so the job becomes visible together with
+        # whatever state change required it (committed by the caller)
+        job = Job(kind=kind, payload=payload, max_attempts=max_attempts, status=JobStatus.PENDING)
+        self.session.add(job)
+        await self.session.flush()
+        return job
+
+    async def claim_jobs(self, kinds: List[str], limit: int, lock_timeout_secs: int) -> List[Job]:
+        due = and_(Job.status == JobStatus.PENDING, Job.run_at <= func.now())
+        abandoned = and_(
+            Job.status == JobStatus.RUNNING,
+            Job.locked_at < func.now() - timedelta(seconds=lock_timeout_secs),
+        )
+        claimable = (
+            select(Job.id)
+            .where(Job.kind.in_(kinds), or_(due, abandoned))
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(claimable))
+            .values(status=JobStatus.RUNNING, attempts=Job.attempts + 1, locked_at=func.now())
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = list(result.scalars().all())
+        await self.session.commit()
+        return jobs
+
+    async def complete_job(self, job_id: int):
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status=JobStatus.SUCCEEDED, locked_at=None, last_error=None)
+        )
+        await self.session.commit()
+
+    async def fail_job(self, job_id: int, error: str, retry_at: Optional[datetime]):
+        values = {"locked_at": None, "last_error": error}
+        if retry_at is None:
+            values["status"] = JobStatus.FAILED
+        else:
+            values.update(status=JobStatus.PENDING, run_at=retry_at)
+        await self.session.execute(update(Job).where(Job.id == job_id).values(**values))
+        await self.session.commit()
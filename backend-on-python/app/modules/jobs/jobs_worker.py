@@ -0,0 +1,100 @@
+import asyncio
+import importlib
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config.config import get_settings
+from app.core.database.session import new_async_session
+from app.core.models.jobs_model import Job
+from app.modules.jobs.jobs_repository import JobsRepository
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, dict], Awaitable[None]]
+
+# Modules that register handlers on import; the worker loads them before polling
+JOB_HANDLER_MODULES = [
+    "app.modules.organizations.organizations_service",
+    "app.modules.tests.tests_service",
+]
+
+_HANDLERS: Dict[str, JobHandler] = {}
+_FAILURE_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def register_job_handler(kind: str, on_failure: Optional[JobHandler] = None):
+    """
+    Registers the coroutine that processes jobs of `kind`.
+
+    Args:
+        kind: Job kind, as passed to JobsRepository.enqueue.
+        on_failure: Called once a job of this kind has exhausted its attempts.
+    """
+    def decorator(handler: JobHandler) -> JobHandler:
+        _HANDLERS[kind] = handler
+        if on_failure is not None:
+            _FAILURE_HANDLERS[kind] = on_failure
+        return handler
+    return decorator
+
+
+def retry_delay_secs(attempts: int) -> float:
+    # Exponential backoff with full jitter, so failed jobs do not retry in lockstep
+    settings = get_settings().jobs
+    ceiling = min(settings.retry_max_delay_secs, settings.retry_base_delay_secs * 2 ** (attempts - 1))
+    return random.uniform(settings.retry_base_delay_secs, max(settings.retry_base_delay_secs, ceiling))
+
+
+async def run_job(job: Job) -> None:
+    async with new_async_session() as session:
+        repository = JobsRepository(session)
+        try:
+            await _HANDLERS[job.kind](session, job.payload)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed on attempt %s", job.id, job.kind, job.attempts)
+            await session.rollback()
+            if job.attempts >= job.max_attempts:
+                await repository.fail_job(job.id, repr(e), retry_at=None)
+                if job.kind in _FAILURE_HANDLERS:
+                    await _FAILURE_HANDLERS[job.kind](session, job.payload)
+            else:
+                retry_at = datetime.now(timezone.utc) + timedelta(seconds=retry_delay_secs(job.attempts))
+                await repository.fail_job(job.id, repr(e), retry_at=retry_at)
+        else:
+            await repository.complete_job(job.id)
+
+
+async def process_available_jobs() -> int:
+    """Claims and runs one batch of due jobs; returns how many were processed."""
+    settings = get_settings().jobs
+    async with new_async_session() as session:
+        jobs = await JobsRepository(session).claim_jobs(
+            list(_HANDLERS), settings.concurrency, settings.lock_timeout_secs
+        )
+    await asyncio.gather(*(run_job(job) for job in jobs))
+    return len(jobs)
+
+
+def load_job_handlers() -> None:
+    for module in JOB_HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+async def run_worker(stop: asyncio.Event) -> None:
+    load_job_handlers()
+    poll_interval = get_settings().jobs.poll_interval_secs
+    while not stop.is_set():
+        try:
+            processed = await process_available_jobs()
+        except Exception:
+            logger.exception("Job worker iteration failed")
+            processed = 0
+        if not processed:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,72 @@
+import hashlib
+import json
+from collections import Counter
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Type
+
+from pydantic import BaseModel
+
+from app.core.config.config import get_settings
+from app.core.utils.cache_utils import TTLCache
+
+_settings = get_settings().cache
+# Process-local tier in front of the llm_response_cache table
+MEMORY_CACHE = TTLCache(maxsize=_settings.llm_response_memory_entries, ttl=_settings.llm_response_ttl_secs)
+
+
+@lru_cache(maxsize=None)
+def _schema_fingerprint(schema: Type[BaseModel]) -> str:
+    return json.dumps(schema.model_json_schema(), sort_keys=True, separators=(",", ":"))
+
+
+def llm_cache_key(model: str, prompt: dict, schema: Type[BaseModel]) -> str:
+    """
+    Content address of a completion request.
+
+    Args:
+        model: Model name the prompt is sent to.
+        prompt: {"system": ..., "user": ...} as built by prompt_builder.
+        schema: Pydantic model the response is validated against.
+
+    Returns:
+        Hex SHA-256 of (model, system, user, schema).
+    """
+    payload = json.dumps(
+        [model, prompt["system"], prompt["user"], _schema_fingerprint(schema)],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCacheStats:
+    """Hit/miss counters per prompt family for this process."""
+
+    OUTCOMES = ("memory_hit", "db_hit", "miss")
+
+    def __init__(self):
+        self._counts: Dict[str, Counter] = {}
+        self._lock = Lock()
+
+    def record(self, family: str, outcome: str) -> None:
+        with self._lock:
+            self._counts.setdefault(family, Counter())[outcome] += 1
+
+    def report(self) -> Dict[str, dict]:
+        with self._lock:
+            report = {}
+            for family, counts in self._counts.items():
+                total = sum(counts.values())
+                hits = counts["memory_hit"] + counts["db_hit"]
+                report[family] = {
+                    **{outcome: counts[outcome] for outcome in self.OUTCOMES},
+                    "hit_rate": round(hits / total, 4) if total else 0.0,
+                }
+            return report
+
+
+CACHE_STATS = LLMCacheStats()
+
+
+def get_llm_cache_report() -> Dict[str, dict]:
+    return CACHE_STATS.report()
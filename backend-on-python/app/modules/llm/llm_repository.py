@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import Row, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.llm_cache_model import LLMResponseCache
+
+
+class LLMCacheRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_response(self, key: str) -> Optional[dict]:
+        result = await self.session.execute(
+            select(LLMResponseCache.response).where(
+                LLMResponseCache.key == key, LLMResponseCache.expires_at > func.now()
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def count_hit(self, key: str):
+        # Best effort: a hit on a row another request is bumping is dropped, not waited for
+        locked = (
+            select(LLMResponseCache.key)
+            .where(LLMResponseCache.key == key)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        await self.session.execute(
+            update(LLMResponseCache)
+            .where(LLMResponseCache.key == locked)
+            .values(hit_count=LLMResponseCache.hit_count + 1)
+        )
+        await self.session.commit()
+
+    async def save_response(self, key: str, family: str, model: str, response: dict, ttl_secs: int):
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_secs)
+        statement = insert(LLMResponseCache).values(
+            key=key, family=family, model=model, response=response, expires_at=expires_at
+        )
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["key"],
+                set_={"response": statement.excluded.response, "expires_at": statement.excluded.expires_at},
+            )
+        )
+        await self.session.commit()
+
+    async def get_family_stats(self) -> List[Row]:
+        result = await self.session.execute(
+            select(
+                LLMResponseCache.family,
+                func.count().label("entries"),
+                func.coalesce(func.sum(LLMResponseCache.hit_count), 0).label("hits"),
+            )
+            .where(LLMResponseCache.expires_at > func.now())
+            .group_by(LLMResponseCache.family)
+            .order_by(LLMResponseCache.family)
+        )
+        return list(result.all())
+
+    async def delete_expired(self) -> int:
+        result = await self.session.execute(
+            delete(LLMResponseCache).where(LLMResponseCache.expires_at <= func.now())
+        )
+        await self.session.commit()
+        return result.rowcount
@@ -1,82 +1,292 @@
+import asyncio
+import copy
 import json
-from openai import OpenAI
-from pydantic import ValidationError
+import logging
+import random
+from typing import Any, AsyncIterator, Optional, Tuple, Type
+
+import httpx
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    OpenAIError,
+    RateLimitError,
+)
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config.config import get_settings
-from app.modules.universities.universities_schemas import UniversityAnalysisResponse
+from app.core.database.session import new_async_session
+from app.core.utils.json_stream_utils import JSONStreamEvent, PartialJSONObjectParser
+from app.modules.llm.llm_cache import CACHE_STATS, MEMORY_CACHE, llm_cache_key
+from app.modules.llm.llm_repository import LLMCacheRepository
+from app.modules.universities.universities_schemas import UniversityAnalysisResult
 from app.modules.tests.tests_schemas import (
     PersonalityAnalysisResponse,
     ShortAnalysisResponse,
 )
 
+logger = logging.getLogger(__name__)
+
+# Transient failures worth another attempt; anything else (bad request, auth) is final
+RETRYABLE_ERRORS = (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
+
+_client: Optional[AsyncOpenAI] = None
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_llm_client() -> AsyncOpenAI:
+    """Process-wide OpenAI client; its httpx pool keeps connections warm across requests."""
+    global _client
+    if _client is None:
+        settings = get_settings().llm
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key.get_secret_value(),
+            base_url=settings.base_url,
+            timeout=settings.request_timeout_secs,
+            max_retries=0,  # retried below, with jitter and outside the concurrency slot
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.max_connections,
+                    max_keepalive_connections=settings.max_connections,
+                ),
+                timeout=settings.request_timeout_secs,
+            ),
+        )
+    return _client
+
+
+def _get_slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(get_settings().llm.max_concurrent_requests)
+    return _slots
+
+
+def _retry_delay_secs(attempt: int) -> float:
+    settings = get_settings().llm
+    ceiling = min(settings.retry_max_delay_secs, settings.retry_base_delay_secs * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
 
 class LLMService:
-    def __init__(self):
+    def __init__(self, db_cache: bool = True):
         self.settings = get_settings()
-        self.client = OpenAI(api_key=self.settings.llm.openai_api_key.get_secret_value())
+        self.client = get_llm_client()
+        # Without the database tier only the in-process cache is used
+        self.db_cache = db_cache
 
-    def get_university_analysis(self, prompt: dict) -> dict:
-        response = self.client.chat.completions.create(
-            model=self.settings.llm.model,
-            messages=[
+    async def _get_cached_response(self, key: str) -> Optional[dict]:
+        # The cache has its own short-lived sessions, so it never commits or
+        # rolls back the caller's unit of work. A database error only costs a cache miss.
+        async with new_async_session() as session:
+            repository = LLMCacheRepository(session)
+            try:
+                response = await repository.get_response(key)
+            except SQLAlchemyError as e:
+                logger.warning("Failed to read LLM cache: %s", e)
+                return None
+            if response is not None:
+                try:
+                    await repository.count_hit(key)
+                except SQLAlchemyError as e:
+                    logger.warning("Failed to count LLM cache hit: %s", e)
+            return response
+
+    async def _save_cached_response(self, key: str, family: str, response: dict):
+        async with new_async_session() as session:
+            try:
+                await LLMCacheRepository(session).save_response(
+                    key, family, self.settings.llm.model, response, self.settings.cache.llm_response_ttl_secs
+                )
+            except SQLAlchemyError as e:
+                # The response is still returned; only later identical requests miss
+                logger.warning("Failed to save LLM cache entry: %s", e)
+
+    def _completion_args(self, prompt: dict) -> dict:
+        return {
+            "model": self.settings.llm.model,
+            "messages": [
                 {"role": "system", "content": prompt["system"]},
                 {"role": "user", "content": prompt["user"]},
             ],
-            response_format={"type": "json_object"},
-            max_tokens=self.settings.llm.max_tokens,
-        )
+            "response_format": {"type": "json_object"},
+            "max_tokens": self.settings.llm.max_tokens,
+        }
+
+    async def _create_completion(self, prompt: dict):
+        for attempt in range(self.settings.llm.max_retries + 1):
+            try:
+                async with _get_slots():
+                    return await self.client.chat.completions.create(**self._completion_args(prompt))
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.settings.llm.max_retries:
+                    raise
+                delay = _retry_delay_secs(attempt)
+                logger.warning("LLM call failed (%s), retrying in %.2fs", e.__class__.__name__, delay)
+                await asyncio.sleep(delay)
+
+    async def _open_stream(self, prompt: dict):
+        # Returns holding a concurrency slot; the caller releases it once the stream is consumed.
+        # Only opening the stream is retried: once tokens flowed they may already be forwarded.
+        slots = _get_slots()
+        for attempt in range(self.settings.llm.max_retries + 1):
+            await slots.acquire()
+            try:
+                return await self.client.chat.completions.create(**self._completion_args(prompt), stream=True)
+            except RETRYABLE_ERRORS as e:
+                slots.release()
+                if attempt == self.settings.llm.max_retries:
+                    raise
+                delay = _retry_delay_secs(attempt)
+                logger.warning("LLM stream failed to open (%s), retrying in %.2fs", e.__class__.__name__, delay)
+                await asyncio.sleep(delay)
+            except BaseException:
+                slots.release()
+                raise
+
+    async def get_json_completion(self, prompt: dict, schema: Type[BaseModel], family: str) -> dict:
+        """
+        Runs a JSON-mode completion and validates it against `schema`.
+
+        Identical requests are answered from the response cache: the in-process
+        LRU first, then the llm_response_cache table. Only validated responses
+        are cached.
+
+        Args:
+            prompt: {"system": ..., "user": ...} as built by prompt_builder.
+            schema: Pydantic model the response must conform to.
+            family: Prompt family, used for hit/miss reporting.
+
+        Returns:
+            The parsed JSON object, or {} if the call or validation failed.
+        """
+        key = llm_cache_key(self.settings.llm.model, prompt, schema)
+        cached = MEMORY_CACHE.get(key)
+        if cached is not None:
+            CACHE_STATS.record(family, "memory_hit")
+            return copy.deepcopy(cached)
+        if self.db_cache:
+            cached = await self._get_cached_response(key)
+            if cached is not None:
+                CACHE_STATS.record(family, "db_hit")
+                MEMORY_CACHE.set(key, copy.deepcopy(cached))
+                return cached
+        CACHE_STATS.record(family, "miss")
+
         try:
-            analysis_data = json.loads(response.choices[0].message.content)
-            # Validate the response against the Pydantic schema
-            UniversityAnalysisResponse.model_validate(analysis_data)
-            return analysis_data
-        except (json.JSONDecodeError, ValidationError) as e:
-            # Handle JSON parsing or validation errors
-            # You might want to log the error and the invalid response for debugging
-            print(f"Error parsing LLM response: {e}")
-            print(f"Invalid response: {response.choices[0].message.content}")
+            response = await self._create_completion(prompt)
+        except OpenAIError as e:
+            logger.error("LLM call failed: %s", e)
+            return {}
+        choice = response.choices[0]
+        content = choice.message.content
+        # Refusals, content-filter stops and truncated output are not cacheable results
+        if content is None or choice.finish_reason != "stop":
+            logger.error(
+                "LLM response unusable: finish_reason=%s, refusal=%s",
+                choice.finish_reason,
+                getattr(choice.message, "refusal", None),
+            )
             return {}
-
-    def get_personality_analysis(self, prompt: dict) -> dict:
-        response = self.client.chat.completions.create(
-            model=self.settings.llm.model,
-            messages=[
-                {"role": "system", "content": prompt["system"]},
-                {"role": "user", "content": prompt["user"]},
-            ],
-            response_format={"type": "json_object"},
-            max_tokens=self.settings.llm.max_tokens,
-        )
         try:
-            analysis_data = json.loads(response.choices[0].message.content)
-            # Validate the response against the Pydantic schema
-            PersonalityAnalysisResponse.model_validate(analysis_data)
-            return analysis_data
+            analysis_data = json.loads(content)
+            schema.model_validate(analysis_data)
         except (json.JSONDecodeError, ValidationError) as e:
-            # Handle JSON parsing or validation errors
-            # You might want to log the error and the invalid response for debugging
-            print(f"Error parsing LLM response: {e}")
-            print(f"Invalid response: {response.choices[0].message.content}")
+            logger.error("Error parsing LLM response: %s; invalid response: %s", e, content)
             return {}
 
-    def get_short_analysis(self, prompt: dict) -> dict:
-        response = self.client.chat.completions.create(
-            model=self.settings.llm.model,
-            messages=[
-                {"role": "system", "content": prompt["system"]},
-                {"role": "user", "content": prompt["user"]},
-            ],
-            response_format={"type": "json_object"},
-            max_tokens=self.settings.llm.max_tokens,
-        )
+        MEMORY_CACHE.set(key, copy.deepcopy(analysis_data))
+        if self.db_cache:
+            await self._save_cached_response(key, family, analysis_data)
+        return analysis_data
+
+    async def stream_json_completion(
+        self, prompt: dict, schema: Type[BaseModel], family: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming counterpart of get_json_completion.
+
+        Yields ("partial", JSONStreamEvent) for every top-level member (and each
+        element of top-level arrays) as soon as it is complete, then exactly one
+        of ("result", dict) with the validated object or ("error", str).
+        Cache hits are replayed through the same events.
+        """
+        key = llm_cache_key(self.settings.llm.model, prompt, schema)
+        cached = MEMORY_CACHE.get(key)
+        if cached is not None:
+            CACHE_STATS.record(family, "memory_hit")
+        elif self.db_cache:
+            cached = await self._get_cached_response(key)
+            if cached is not None:
+                CACHE_STATS.record(family, "db_hit")
+                MEMORY_CACHE.set(key, copy.deepcopy(cached))
+        if cached is not None:
+            for event in _replay_events(copy.deepcopy(cached)):
+                yield "partial", event
+            yield "result", copy.deepcopy(cached)
+            return
+        CACHE_STATS.record(family, "miss")
+
+        parser = PartialJSONObjectParser()
         try:
-            analysis_data = json.loads(response.choices[0].message.content)
-            # Validate the response against the Pydantic schema
-            ShortAnalysisResponse.model_validate(analysis_data)
-            return analysis_data
+            stream = await self._open_stream(prompt)
+            try:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        for event in parser.feed(delta):
+                            yield "partial", event
+            finally:
+                # Also reached on client disconnect or cancellation: close the
+                # response so its pooled connection is returned
+                try:
+                    await stream.close()
+                finally:
+                    _get_slots().release()
+        except OpenAIError as e:
+            logger.error("LLM stream failed: %s", e)
+            yield "error", "Failed to get analysis from LLM"
+            return
+        except json.JSONDecodeError as e:
+            logger.error("Error parsing streamed LLM response: %s; invalid response: %s", e, parser.buffer)
+            yield "error", "Invalid analysis from LLM"
+            return
+
+        try:
+            analysis_data = json.loads(parser.buffer)
+            schema.model_validate(analysis_data)
         except (json.JSONDecodeError, ValidationError) as e:
-            # Handle JSON parsing or validation errors
-            # You might want to log the error and the invalid response for debugging
-            print(f"Error parsing LLM response: {e}")
-            print(f"Invalid response: {response.choices[0].message.content}")
-            return {}
+            logger.error("Error parsing LLM response: %s; invalid response: %s", e, parser.buffer)
+            yield "error", "Invalid analysis from LLM"
+            return
+
+        MEMORY_CACHE.set(key, copy.deepcopy(analysis_data))
+        if self.db_cache:
+            await self._save_cached_response(key, family, analysis_data)
+        yield "result", analysis_data
+
+    async def get_university_analysis(self, prompt: dict) -> dict:
+        return await self.get_json_completion(prompt, UniversityAnalysisResult, "university_analysis")
+
+    async def get_personality_analysis(self, prompt: dict) -> dict:
+        return await self.get_json_completion(prompt, PersonalityAnalysisResponse, "personality_analysis")
+
+    async def get_short_analysis(self, prompt: dict) -> dict:
+        return await self.get_json_completion(prompt, ShortAnalysisResponse, "short_analysis")
+
+    def stream_university_analysis(self, prompt: dict) -> AsyncIterator[Tuple[str, Any]]:
+        return self.stream_json_completion(prompt, UniversityAnalysisResult, "university_analysis")
+
+    def stream_personality_analysis(self, prompt: dict) -> AsyncIterator[Tuple[str, Any]]:
+        return self.stream_json_completion(prompt, PersonalityAnalysisResponse, "personality_analysis")
+
+
+def _replay_events(data: dict):
+    for key, value in data.items():
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                yield JSONStreamEvent(key, item, index)
+        yield JSONStreamEvent(key, value)
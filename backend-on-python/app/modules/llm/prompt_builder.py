@@ -1,50 +1,110 @@
 import json
+import logging
+from string import Formatter
+from typing import Any, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.core.config.config import get_settings
+from app.core.utils.text_utils import estimate_tokens
 from app.modules.llm.prompt_registry import (
     UNIVERSITY_ANALYSIS_PROMPT,
     PERSONALITY_ANALYSIS_PROMPT,
     SHORT_ANALYSIS_PROMPT,
 )
-from app.modules.universities.universities_schemas import UniversityAnalysisResponse
+from app.modules.universities.universities_schemas import UniversityAnalysisResult
 from app.modules.tests.tests_schemas import (
     PersonalityAnalysisResponse,
     ShortAnalysisResponse,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def compact_json(data: Any) -> str:
+    # No indentation or padding and no \u escapes: whitespace and escaped
+    # Cyrillic cost tokens without telling the model anything
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+class PromptTemplate:
+    """
+    A prompt_registry entry compiled for repeated rendering.
+
+    On first use the response schema is rendered once and inlined into the
+    user template, and the template is split into literal text and
+    placeholders, so building a prompt is a single join over the
+    compact-serialized payloads.
+    """
+
+    def __init__(self, family: str, prompt: dict, schema: Type[BaseModel]):
+        self.family = family
+        self.system = prompt["system"]
+        self.schema = schema
+        self._template = prompt["user"]
+        # (literal text, None) or (None, placeholder name)
+        self._parts: Optional[List[Tuple[Optional[str], Optional[str]]]] = None
+
+    @property
+    def parts(self) -> List[Tuple[Optional[str], Optional[str]]]:
+        # Compiled lazily: model_json_schema() needs every referenced model imported
+        if self._parts is None:
+            json_format = compact_json(self.schema.model_json_schema())
+            parts: List[Tuple[Optional[str], Optional[str]]] = []
+            for literal, field, _, _ in Formatter().parse(self._template):
+                if field == "json_format":
+                    literal += json_format
+                    field = None
+                if literal:
+                    if parts and parts[-1][1] is None:
+                        parts[-1] = (parts[-1][0] + literal, None)
+                    else:
+                        parts.append((literal, None))
+                if field is not None:
+                    parts.append((None, field))
+            self._parts = parts
+        return self._parts
+
+    def render(self, **payloads: Any) -> dict:
+        """
+        Args:
+            payloads: Value for every placeholder of the template except
+                json_format; each is serialized as compact JSON.
+
+        Returns:
+            {"system": ..., "user": ..., "tokens": estimated prompt tokens}.
+        """
+        user = "".join(
+            text if field is None else compact_json(payloads[field])
+            for text, field in self.parts
+        )
+        model = get_settings().llm.model
+        tokens = estimate_tokens(self.system, model) + estimate_tokens(user, model)
+        logger.debug("Built %s prompt: %d tokens", self.family, tokens)
+        return {"system": self.system, "user": user, "tokens": tokens}
+
+
+UNIVERSITY_ANALYSIS_TEMPLATE = PromptTemplate(
+    "university_analysis", UNIVERSITY_ANALYSIS_PROMPT, UniversityAnalysisResult
+)
+PERSONALITY_ANALYSIS_TEMPLATE = PromptTemplate(
+    "personality_analysis", PERSONALITY_ANALYSIS_PROMPT, PersonalityAnalysisResponse
+)
+SHORT_ANALYSIS_TEMPLATE = PromptTemplate("short_analysis", SHORT_ANALYSIS_PROMPT, ShortAnalysisResponse)
+
 
 def build_university_analysis_prompt(
     user_profile: dict, universities_data: list
 ) -> dict:
-    json_format = json.dumps(UniversityAnalysisResponse.model_json_schema(), indent=2)
-    user_prompt = UNIVERSITY_ANALYSIS_PROMPT["user"].format(
-        user_profile=json.dumps(user_profile, indent=2),
-        universities_data=json.dumps(universities_data, indent=2),
-        json_format=json_format,
+    return UNIVERSITY_ANALYSIS_TEMPLATE.render(
+        user_profile=user_profile,
+        universities_data=universities_data,
     )
-    return {
-        "system": UNIVERSITY_ANALYSIS_PROMPT["system"],
-        "user": user_prompt,
-    }
 
 
 def build_personality_analysis_prompt(test_results: list) -> dict:
-    json_format = json.dumps(PersonalityAnalysisResponse.model_json_schema(), indent=2)
-    user_prompt = PERSONALITY_ANALYSIS_PROMPT["user"].format(
-        test_results=json.dumps(test_results, indent=2),
-        json_format=json_format,
-    )
-    return {
-        "system": PERSONALITY_ANALYSIS_PROMPT["system"],
-        "user": user_prompt,
-    }
+    return PERSONALITY_ANALYSIS_TEMPLATE.render(test_results=test_results)
 
 
 def build_short_analysis_prompt(test_results: dict) -> dict:
-    json_format = json.dumps(ShortAnalysisResponse.model_json_schema(), indent=2)
-    user_prompt = SHORT_ANALYSIS_PROMPT["user"].format(
-        test_results=json.dumps(test_results, indent=2),
-        json_format=json_format,
-    )
-    return {
-        "system": SHORT_ANALYSIS_PROMPT["system"],
-        "user": user_prompt,
-    }
+    return SHORT_ANALYSIS_TEMPLATE.render(test_results=test_results)
@@ -8,10 +8,11 @@ UNIVERSITY_ANALYSIS_PROMPT = {
 {universities_data}
 
 **Instructions:**
-1.  For each university, provide a `chance_percentage` of admission.
-2.  For each university, provide a list of `attributes` (PROS and CONS) for the student's application to that specific university.
-3.  For each university, provide a detailed `plan` with actionable steps for the student to improve their chances.
-4.  The output must be a valid JSON object that conforms to the following schema.
+1.  Analyze every university listed, referring to it by its `id` as `institution_id`.
+2.  Each university comes with the student's `estimated_chance_percentage` of admission, computed from their test scores (null when it cannot be estimated); keep your analysis consistent with it.
+3.  For each university, provide a list of `attributes` (PROS and CONS) for the student's application to that specific university.
+4.  For each university, provide a detailed `plan` with actionable steps for the student to improve their chances.
+5.  The output must be a valid JSON object that conforms to the following schema.
 
 **JSON Schema:**
 {json_format}
@@ -1,6 +1,6 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, File, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database.session import get_async_session
@@ -14,6 +14,8 @@ from app.modules.organizations.organizations_schemas import (
     OrganizationGroupCreate,
     OrganizationGroupResponse,
     OrganizationUserExcelInsertRequest,
+    OrganizationUserImportProgress,
+    OrganizationUserImportResponse,
     OrganizationFilter,
     OrganizationUpdate,
     OrganizationUserUpdate,
@@ -149,7 +151,7 @@ async def delete_organization_group(
     return
 
 
-@router.post("/{org_id}/users/insert", response_model=List[OrganizationUserResponse], status_code=status.HTTP_201_CREATED)
+@router.post("/{org_id}/users/insert", response_model=OrganizationUserImportResponse, status_code=status.HTTP_201_CREATED)
 async def insert_users_from_excel(
     org_id: int,
     users_data: OrganizationUserExcelInsertRequest,
@@ -157,3 +159,23 @@ async def insert_users_from_excel(
 ):
     service = OrganizationService(session)
     return await service.insert_users_from_excel(org_id, users_data)
+
+
+@router.post("/{org_id}/users/import", response_model=OrganizationUserImportProgress, status_code=status.HTTP_202_ACCEPTED)
+async def import_users_from_spreadsheet(
+    org_id: int,
+    file: UploadFile = File(...),
+    session: AsyncSession = Depends(get_async_session),
+):
+    service = OrganizationService(session)
+    return await service.start_users_import(org_id, file)
+
+
+@router.get("/{org_id}/users/import/{import_id}", response_model=OrganizationUserImportProgress)
+async def get_users_import(
+    org_id: int,
+    import_id: str,
+    session: AsyncSession = Depends(get_async_session),
+):
+    service = OrganizationService(session)
+    return await service.get_users_import(org_id, import_id)
@@ -1,9 +1,18 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.models.organizations_model import Organization, OrganizationUser, OrganizationGroup
+from app.core.models.organizations_model import (
+    Organization,
+    OrganizationGroup,
+    OrganizationUser,
+    OrganizationUserImport,
+    OrganizationUserImportStatus,
+    OrganizationUserRole,
+)
 from app.core.models.users_model import User, SubscriptionType
 from app.modules.organizations.organizations_schemas import (
     OrganizationCreate,
@@ -147,3 +156,82 @@ class OrganizationRepository:
         for org_user in org_users:
             await self.session.refresh(org_user)
         return org_users
+
+    async def get_existing_emails(self, emails: List[str]) -> Set[str]:
+        if not emails:
+            return set()
+        result = await self.session.execute(select(User.email).where(User.email.in_(emails)))
+        return set(result.scalars().all())
+
+    async def get_existing_usernames(self, usernames: List[str]) -> Set[str]:
+        if not usernames:
+            return set()
+        result = await self.session.execute(select(User.username).where(User.username.in_(usernames)))
+        return set(result.scalars().all())
+
+    async def insert_organization_users_chunk(self, organization_id: int, users_data: List[dict]) -> Dict[str, OrganizationUser]:
+        # One multi-row INSERT ... RETURNING per table and one transaction for the whole chunk.
+        # Users that collide on email/username (e.g. a concurrent import) are skipped, not failed.
+        try:
+            result = await self.session.execute(
+                insert(User).values(users_data).on_conflict_do_nothing().returning(User.id, User.email)
+            )
+            emails_by_user_id = {user_id: email for user_id, email in result.all()}
+            org_users = {}
+            if emails_by_user_id:
+                result = await self.session.scalars(
+                    insert(OrganizationUser)
+                    .values([
+                        {
+                            "user_id": user_id,
+                            "organization_id": organization_id,
+                            "status": None,
+                            "role": OrganizationUserRole.STUDENT,
+                            "group_id": None,
+                        }
+                        for user_id in emails_by_user_id
+                    ])
+                    .returning(OrganizationUser)
+                )
+                org_users = {emails_by_user_id[org_user.user_id]: org_user for org_user in result.all()}
+            await self.session.commit()
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise
+        return org_users
+
+    async def create_users_import(self, import_id: str, organization_id: int, filename: str, content: bytes) -> OrganizationUserImport:
+        # Commits the job the caller enqueued on this session along with the import
+        users_import = OrganizationUserImport(
+            id=import_id,
+            organization_id=organization_id,
+            filename=filename,
+            status=OrganizationUserImportStatus.PENDING,
+            processed_rows=0,
+            created_count=0,
+            error_count=0,
+            errors=[],
+            content=content,
+        )
+        self.session.add(users_import)
+        await self.session.commit()
+        return users_import
+
+    async def get_users_import(self, import_id: str) -> Optional[OrganizationUserImport]:
+        result = await self.session.execute(
+            select(OrganizationUserImport).where(OrganizationUserImport.id == import_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_users_import_content(self, import_id: str) -> Optional[bytes]:
+        result = await self.session.execute(
+            select(OrganizationUserImport.content).where(OrganizationUserImport.id == import_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def update_users_import(self, import_id: str, **values):
+        # Plain UPDATE rather than ORM mutation: chunk inserts roll back and expire loaded rows
+        await self.session.execute(
+            update(OrganizationUserImport).where(OrganizationUserImport.id == import_id).values(**values)
+        )
+        await self.session.commit()
@@ -2,7 +2,7 @@ from pydantic import BaseModel, EmailStr
 from datetime import datetime
 from typing import List, Optional
 
-from app.core.models.organizations_model import OrganizationSubscriptionType, OrganizationUserRole
+from app.core.models.organizations_model import OrganizationSubscriptionType, OrganizationUserImportStatus, OrganizationUserRole
 from app.core.schemas.common import BaseFilter
 
 
@@ -74,12 +74,37 @@ class OrganizationUserExcelInsert(BaseModel):
     email: EmailStr
     password: str
     subscription: OrganizationSubscriptionType
+    first_name: str = ""
+    last_name: str = ""
 
 
 class OrganizationUserExcelInsertRequest(BaseModel):
     users: List[OrganizationUserExcelInsert]
 
 
+class OrganizationUserImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    detail: str
+
+
+class OrganizationUserImportResponse(BaseModel):
+    created: List[OrganizationUserResponse]
+    errors: List[OrganizationUserImportError]
+
+
+class OrganizationUserImportProgress(BaseModel):
+    import_id: str
+    organization_id: int
+    filename: str
+    status: OrganizationUserImportStatus = OrganizationUserImportStatus.PENDING
+    processed_rows: int = 0
+    created_count: int = 0
+    error_count: int = 0
+    errors: List[OrganizationUserImportError] = []
+    detail: Optional[str] = None
+
+
 class OrganizationUpdate(BaseModel):
     name: Optional[str] = None
     short_name: Optional[str] = None
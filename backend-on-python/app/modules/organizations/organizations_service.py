@@ -1,11 +1,22 @@
-from typing import List
+import os
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.models.organizations_model import OrganizationSubscriptionType
+from app.core.config.config import get_settings
+from app.core.models.organizations_model import OrganizationSubscriptionType, OrganizationUserImport
 from app.core.models.users_model import UserRole, SubscriptionType
-from app.core.security.password import hash_password
+from app.core.security.password import hash_passwords_async
+from app.core.utils.spreadsheet_utils import SPREADSHEET_EXTENSIONS, iter_spreadsheet_rows, skip_rows, take_chunk
+from app.modules.jobs.jobs_repository import JobsRepository
+from app.modules.jobs.jobs_worker import register_job_handler
 from app.modules.organizations.organizations_repository import OrganizationRepository
 from app.modules.organizations.organizations_schemas import (
     OrganizationCreate,
@@ -17,14 +28,27 @@ from app.modules.organizations.organizations_schemas import (
     OrganizationUserResponse,
     OrganizationGroupCreate,
     OrganizationGroupResponse,
+    OrganizationUserExcelInsert,
     OrganizationUserExcelInsertRequest,
+    OrganizationUserImportError,
+    OrganizationUserImportProgress,
+    OrganizationUserImportResponse,
+    OrganizationUserImportStatus,
     OrganizationUserUpdate,
 )
 
+# Rows per INSERT ... RETURNING statement and per transaction
+IMPORT_CHUNK_SIZE = 1000
+# Per-row errors kept on a spreadsheet import; the rest are only counted
+MAX_REPORTED_IMPORT_ERRORS = 1000
+
+USERS_IMPORT_JOB = "organizations.users_import"
+
 
 class OrganizationService:
     def __init__(self, session: AsyncSession):
         self.repository = OrganizationRepository(session)
+        self.jobs_repository = JobsRepository(session)
 
     async def create_organization(self, org_data: OrganizationCreate) -> OrganizationResponse:
         existing_org = await self.repository.get_organization_by_name(org_data.name)
@@ -152,40 +176,228 @@ class OrganizationService:
             )
         await self.repository.delete_organization_group(org_group)
 
-    async def insert_users_from_excel(self, org_id: int, users_data: OrganizationUserExcelInsertRequest) -> List[OrganizationUserResponse]:
+    async def insert_users_from_excel(self, org_id: int, users_data: OrganizationUserExcelInsertRequest) -> OrganizationUserImportResponse:
+        organization = await self.repository.get_organization_by_id(org_id)
+        if not organization:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Organization not found",
+            )
+
+        result = OrganizationUserImportResponse(created=[], errors=[])
+        rows = list(enumerate(users_data.users, start=1))
+        for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+            created, errors = await self._import_users_chunk(org_id, rows[start:start + IMPORT_CHUNK_SIZE])
+            result.created.extend(created)
+            result.errors.extend(errors)
+        return result
+
+    async def start_users_import(self, org_id: int, upload: UploadFile) -> OrganizationUserImportProgress:
         organization = await self.repository.get_organization_by_id(org_id)
         if not organization:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Organization not found",
             )
+        filename = upload.filename or ""
+        extension = Path(filename).suffix.lower()
+        if extension not in SPREADSHEET_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file type, expected one of {', '.join(SPREADSHEET_EXTENSIONS)}",
+            )
+
+        # The worker that runs the import may be on another host, so the file goes
+        # through the database; the job commits together with the import row
+        content = await upload.read()
+        import_id = uuid.uuid4().hex
+        await self.jobs_repository.enqueue(
+            USERS_IMPORT_JOB,
+            {"import_id": import_id},
+            max_attempts=get_settings().jobs.max_attempts,
+        )
+        users_import = await self.repository.create_users_import(import_id, org_id, filename, content)
+        return _import_progress(users_import)
+
+    async def get_users_import(self, org_id: int, import_id: str) -> OrganizationUserImportProgress:
+        users_import = await self.repository.get_users_import(import_id)
+        if users_import is None or users_import.organization_id != org_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Import not found",
+            )
+        return _import_progress(users_import)
+
+    async def import_users_from_spreadsheet(self, import_id: str) -> None:
+        users_import = await self.repository.get_users_import(import_id)
+        if users_import is None or users_import.status in (
+            OrganizationUserImportStatus.COMPLETED,
+            OrganizationUserImportStatus.FAILED,
+        ):
+            return
+        progress = _import_progress(users_import)
+        content = await self.repository.get_users_import_content(import_id)
+        path = await run_in_threadpool(_spool_upload, content, Path(progress.filename).suffix)
+        del content
+        await self.repository.update_users_import(import_id, status=OrganizationUserImportStatus.RUNNING)
+
+        rows = iter_spreadsheet_rows(path, progress.filename)
+        try:
+            # A retried job resumes after the rows earlier attempts already recorded
+            await run_in_threadpool(skip_rows, rows, progress.processed_rows)
+            # Only one chunk of parsed rows is alive at a time; parsing runs off the event loop
+            while chunk := await run_in_threadpool(take_chunk, rows, IMPORT_CHUNK_SIZE):
+                valid_rows = []
+                errors = []
+                for row, values in chunk:
+                    try:
+                        valid_rows.append((row, OrganizationUserExcelInsert.model_validate(_roster_entry(values))))
+                    except ValidationError as e:
+                        errors.append(OrganizationUserImportError(row=row, email=_cell(values.get("email")), detail=_format_validation_error(e)))
+                created, chunk_errors = await self._import_users_chunk(progress.organization_id, valid_rows)
+                errors.extend(chunk_errors)
+
+                progress.processed_rows += len(chunk)
+                progress.created_count += len(created)
+                progress.error_count += len(errors)
+                progress.errors.extend(errors[:MAX_REPORTED_IMPORT_ERRORS - len(progress.errors)])
+                await self.repository.update_users_import(
+                    import_id,
+                    processed_rows=progress.processed_rows,
+                    created_count=progress.created_count,
+                    error_count=progress.error_count,
+                    errors=[error.model_dump() for error in progress.errors],
+                )
+            await self.repository.update_users_import(
+                import_id, status=OrganizationUserImportStatus.COMPLETED, content=None
+            )
+        except Exception as e:
+            # Keep the reason visible to pollers while the job waits for its retry
+            await self.repository.session.rollback()
+            await self.repository.update_users_import(import_id, detail=str(e))
+            raise
+        finally:
+            rows.close()
+            os.remove(path)
 
-        created_users = []
-        created_org_users = []
+    async def _import_users_chunk(
+        self,
+        org_id: int,
+        rows: List[Tuple[int, OrganizationUserExcelInsert]],
+    ) -> Tuple[List[OrganizationUserResponse], List[OrganizationUserImportError]]:
+        # Rows are (1-based row number, entry) so errors point back at the uploaded file.
+        # Duplicates across chunks are caught by the existing-email lookup, since earlier
+        # chunks are already committed.
+        created = []
+        errors = []
+        seen_emails = set()
+        unique_rows = []
+        for row, entry in rows:
+            if entry.email in seen_emails:
+                errors.append(OrganizationUserImportError(row=row, email=entry.email, detail="Duplicate email in upload"))
+                continue
+            seen_emails.add(entry.email)
+            unique_rows.append((row, entry))
 
-        for user_entry in users_data.users:
-            hashed_password = hash_password(user_entry.password)
-            user_data_for_db = {
-                "email": user_entry.email,
-                "username": user_entry.email.split("@")[0],  # Simple username from email
+        existing_emails = await self.repository.get_existing_emails([entry.email for _, entry in unique_rows])
+        taken_usernames = await self.repository.get_existing_usernames(
+            [entry.email.split("@")[0] for _, entry in unique_rows]
+        )
+        new_rows = []
+        for row, entry in unique_rows:
+            if entry.email in existing_emails:
+                errors.append(OrganizationUserImportError(row=row, email=entry.email, detail="User with this email already exists"))
+                continue
+            username = entry.email.split("@")[0]
+            if username in taken_usernames:
+                # Fall back to the full email, which is unique by the check above
+                username = entry.email
+            taken_usernames.add(username)
+            new_rows.append((row, entry, username))
+        if not new_rows:
+            return created, errors
+
+        hashed_passwords = await hash_passwords_async([entry.password for _, entry, _ in new_rows])
+        users_data = [
+            {
+                "email": entry.email,
+                "username": username,
                 "password": hashed_password,
-                "subscription": user_entry.subscription,
+                "first_name": entry.first_name,
+                "last_name": entry.last_name,
+                "subscription": SubscriptionType(entry.subscription.value),
                 "role": UserRole.USER,
                 "verified": False,
                 "onboarded": False,
             }
-            created_user = await self.repository.bulk_create_users([user_data_for_db])
-            if created_user:
-                created_users.append(created_user[0])
-                org_user_data_for_db = {
-                    "user_id": created_user[0].id,
-                    "organization_id": org_id,
-                    "status": None,
-                    "role": UserRole.USER, # Assuming students are users
-                    "group_id": None,
-                }
-                created_org_user = await self.repository.bulk_create_organization_users([org_user_data_for_db])
-                if created_org_user:
-                    created_org_users.append(created_org_user[0])
-        
-        return [OrganizationUserResponse.model_validate(ou) for ou in created_org_users]
+            for (_, entry, username), hashed_password in zip(new_rows, hashed_passwords)
+        ]
+        try:
+            org_users = await self.repository.insert_organization_users_chunk(org_id, users_data)
+        except SQLAlchemyError:
+            errors.extend(
+                OrganizationUserImportError(row=row, email=entry.email, detail="Failed to insert rows of this chunk")
+                for row, entry, _ in new_rows
+            )
+            return created, errors
+
+        for row, entry, _ in new_rows:
+            org_user = org_users.get(entry.email)
+            if org_user is None:
+                errors.append(OrganizationUserImportError(row=row, email=entry.email, detail="User with this email or username already exists"))
+            else:
+                created.append(OrganizationUserResponse.model_validate(org_user))
+        return created, errors
+
+
+def _cell(value) -> Optional[str]:
+    if value is None:
+        return None
+    return str(value).strip()
+
+
+def _roster_entry(values: Dict[str, Any]) -> Dict[str, Any]:
+    subscription = _cell(values.get("subscription"))
+    return {
+        "email": _cell(values.get("email")),
+        "password": _cell(values.get("password")),
+        "subscription": subscription.upper() if subscription else OrganizationSubscriptionType.FREE,
+        "first_name": _cell(values.get("first_name")) or "",
+        "last_name": _cell(values.get("last_name")) or "",
+    }
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in error.errors())
+
+
+def _import_progress(users_import: OrganizationUserImport) -> OrganizationUserImportProgress:
+    return OrganizationUserImportProgress(
+        import_id=users_import.id,
+        organization_id=users_import.organization_id,
+        filename=users_import.filename,
+        status=users_import.status,
+        processed_rows=users_import.processed_rows,
+        created_count=users_import.created_count,
+        error_count=users_import.error_count,
+        errors=users_import.errors,
+        detail=users_import.detail,
+    )
+
+
+def _spool_upload(content: bytes, suffix: str) -> str:
+    # The spreadsheet parsers read from disk
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+        spool.write(content)
+    return spool.name
+
+
+async def _mark_users_import_failed(session: AsyncSession, payload: dict):
+    await OrganizationRepository(session).update_users_import(
+        payload["import_id"], status=OrganizationUserImportStatus.FAILED, content=None
+    )
+
+
+@register_job_handler(USERS_IMPORT_JOB, on_failure=_mark_users_import_failed)
+async def run_users_import_job(session: AsyncSession, payload: dict):
+    await OrganizationService(session).import_users_from_spreadsheet(payload["import_id"])
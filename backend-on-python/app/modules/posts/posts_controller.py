@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database.session import get_async_session
-from app.core.schemas.common import BaseFilter
-from app.core.utils.auth_utils import get_current_user # Corrected import path
-from app.core.utils.pagination_utils import paginate
+from app.core.schemas.common import BaseFilter, CursorFilter
+from app.core.utils.auth_utils import get_current_claims, get_current_user
+from app.core.utils.pagination_utils import cursor_paginate, paginate
 from app.modules.posts.posts_service import PostsService
 from app.modules.posts.posts_schemas import (
     PostsSummaryResponse,
@@ -13,8 +13,9 @@ from app.modules.posts.posts_schemas import (
     PostCreateRequest,
     PostUpdateRequest,
     PostFilter,
+    PostCursorFilter,
 )
-from app.core.schemas.common import PaginatedResponse
+from app.core.schemas.common import CursorPaginatedResponse, PaginatedResponse
 
 router = APIRouter()
 
@@ -22,7 +23,7 @@ router = APIRouter()
 @router.get("/", response_model=PaginatedResponse[PostsSummaryResponse])
 async def get_all_posts(
     filters: PostFilter = Depends(),
-    current_user: dict = Depends(get_current_user), # Make current_user optional for public access
+    current_user: dict = Depends(get_current_claims), # Make current_user optional for public access
     session: AsyncSession = Depends(get_async_session),
 ):
     service = PostsService(session)
@@ -31,10 +32,21 @@ async def get_all_posts(
     return paginate(items=posts, total=total_posts, page=filters.page, page_size=filters.page_size)
 
 
+@router.get("/feed", response_model=CursorPaginatedResponse[PostsSummaryResponse])
+async def get_posts_feed(
+    filters: PostCursorFilter = Depends(),
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
+):
+    service = PostsService(session)
+    posts, next_cursor = await service.get_posts_page(filters, current_user["id"] if current_user else None)
+    return cursor_paginate(items=posts, page_size=filters.page_size, next_cursor=next_cursor)
+
+
 @router.get("/{post_id}", response_model=PostsSummaryResponse)
 async def get_post_by_id(
     post_id: int,
-    current_user: dict = Depends(get_current_user), # Make current_user optional for public access
+    current_user: dict = Depends(get_current_claims), # Make current_user optional for public access
     session: AsyncSession = Depends(get_async_session),
 ):
     service = PostsService(session)
@@ -47,7 +59,7 @@ async def get_post_by_id(
 @router.post("/", response_model=PostsSummaryResponse, status_code=status.HTTP_201_CREATED)
 async def create_post(
     post_data: PostCreateRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_claims),
     session: AsyncSession = Depends(get_async_session),
 ):
     service = PostsService(session)
@@ -67,7 +79,7 @@ async def update_post(
     if not post or post.author.name != f"{current_user['first_name']} {current_user['last_name']}": # Simplified check, ideally check author_id
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this post")
     
-    updated_post = await service.update_post(post_id, post_data)
+    updated_post = await service.update_post(post_id, post_data, current_user["id"])
     if not updated_post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
     return updated_post
@@ -101,11 +113,22 @@ async def get_comments_for_post(
     return paginate( comments, total=total_comments, page=filters.page, page_size=filters.page_size)
 
 
+@router.get("/{post_id}/comments/feed", response_model=CursorPaginatedResponse[CommentsResponse])
+async def get_comments_feed(
+    post_id: int,
+    filters: CursorFilter = Depends(),
+    session: AsyncSession = Depends(get_async_session),
+):
+    service = PostsService(session)
+    comments, next_cursor = await service.get_comments_page(post_id, filters)
+    return cursor_paginate(items=comments, page_size=filters.page_size, next_cursor=next_cursor)
+
+
 @router.post("/{post_id}/comments", response_model=CommentsResponse, status_code=status.HTTP_201_CREATED)
 async def add_comment_to_post(
     post_id: int,
     comment_data: PostCommentsSubmitRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_claims),
     session: AsyncSession = Depends(get_async_session),
 ):
     service = PostsService(session)
@@ -120,7 +143,7 @@ async def add_comment_to_post(
 @router.post("/{post_id}/like", status_code=status.HTTP_200_OK)
 async def toggle_like_post(
     post_id: int,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_claims),
     session: AsyncSession = Depends(get_async_session),
 ):
     service = PostsService(session)
@@ -1,58 +1,101 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Select, cast, delete, func, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert
 
-from app.core.schemas.common import BaseFilter
+from app.core.schemas.common import BaseFilter, CursorFilter
 from app.core.models.posts_model import Post, Comment, PostLike
-from app.modules.posts.posts_schemas import PostCreateInternal, PostCreateRequest, PostUpdateInternal, PostUpdateRequest, PostCommentsSubmitRequest, PostFilter
+from app.modules.posts.posts_schemas import PostCreateInternal, PostCreateRequest, PostUpdateInternal, PostUpdateRequest, PostCommentsSubmitRequest, PostFilter, PostCursorFilter, PostSearchLanguage, PostSearchMode
+
+
+# Kazakh has no Postgres stemmer, so it is matched against the unstemmed "simple" lexemes
+SEARCH_CONFIGS = {
+    PostSearchLanguage.EN: "english",
+    PostSearchLanguage.RU: "russian",
+    PostSearchLanguage.KK: "simple",
+}
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
 
 
 class PostsRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_posts(self, filters: PostFilter) -> List[Post]:
-        query = select(Post).options(selectinload(Post.likes)).options(selectinload(Post.comments)).order_by(Post.created_at.desc())  # Default sort by newest first
+    def _search_query(self, filters: PostFilter):
+        config = cast(SEARCH_CONFIGS[filters.search_language], REGCONFIG)
+        return func.websearch_to_tsquery(config, filters.search)
+
+    def _is_fulltext(self, filters: PostFilter) -> bool:
+        return bool(filters.search) and filters.search_mode == PostSearchMode.FULLTEXT
 
+    def _apply_filters(self, query: Select, filters: PostFilter) -> Select:
         if filters.tags:
             query = query.where(Post.tags.overlap(filters.tags)) # Use tags directly as List[str]
         if filters.mentions:
             query = query.where(Post.mentions.overlap(filters.mentions)) # Filter by mentions
         if filters.user_id:
             query = query.where(Post.author_id == filters.user_id)
-        if filters.search:
+        if self._is_fulltext(filters):
+            # Served by the GIN index on posts.search_vector
+            query = query.where(Post.search_vector.op("@@")(self._search_query(filters)))
+        elif filters.search:
             search_pattern = f"%{filters.search}%"
             query = query.where(Post.content.ilike(search_pattern))
+        return query
 
+    async def get_posts(self, filters: PostFilter) -> List[Post]:
+        query = select(Post)
+        if self._is_fulltext(filters):
+            # Most relevant first, newest first among equally ranked posts
+            rank = func.ts_rank_cd(Post.search_vector, self._search_query(filters))
+            query = query.order_by(rank.desc(), Post.created_at.desc())
+        else:
+            query = query.order_by(Post.created_at.desc())  # Default sort by newest first
+        query = self._apply_filters(query, filters)
         query = query.offset(filters.skip).limit(filters.page_size)
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_posts_page(self, filters: PostCursorFilter, after: Optional[Tuple[datetime, int]]) -> List[Post]:
+        # Keyset pagination over (created_at, id); served by ix_posts_created_at_id.
+        # Fetches one extra row so the caller can tell whether a next page exists.
+        query = select(Post).order_by(Post.created_at.desc(), Post.id.desc())
+        query = self._apply_filters(query, filters)
+        if after:
+            query = query.where(tuple_(Post.created_at, Post.id) < tuple_(*after))
+        query = query.limit(filters.page_size + 1)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_search_headlines(self, post_ids: List[int], filters: PostFilter) -> Dict[int, str]:
+        # ts_headline re-parses the document, so it only runs for the page being returned
+        if not post_ids or not self._is_fulltext(filters):
+            return {}
+        config = cast(SEARCH_CONFIGS[filters.search_language], REGCONFIG)
+        result = await self.session.execute(
+            select(
+                Post.id,
+                func.ts_headline(config, Post.content, self._search_query(filters), HEADLINE_OPTIONS),
+            ).where(Post.id.in_(post_ids))
+        )
+        return {post_id: headline for post_id, headline in result.all()}
+
     async def count_posts(self, filters: PostFilter) -> int:
         query = select(func.count()).select_from(Post)
-        if filters.tags:
-            query = query.where(Post.tags.overlap(filters.tags)) # Use tags directly as List[str]
-        if filters.mentions:
-            query = query.where(Post.mentions.overlap(filters.mentions)) # Filter by mentions
-        if filters.user_id:
-            query = query.where(Post.author_id == filters.user_id)
-        if filters.search:
-            search_pattern = f"%{filters.search}%"
-            query = query.where(Post.content.ilike(search_pattern))
+        query = self._apply_filters(query, filters)
         result = await self.session.execute(query)
         return result.scalar_one()
 
-    async def get_post_by_id(self, post_id: int) -> Optional[Post]:
-        stmt = (
-            select(Post)
-            .where(Post.id == post_id)
-            # Eagerly load likes and comments
-            .options(selectinload(Post.likes))
-            .options(selectinload(Post.comments))
+    async def _increment_counter(self, post_id: int, column, delta: int):
+        await self.session.execute(
+            update(Post).where(Post.id == post_id).values({column: column + delta})
         )
-        result = await self.session.execute(stmt)
+
+    async def get_post_by_id(self, post_id: int) -> Optional[Post]:
+        result = await self.session.execute(select(Post).where(Post.id == post_id))
         return result.scalar_one_or_none()
 
     async def create_post(self, post_data: PostCreateInternal, author_id: int) -> Post:
@@ -86,10 +129,26 @@ class PostsRepository:
 
     async def get_comments_for_post(self, post_id: int, filters: BaseFilter) -> List[Comment]:
         result = await self.session.execute(
-            select(Comment).where(Comment.post_id == post_id).offset(filters.skip).limit(filters.page_size)
+            select(Comment)
+            .where(Comment.post_id == post_id)
+            .order_by(Comment.created_at, Comment.id)
+            .offset(filters.skip)
+            .limit(filters.page_size)
         )
         return result.scalars().all()
 
+    async def get_comments_page(self, post_id: int, filters: CursorFilter, after: Optional[Tuple[datetime, int]]) -> List[Comment]:
+        # Oldest first; served by ix_post_comments_post_id_created_at_id
+        query = (
+            select(Comment)
+            .where(Comment.post_id == post_id)
+            .order_by(Comment.created_at, Comment.id)
+        )
+        if after:
+            query = query.where(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+        result = await self.session.execute(query.limit(filters.page_size + 1))
+        return result.scalars().all()
+
     async def count_comments_for_post(self, post_id: int, filters: BaseFilter) -> int:
         result = await self.session.execute(
             select(func.count()).where(Comment.post_id == post_id).select_from(Comment)
@@ -99,6 +158,7 @@ class PostsRepository:
     async def add_comment_to_post(self, post_id: int, user_id: int, comment_data: PostCommentsSubmitRequest) -> Comment:
         new_comment = Comment(post_id=post_id, user_id=user_id, content=comment_data.content)
         self.session.add(new_comment)
+        await self._increment_counter(post_id, Post.comments_count, 1)
         await self.session.commit()
         await self.session.refresh(new_comment)
         return new_comment
@@ -109,20 +169,36 @@ class PostsRepository:
         )
         return result.scalar_one_or_none()
 
-    async def like_post(self, post_id: int, user_id: int) -> PostLike:
-        new_like = PostLike(post_id=post_id, user_id=user_id)
-        self.session.add(new_like)
+    async def get_liked_post_ids(self, post_ids: List[int], user_id: int) -> Set[int]:
+        if not post_ids:
+            return set()
+        result = await self.session.execute(
+            select(PostLike.post_id).where(PostLike.post_id.in_(post_ids), PostLike.user_id == user_id)
+        )
+        return set(result.scalars().all())
+
+    async def like_post(self, post_id: int, user_id: int) -> bool:
+        # Idempotent under ix_post_likes_post_id_user_id: a concurrent duplicate like is a no-op
+        result = await self.session.execute(
+            insert(PostLike)
+            .values(post_id=post_id, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
+            .returning(PostLike.id)
+        )
+        liked = result.scalar_one_or_none() is not None
+        if liked:
+            await self._increment_counter(post_id, Post.likes_count, 1)
         await self.session.commit()
-        await self.session.refresh(new_like)
-        return new_like
+        return liked
 
     async def unlike_post(self, post_id: int, user_id: int) -> bool:
-        existing_like = await self.session.execute(
-            select(PostLike).where(PostLike.post_id == post_id, PostLike.user_id == user_id)
+        result = await self.session.execute(
+            delete(PostLike)
+            .where(PostLike.post_id == post_id, PostLike.user_id == user_id)
+            .returning(PostLike.id)
         )
-        like = existing_like.scalar_one_or_none()
-        if like:
-            await self.session.delete(like)
-            await self.session.commit()
-            return True
-        return False
+        unliked = result.scalar_one_or_none() is not None
+        if unliked:
+            await self._increment_counter(post_id, Post.likes_count, -1)
+        await self.session.commit()
+        return unliked
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 
 from fastapi import Query
@@ -24,6 +25,7 @@ class PostsSummaryResponse(BaseSchema):
     comments: int
     created_at: datetime
     is_liked: bool = False
+    highlight: Optional[str] = None # Matched snippet, set for full-text searches
 
 
 class CommentsResponse(BaseSchema):
@@ -33,7 +35,18 @@ class CommentsResponse(BaseSchema):
     created_at: datetime
 
 
-from app.core.schemas.common import BaseFilter
+from app.core.schemas.common import BaseFilter, CursorFilter
+
+
+class PostSearchMode(str, Enum):
+    FULLTEXT = "FULLTEXT"
+    SUBSTRING = "SUBSTRING"
+
+
+class PostSearchLanguage(str, Enum):
+    EN = "EN"
+    RU = "RU"
+    KK = "KK"
 
 
 class PostCommentsSubmitRequest(BaseSchema):
@@ -53,6 +66,14 @@ class PostFilter(BaseFilter):
     mentions: Optional[List[str]] = Query(None, description="Filter by mentions")
     user_id: Optional[int] = Query(None, description="Filter by user ID")
     search: Optional[str] = Query(None, description="Search by title or content")
+    # Substring matching stays the default; clients opt in to full-text search
+    search_mode: PostSearchMode = Query(PostSearchMode.SUBSTRING, description="Substring match or ranked full-text search")
+    search_language: PostSearchLanguage = Query(PostSearchLanguage.RU, description="Language used to parse the full-text query")
+
+
+class PostCursorFilter(CursorFilter, PostFilter):
+    # Paged by cursor; the inherited page number does not apply
+    page: int = Query(default=1, ge=1, include_in_schema=False)
 
 class PostCreateInternal(BaseSchema):
     content: str
@@ -1,10 +1,10 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.models.posts_model import Post, Comment
-from app.core.utils.pagination_utils import paginate
+from app.core.utils.pagination_utils import decode_cursor, encode_cursor, paginate
 from app.modules.posts.posts_repository import PostsRepository
-from app.core.schemas.common import BaseFilter, PaginatedResponse
+from app.core.schemas.common import BaseFilter, CursorFilter, PaginatedResponse
 from app.modules.posts.posts_schemas import (
     PostCreateInternal,
     PostUpdateInternal,
@@ -15,6 +15,7 @@ from app.modules.posts.posts_schemas import (
     PostUpdateRequest,
     PostCommentsSubmitRequest,
     PostFilter,
+    PostCursorFilter,
 )
 from app.modules.users.users_repository import UserRepository
 from app.core.utils.text_utils import extract_hashtags, extract_mentions
@@ -25,12 +26,8 @@ class PostsService:
         self.posts_repo = PostsRepository(session)
         self.users_repo = UserRepository(session)
 
-    async def _get_author_response(self, user_id: int) -> AuthorResponse:
-        user = await self.users_repo.get_user_by_id(user_id)
-        if not user:
-            # This should ideally not happen if FK constraints are properly enforced
-            return AuthorResponse(name="Unknown", organization_name=None, avatar_url=None)
-
+    @staticmethod
+    def _to_author_response(user) -> AuthorResponse:
         organization_name = None
         # if user.organization_id:
         #     organization = await self.users_repo.get_organization_by_id(user.organization_id)
@@ -44,29 +41,52 @@ class PostsService:
             avatar_url=user.avatar_id,  # Assuming avatar_id is the URL or can be converted
         )
 
+    async def _get_author_responses(self, user_ids: List[int]) -> Dict[int, AuthorResponse]:
+        users = await self.users_repo.get_users_by_ids(user_ids)
+        authors = {user.id: self._to_author_response(user) for user in users}
+        for user_id in user_ids:
+            # This should ideally not happen if FK constraints are properly enforced
+            authors.setdefault(user_id, AuthorResponse(id=user_id, name="Unknown"))
+        return authors
+
+    async def _build_post_responses(self, posts: List[Post], current_user_id: Optional[int] = None, highlights: Optional[Dict[int, str]] = None) -> List[PostsSummaryResponse]:
+        # One query for all authors and one for the viewer's likes, regardless of page size
+        authors = await self._get_author_responses([post.author_id for post in posts])
+        liked_post_ids = set()
+        if current_user_id:
+            liked_post_ids = await self.posts_repo.get_liked_post_ids([post.id for post in posts], current_user_id)
+
+        return [
+            PostsSummaryResponse(
+                id=post.id,
+                author=authors[post.author_id],
+                content=post.content,
+                mediaUrls=[],  # TODO: mediaUrls add after S3 integration
+                tags=post.tags,
+                mentions=post.mentions,
+                likes=post.likes_count,
+                comments=post.comments_count,
+                created_at=post.created_at,
+                is_liked=post.id in liked_post_ids,
+                highlight=highlights.get(post.id) if highlights else None,
+            )
+            for post in posts
+        ]
+
     async def get_all_posts(self, filters: PostFilter, current_user_id: Optional[int] = None) -> List[PostsSummaryResponse]:
         posts = await self.posts_repo.get_posts(filters)
-        response_posts = []
-        for post in posts:
-            author_response = await self._get_author_response(post.author_id)
-            is_liked = False
-            if current_user_id:
-                is_liked = await self.posts_repo.get_like(post.id, current_user_id) is not None
-            response_posts.append(
-                PostsSummaryResponse(
-                    id=post.id,
-                    author=author_response,
-                    content=post.content,
-                    mediaUrls=[],  # TODO: mediaUrls add after S3 integration
-                    tags=post.tags,
-                    mentions=post.mentions, # Include mentions
-                    likes=len(post.likes),
-                    comments=len(post.comments),
-                    created_at=post.created_at,
-                    is_liked=is_liked,
-                )
-            )
-        return response_posts
+        highlights = await self.posts_repo.get_search_headlines([post.id for post in posts], filters)
+        return await self._build_post_responses(posts, current_user_id, highlights)
+
+    async def get_posts_page(self, filters: PostCursorFilter, current_user_id: Optional[int] = None) -> Tuple[List[PostsSummaryResponse], Optional[str]]:
+        after = decode_cursor(filters.cursor) if filters.cursor else None
+        posts = await self.posts_repo.get_posts_page(filters, after)
+        next_cursor = None
+        if len(posts) > filters.page_size:
+            posts = posts[:filters.page_size]
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+        highlights = await self.posts_repo.get_search_headlines([post.id for post in posts], filters)
+        return await self._build_post_responses(posts, current_user_id, highlights), next_cursor
 
     async def count_posts(self, filters: PostFilter) -> int:
         return await self.posts_repo.count_posts(filters)
@@ -75,22 +95,7 @@ class PostsService:
         post = await self.posts_repo.get_post_by_id(post_id)
         if not post:
             return None
-        author_response = await self._get_author_response(post.author_id)
-        is_liked = False
-        if current_user_id:
-            is_liked = await self.posts_repo.get_like(post.id, current_user_id) is not None
-        return PostsSummaryResponse(
-            id=post.id,
-            author=author_response,
-            content=post.content,
-            tags=post.tags,
-            mentions=post.mentions, # Include mentions
-            mediaUrls=[],  # TODO: mediaUrls add after S3 integration
-            likes=len(post.likes),
-            comments=len(post.comments),
-            created_at=post.created_at,
-            is_liked=is_liked,
-        )
+        return (await self._build_post_responses([post], current_user_id))[0]
 
     async def create_post(self, post_data: PostCreateRequest, author_id: int) -> PostsSummaryResponse:
         post_content = post_data.content
@@ -106,20 +111,9 @@ class PostsService:
 
         # Pass the internal model to the repository
         new_post = await self.posts_repo.create_post(internal_post_data, author_id)
-        author_response = await self._get_author_response(new_post.author_id)
-        return PostsSummaryResponse(
-            id=new_post.id,
-            author=author_response,
-            content=new_post.content,
-            tags=new_post.tags,
-            mentions=new_post.mentions,
-            mediaUrls=[],
-            likes=0,
-            comments=0,
-            created_at=new_post.created_at,
-        )
+        return (await self._build_post_responses([new_post], author_id))[0]
 
-    async def update_post(self, post_id: int, post_data: PostUpdateRequest) -> Optional[PostsSummaryResponse]:
+    async def update_post(self, post_id: int, post_data: PostUpdateRequest, current_user_id: Optional[int] = None) -> Optional[PostsSummaryResponse]:
         # Create a dictionary for update values
         update_values = post_data.model_dump(exclude_unset=True) # Start with fields from request body
 
@@ -136,46 +130,51 @@ class PostsService:
         updated_post = await self.posts_repo.update_post(post_id, internal_update_data)
         if not updated_post:
             return None
-        author_response = await self._get_author_response(updated_post.author_id)
-        return PostsSummaryResponse(
-            id=updated_post.id,
-            author=author_response,
-            content=updated_post.content,
-            tags=updated_post.tags,
-            mentions=updated_post.mentions,
-            mediaUrls=[],
-            likes=len(updated_post.likes), # Assuming likes is a list/collection in DB model
-            comments=len(updated_post.comments), # Assuming comments is a list/collection in DB model
-            created_at=updated_post.created_at,
-        )
+        return (await self._build_post_responses([updated_post], current_user_id))[0]
 
     async def delete_post(self, post_id: int) -> bool:
         return await self.posts_repo.delete_post(post_id)
 
     async def get_comments_for_post(self, post_id: int, filters: BaseFilter) -> List[CommentsResponse]:
         comments = await self.posts_repo.get_comments_for_post(post_id, filters)
-        response_comments = []
-        for comment in comments:
-            author_response = await self._get_author_response(comment.user_id)
-            response_comments.append(
-                CommentsResponse(
-                    id=comment.id,
-                    author=author_response,
-                    content=comment.content,
-                    created_at=comment.created_at,
-                )
+        authors = await self._get_author_responses([comment.user_id for comment in comments])
+        return [
+            CommentsResponse(
+                id=comment.id,
+                author=authors[comment.user_id],
+                content=comment.content,
+                created_at=comment.created_at,
             )
-        return response_comments
+            for comment in comments
+        ]
     
+    async def get_comments_page(self, post_id: int, filters: CursorFilter) -> Tuple[List[CommentsResponse], Optional[str]]:
+        after = decode_cursor(filters.cursor) if filters.cursor else None
+        comments = await self.posts_repo.get_comments_page(post_id, filters, after)
+        next_cursor = None
+        if len(comments) > filters.page_size:
+            comments = comments[:filters.page_size]
+            next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+        authors = await self._get_author_responses([comment.user_id for comment in comments])
+        return [
+            CommentsResponse(
+                id=comment.id,
+                author=authors[comment.user_id],
+                content=comment.content,
+                created_at=comment.created_at,
+            )
+            for comment in comments
+        ], next_cursor
+
     async def count_comments_for_post(self, post_id: int, filters: BaseFilter) -> int:
         return await self.posts_repo.count_comments_for_post(post_id, filters)
 
     async def add_comment_to_post(self, post_id: int, user_id: int, comment_data: PostCommentsSubmitRequest) -> CommentsResponse:
         new_comment = await self.posts_repo.add_comment_to_post(post_id, user_id, comment_data)
-        author_response = await self._get_author_response(new_comment.user_id)
+        authors = await self._get_author_responses([new_comment.user_id])
         return CommentsResponse(
             id=new_comment.id,
-            author=author_response,
+            author=authors[new_comment.user_id],
             content=new_comment.content,
             created_at=new_comment.created_at,
         )
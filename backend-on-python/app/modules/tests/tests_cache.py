@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from app.core.config.config import get_settings
+from app.modules.tests.tests_repository import TestsRepository
+from app.modules.tests.tests_schemas import AnswerResponse, TestQuestionResponse
+
+
+class TestCatalog:
+    """
+    Immutable snapshot of all test content with question navigation precomputed.
+
+    Args:
+        questions: Ready-to-serve question responses by question id.
+        question_test_ids: Owning test id by question id.
+        question_ids_by_test: Question ids of each test in display order.
+    """
+
+    def __init__(
+        self,
+        questions: Dict[int, TestQuestionResponse],
+        question_test_ids: Dict[int, int],
+        question_ids_by_test: Dict[int, List[int]],
+    ):
+        self.questions = questions
+        self.question_test_ids = question_test_ids
+        self.question_ids_by_test = question_ids_by_test
+        self.loaded_at = time.monotonic()
+
+    def get_question(self, test_id: int, question_id: int) -> Optional[TestQuestionResponse]:
+        if self.question_test_ids.get(question_id) != test_id:
+            return None
+        return self.questions[question_id]
+
+    def first_question_id(self, test_id: int) -> Optional[int]:
+        question_ids = self.question_ids_by_test.get(test_id)
+        return question_ids[0] if question_ids else None
+
+    def count_questions(self, test_id: int) -> int:
+        return len(self.question_ids_by_test.get(test_id, ()))
+
+
+# Test content is only written by scripts and migrations outside the API
+# processes, so there is no invalidation hook: every worker reloads on TTL
+_catalog: Optional[TestCatalog] = None
+_lock = asyncio.Lock()
+
+
+def _is_fresh(catalog: Optional[TestCatalog]) -> bool:
+    return (
+        catalog is not None
+        and time.monotonic() - catalog.loaded_at < get_settings().cache.test_content_ttl_secs
+    )
+
+
+async def get_test_catalog(repository: TestsRepository) -> TestCatalog:
+    global _catalog
+    catalog = _catalog
+    if _is_fresh(catalog):
+        return catalog
+    async with _lock:
+        # Another request may have rebuilt it while we waited
+        if _is_fresh(_catalog):
+            return _catalog
+        _catalog = _build_catalog(await repository.get_test_content())
+        return _catalog
+
+
+def _build_catalog(tests) -> TestCatalog:
+    questions = {}
+    question_test_ids = {}
+    question_ids_by_test = {}
+    for test in tests:
+        ordered = test.questions
+        question_ids_by_test[test.id] = [question.id for question in ordered]
+        for index, question in enumerate(ordered):
+            question_test_ids[question.id] = test.id
+            questions[question.id] = TestQuestionResponse(
+                id=question.id,
+                question=question.question,
+                answers=[AnswerResponse.model_validate(answer) for answer in question.answers],
+                next_question_id=ordered[index + 1].id if index + 1 < len(ordered) else None,
+                previous_question_id=ordered[index - 1].id if index > 0 else None,
+            )
+    return TestCatalog(questions, question_test_ids, question_ids_by_test)
@@ -1,14 +1,18 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.models.users_model import User
-from app.core.utils.auth_utils import get_current_user
+from app.core.database.session import get_async_session
+from app.core.utils.auth_utils import get_current_claims
+from app.core.utils.sse_utils import sse_response
 from app.modules.tests.tests_schemas import (
     TestSummaryResponse,
+    TestProgressResponse,
     TestDetailsResponse,
     TestQuestionResponse,
     TestQuestionSubmitRequest,
+    TestAnalysisStatusResponse,
     PersonalityAnalysisResponse,
 )
 from app.modules.tests.tests_service import TestsService
@@ -17,46 +21,79 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[TestSummaryResponse])
-def get_tests(
-    current_user: User = Depends(get_current_user),
-    service: TestsService = Depends(),
+async def get_tests(
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    return service.get_all_tests_for_user(current_user.id)
+    service = TestsService(session)
+    return await service.get_all_tests_for_user(current_user["id"])
+
+
+@router.get("/progress", response_model=List[TestProgressResponse])
+async def get_tests_progress(
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
+):
+    service = TestsService(session)
+    return await service.get_tests_progress(current_user["id"])
 
 
 @router.get("/{test_id}", response_model=TestDetailsResponse)
-def get_test_details(
+async def get_test_details(
     test_id: int,
-    current_user: User = Depends(get_current_user),
-    service: TestsService = Depends(),
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    return service.get_test_details(current_user.id, test_id)
+    service = TestsService(session)
+    return await service.get_test_details(current_user["id"], test_id)
 
 
 @router.get("/{test_id}/questions/{question_id}", response_model=TestQuestionResponse)
-def get_test_question(
+async def get_test_question(
     test_id: int,
     question_id: int,
-    service: TestsService = Depends(),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    return service.get_test_question(test_id, question_id)
+    service = TestsService(session)
+    return await service.get_test_question(test_id, question_id)
 
 
 @router.post("/{test_id}/questions/{question_id}")
-def submit_answer(
+async def submit_answer(
     test_id: int,
     question_id: int,
     data: TestQuestionSubmitRequest,
-    current_user: User = Depends(get_current_user),
-    service: TestsService = Depends(),
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    service.submit_answer(current_user.id, test_id, question_id, data)
+    service = TestsService(session)
+    await service.submit_answer(current_user["id"], test_id, question_id, data)
     return {"message": "Answer submitted successfully"}
 
 
+@router.get("/{test_id}/analysis", response_model=TestAnalysisStatusResponse)
+async def get_test_analysis_status(
+    test_id: int,
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
+):
+    service = TestsService(session)
+    return await service.get_analysis_status(current_user["id"], test_id)
+
+
 @router.post("/analysis", response_model=PersonalityAnalysisResponse)
-def analyze_tests(
-    current_user: User = Depends(get_current_user),
-    service: TestsService = Depends(),
+async def analyze_tests(
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
+):
+    service = TestsService(session)
+    return await service.analyze_tests(current_user["id"])
+
+
+@router.post("/analysis/stream")
+async def stream_analyze_tests(
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    return service.analyze_tests(current_user.id)
+    service = TestsService(session)
+    return sse_response(await service.stream_analyze_tests(current_user["id"]))
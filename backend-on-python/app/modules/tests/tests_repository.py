@@ -1,106 +1,183 @@
 from typing import List, Optional
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, func, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.models.tests_models import (
     Test,
     TestSubmission,
+    TestSubmissionStatus,
+    TestSubmissionAnalysisStatus,
     Question,
     TestSubmissionQuestion,
     PersonalityAnalysis,
+    PersonalityAnalysisAttributes,
+    PersonalityAnalysisMajors,
+    PersonalityAnalysisMbti,
+    PersonalityAnalysisProfessions,
 )
 
 
 class TestsRepository:
-    def __init__(self, db: Session):
-        self.db = db
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_test_content(self) -> List[Test]:
+        result = await self.session.execute(
+            select(Test)
+            .options(selectinload(Test.questions).selectinload(Question.answers))
+            .order_by(Test.id)
+        )
+        return list(result.scalars().all())
 
-    def get_all_tests(self) -> List[Test]:
-        return self.db.query(Test).all()
+    async def get_tests_progress(self, user_id: int) -> List[Row]:
+        # One round trip for the whole catalog: the user's (first) submission per test is
+        # picked laterally and both counts are correlated subqueries on indexed columns
+        submission = (
+            select(TestSubmission.id, TestSubmission.status)
+            .where(TestSubmission.user_id == user_id, TestSubmission.test_id == Test.id)
+            .order_by(TestSubmission.id)
+            .limit(1)
+            .correlate(Test)
+            .lateral("submission")
+        )
+        questions_count = (
+            select(func.count(Question.id))
+            .where(Question.test_id == Test.id)
+            .correlate(Test)
+            .scalar_subquery()
+        )
+        answered_count = (
+            select(func.count(func.distinct(TestSubmissionQuestion.question_id)))
+            .where(TestSubmissionQuestion.submission_id == submission.c.id)
+            .correlate(submission)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            select(
+                Test.id,
+                Test.name,
+                Test.description,
+                Test.estimated_time_minutes,
+                questions_count.label("questions_count"),
+                func.coalesce(answered_count, 0).label("answered_count"),
+                submission.c.status,
+            )
+            .select_from(Test)
+            .outerjoin(submission, true())
+            .order_by(Test.id)
+        )
+        return list(result.all())
 
-    def get_test_by_id(self, test_id: int) -> Optional[Test]:
-        return self.db.query(Test).filter(Test.id == test_id).first()
+    async def get_test_by_id(self, test_id: int) -> Optional[Test]:
+        result = await self.session.execute(select(Test).where(Test.id == test_id))
+        return result.scalar_one_or_none()
 
-    def get_user_test_submission(
+    async def get_user_test_submission(
         self, user_id: int, test_id: int
     ) -> Optional[TestSubmission]:
-        return (
-            self.db.query(TestSubmission)
-            .filter(TestSubmission.user_id == user_id, TestSubmission.test_id == test_id)
-            .first()
+        result = await self.session.execute(
+            select(TestSubmission)
+            .options(selectinload(TestSubmission.submitted_answers))
+            .where(TestSubmission.user_id == user_id, TestSubmission.test_id == test_id)
         )
+        return result.scalars().first()
 
-    def create_test_submission(self, user_id: int, test_id: int) -> TestSubmission:
-        submission = TestSubmission(user_id=user_id, test_id=test_id, status="NOT_STARTED")
-        self.db.add(submission)
-        self.db.commit()
-        self.db.refresh(submission)
-        return submission
-
-    def get_question_by_id(self, question_id: int) -> Optional[Question]:
-        return self.db.query(Question).filter(Question.id == question_id).first()
-
-    def get_next_question(self, test_id: int, current_order: int) -> Optional[Question]:
-        return (
-            self.db.query(Question)
-            .filter(Question.test_id == test_id, Question.order > current_order)
-            .order_by(Question.order)
-            .first()
+    async def create_test_submission(self, user_id: int, test_id: int) -> TestSubmission:
+        submission = TestSubmission(
+            user_id=user_id, test_id=test_id, status=TestSubmissionStatus.NOT_STARTED
         )
+        self.session.add(submission)
+        await self.session.commit()
+        await self.session.refresh(submission)
+        return submission
 
-    def get_previous_question(
-        self, test_id: int, current_order: int
-    ) -> Optional[Question]:
-        return (
-            self.db.query(Question)
-            .filter(Question.test_id == test_id, Question.order < current_order)
-            .order_by(Question.order.desc())
-            .first()
+    async def count_answered_questions(self, submission_id: int) -> int:
+        result = await self.session.execute(
+            select(func.count(func.distinct(TestSubmissionQuestion.question_id)))
+            .where(TestSubmissionQuestion.submission_id == submission_id)
         )
+        return result.scalar_one()
 
-    def submit_answer(
+    async def submit_answer(
         self, submission_id: int, question_id: int, answer_id: int
     ) -> TestSubmissionQuestion:
         submission_question = TestSubmissionQuestion(
             submission_id=submission_id, question_id=question_id, answer_id=answer_id
         )
-        self.db.add(submission_question)
-        self.db.commit()
-        self.db.refresh(submission_question)
+        self.session.add(submission_question)
+        await self.session.commit()
+        await self.session.refresh(submission_question)
         return submission_question
 
-    def update_submission_status(self, submission_id: int, status: str):
-        submission = (
-            self.db.query(TestSubmission)
-            .filter(TestSubmission.id == submission_id)
-            .first()
+    async def update_submission_status(
+        self,
+        submission_id: int,
+        status: TestSubmissionStatus,
+        analysis_status: Optional[TestSubmissionAnalysisStatus] = None,
+    ):
+        values = {"status": status}
+        if analysis_status is not None:
+            values["analysis_status"] = analysis_status
+        await self.session.execute(
+            update(TestSubmission).where(TestSubmission.id == submission_id).values(**values)
+        )
+        await self.session.commit()
+
+    async def update_analysis_status(self, submission_id: int, analysis_status: TestSubmissionAnalysisStatus):
+        await self.session.execute(
+            update(TestSubmission)
+            .where(TestSubmission.id == submission_id)
+            .values(analysis_status=analysis_status)
         )
-        submission.status = status
-        self.db.commit()
+        await self.session.commit()
 
-    def update_submission_analysis(
+    async def update_submission_analysis(
         self, submission_id: int, analysis_summary: str, analysis_key_factors: List[str]
     ):
-        submission = (
-            self.db.query(TestSubmission)
-            .filter(TestSubmission.id == submission_id)
-            .first()
+        await self.session.execute(
+            update(TestSubmission)
+            .where(TestSubmission.id == submission_id)
+            .values(
+                analysis_summary=analysis_summary,
+                analysis_key_factors=analysis_key_factors,
+                analysis_status=TestSubmissionAnalysisStatus.COMPLETED,
+            )
         )
-        submission.analysis_summary = analysis_summary
-        submission.analysis_key_factors = analysis_key_factors
-        self.db.commit()
+        await self.session.commit()
+
+    async def get_submission_with_answers(self, submission_id: int) -> Optional[TestSubmission]:
+        result = await self.session.execute(
+            select(TestSubmission)
+            .options(
+                selectinload(TestSubmission.test),
+                selectinload(TestSubmission.submitted_answers).selectinload(TestSubmissionQuestion.question),
+                selectinload(TestSubmission.submitted_answers).selectinload(TestSubmissionQuestion.answer),
+            )
+            .where(TestSubmission.id == submission_id)
+        )
+        return result.scalar_one_or_none()
 
-    def get_all_user_submissions(self, user_id: int) -> List[TestSubmission]:
-        return (
-            self.db.query(TestSubmission).filter(TestSubmission.user_id == user_id).all()
+    async def get_all_user_submissions(self, user_id: int) -> List[TestSubmission]:
+        result = await self.session.execute(
+            select(TestSubmission)
+            .options(selectinload(TestSubmission.test))
+            .where(TestSubmission.user_id == user_id)
         )
+        return list(result.scalars().all())
 
-    def create_personality_analysis(
+    async def create_personality_analysis(
         self, user_id: int, analysis_data: dict
     ) -> PersonalityAnalysis:
-        analysis = PersonalityAnalysis(user_id=user_id, **analysis_data)
-        self.db.add(analysis)
-        self.db.commit()
-        self.db.refresh(analysis)
+        analysis = PersonalityAnalysis(
+            user_id=user_id,
+            mbti=[PersonalityAnalysisMbti(**analysis_data["mbti"])],
+            professions=[PersonalityAnalysisProfessions(**item) for item in analysis_data["professions"]],
+            majors=[PersonalityAnalysisMajors(**item) for item in analysis_data["majors"]],
+            attributes=[PersonalityAnalysisAttributes(**item) for item in analysis_data["attributes"]],
+        )
+        self.session.add(analysis)
+        await self.session.commit()
+        await self.session.refresh(analysis)
         return analysis
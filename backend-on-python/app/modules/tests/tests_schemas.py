@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 
 from app.core.models.tests_models import (
     TestSubmissionStatus,
+    TestSubmissionAnalysisStatus,
     PersonalityAnalysisAttributeType,
 )
 
@@ -22,6 +23,16 @@ class TestSummaryResponse(BaseModel):
         validate_by_name = True
 
 
+class TestProgressResponse(BaseModel):
+    test_id: int = Field(..., alias="testId")
+    all_questions_count: int = Field(..., alias="allQuestionsCount")
+    completed_questions_count: int = Field(..., alias="completedQuestionsCount")
+    status: TestSubmissionStatus
+
+    class Config:
+        validate_by_name = True
+
+
 class TestDetailsResponse(TestSummaryResponse):
     last_question_id: Optional[int] = Field(None, alias="lastQuestionId")
 
@@ -56,6 +67,17 @@ class TestQuestionSubmitRequest(BaseModel):
         validate_by_name = True
 
 
+class TestAnalysisStatusResponse(BaseModel):
+    submission_id: int = Field(..., alias="submissionId")
+    status: TestSubmissionStatus
+    analysis_status: Optional[TestSubmissionAnalysisStatus] = Field(None, alias="analysisStatus")
+    analysis_summary: Optional[str] = Field(None, alias="analysisSummary")
+    analysis_key_factors: Optional[List[str]] = Field(None, alias="analysisKeyFactors")
+
+    class Config:
+        validate_by_name = True
+
+
 class ShortAnalysisResponse(BaseModel):
     analysis_summary: str
     analysis_key_factors: List[str]
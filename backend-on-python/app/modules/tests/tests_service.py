@@ -1,108 +1,141 @@
-from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import AsyncIterator
 
-from app.core.database.session import get_async_session
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config.config import get_settings
+from app.core.database.session import new_async_session
+from app.core.models.tests_models import TestSubmissionAnalysisStatus, TestSubmissionStatus
+from app.core.utils.sse_utils import format_partial_json_event, format_sse_event
+from app.modules.jobs.jobs_repository import JobsRepository
+from app.modules.jobs.jobs_worker import register_job_handler
 from app.modules.llm.llm_service import LLMService
 from app.modules.llm.prompt_builder import (
     build_personality_analysis_prompt,
     build_short_analysis_prompt,
 )
+from app.modules.tests.tests_cache import get_test_catalog
 from app.modules.tests.tests_repository import TestsRepository
 from app.modules.tests.tests_schemas import (
     TestSummaryResponse,
+    TestProgressResponse,
     TestDetailsResponse,
-    TestQuestionResponse,
     TestQuestionSubmitRequest,
+    TestAnalysisStatusResponse,
     PersonalityAnalysisResponse,
 )
 from app.modules.users.users_repository import UserRepository
 
+SHORT_ANALYSIS_JOB = "tests.short_analysis"
+
 
 class TestsService:
-    def __init__(self, db: Session = Depends(get_async_session)):
-        self.repository = TestsRepository(db)
-        self.users_repository = UserRepository(db)
+    def __init__(self, session: AsyncSession):
+        self.repository = TestsRepository(session)
+        self.users_repository = UserRepository(session)
+        self.jobs_repository = JobsRepository(session)
         self.llm_service = LLMService()
 
-    def get_all_tests_for_user(self, user_id: int):
-        tests = self.repository.get_all_tests()
-        summaries = []
-        for test in tests:
-            submission = self.repository.get_user_test_submission(user_id, test.id)
-            summaries.append(
-                TestSummaryResponse(
-                    id=test.id,
-                    title=test.name,
-                    description=test.description,
-                    all_questions_count=len(test.questions),
-                    estimated_time_in_minutes=test.estimated_time_minutes,
-                    completed_questions_count=len(submission.submitted_answers)
-                    if submission
-                    else 0,
-                    status=submission.status if submission else "NOT_STARTED",
-                )
+    async def get_all_tests_for_user(self, user_id: int):
+        return [
+            TestSummaryResponse(
+                id=row.id,
+                title=row.name,
+                description=row.description,
+                all_questions_count=row.questions_count,
+                estimated_time_in_minutes=row.estimated_time_minutes,
+                completed_questions_count=row.answered_count,
+                status=row.status or TestSubmissionStatus.NOT_STARTED,
+            )
+            for row in await self.repository.get_tests_progress(user_id)
+        ]
+
+    async def get_tests_progress(self, user_id: int):
+        return [
+            TestProgressResponse(
+                test_id=row.id,
+                all_questions_count=row.questions_count,
+                completed_questions_count=row.answered_count,
+                status=row.status or TestSubmissionStatus.NOT_STARTED,
             )
-        return summaries
+            for row in await self.repository.get_tests_progress(user_id)
+        ]
 
-    def get_test_details(self, user_id: int, test_id: int):
-        test = self.repository.get_test_by_id(test_id)
+    async def get_test_details(self, user_id: int, test_id: int):
+        test = await self.repository.get_test_by_id(test_id)
         if not test:
             raise HTTPException(status_code=404, detail="Test not found")
 
-        submission = self.repository.get_user_test_submission(user_id, test.id)
+        catalog = await get_test_catalog(self.repository)
+        submission = await self.repository.get_user_test_submission(user_id, test.id)
         last_question_id = (
             submission.submitted_answers[-1].question_id
             if submission and submission.submitted_answers
-            else test.questions[0].id
+            else catalog.first_question_id(test.id)
         )
 
         return TestDetailsResponse(
             id=test.id,
             title=test.name,
             description=test.description,
-            all_questions_count=len(test.questions),
+            all_questions_count=catalog.count_questions(test.id),
             estimated_time_in_minutes=test.estimated_time_minutes,
-            completed_questions_count=len(submission.submitted_answers)
-            if submission
-            else 0,
-            status=submission.status if submission else "NOT_STARTED",
+            completed_questions_count=_answered_count(submission),
+            status=submission.status if submission else TestSubmissionStatus.NOT_STARTED,
             last_question_id=last_question_id,
         )
 
-    def get_test_question(self, test_id: int, question_id: int):
-        question = self.repository.get_question_by_id(question_id)
-        if not question or question.test_id != test_id:
+    async def get_test_question(self, test_id: int, question_id: int):
+        catalog = await get_test_catalog(self.repository)
+        question = catalog.get_question(test_id, question_id)
+        if not question:
             raise HTTPException(status_code=404, detail="Question not found")
+        return question
 
-        next_q = self.repository.get_next_question(test_id, question.order)
-        prev_q = self.repository.get_previous_question(test_id, question.order)
-
-        return TestQuestionResponse(
-            id=question.id,
-            question=question.question,
-            answers=question.answers,
-            next_question_id=next_q.id if next_q else None,
-            previous_question_id=prev_q.id if prev_q else None,
-        )
-
-    def submit_answer(
+    async def submit_answer(
         self, user_id: int, test_id: int, question_id: int, data: TestQuestionSubmitRequest
     ):
-        submission = self.repository.get_user_test_submission(user_id, test_id)
+        submission = await self.repository.get_user_test_submission(user_id, test_id)
         if not submission:
-            submission = self.repository.create_test_submission(user_id, test_id)
-
-        self.repository.submit_answer(submission.id, question_id, data.answer_id)
-
-        if len(submission.submitted_answers) == len(submission.test.questions):
-            self.repository.update_submission_status(submission.id, "COMPLETED")
-            self._run_short_analysis(submission)
+            submission = await self.repository.create_test_submission(user_id, test_id)
+
+        await self.repository.submit_answer(submission.id, question_id, data.answer_id)
+
+        catalog = await get_test_catalog(self.repository)
+        answered = await self.repository.count_answered_questions(submission.id)
+        if answered >= catalog.count_questions(test_id):
+            if submission.analysis_status in (TestSubmissionAnalysisStatus.PENDING, TestSubmissionAnalysisStatus.RUNNING):
+                await self.repository.update_submission_status(submission.id, TestSubmissionStatus.COMPLETED)
+                return
+            # The LLM round trip happens in the job worker; the job commits with the status change
+            await self.jobs_repository.enqueue(
+                SHORT_ANALYSIS_JOB,
+                {"submission_id": submission.id},
+                max_attempts=get_settings().jobs.max_attempts,
+            )
+            await self.repository.update_submission_status(
+                submission.id,
+                TestSubmissionStatus.COMPLETED,
+                analysis_status=TestSubmissionAnalysisStatus.PENDING,
+            )
         else:
-            self.repository.update_submission_status(submission.id, "ACTIVE")
+            await self.repository.update_submission_status(submission.id, TestSubmissionStatus.ACTIVE)
+
+    async def get_analysis_status(self, user_id: int, test_id: int) -> TestAnalysisStatusResponse:
+        submission = await self.repository.get_user_test_submission(user_id, test_id)
+        if not submission:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        return TestAnalysisStatusResponse(
+            submission_id=submission.id,
+            status=submission.status,
+            analysis_status=submission.analysis_status,
+            analysis_summary=submission.analysis_summary,
+            analysis_key_factors=submission.analysis_key_factors,
+        )
 
-    def analyze_tests(self, user_id: int) -> PersonalityAnalysisResponse:
-        submissions = self.repository.get_all_user_submissions(user_id)
-        if not all(sub.status == "COMPLETED" for sub in submissions):
+    async def _build_personality_prompt(self, user_id: int) -> dict:
+        submissions = await self.repository.get_all_user_submissions(user_id)
+        if not all(sub.status == TestSubmissionStatus.COMPLETED for sub in submissions):
             raise HTTPException(
                 status_code=400, detail="All tests must be completed before analysis"
             )
@@ -115,18 +148,28 @@ class TestsService:
             }
             for sub in submissions
         ]
+        return build_personality_analysis_prompt(test_results)
 
-        prompt = build_personality_analysis_prompt(test_results)
-        llm_response = self.llm_service.get_personality_analysis(prompt)
+    async def analyze_tests(self, user_id: int) -> PersonalityAnalysisResponse:
+        prompt = await self._build_personality_prompt(user_id)
+        llm_response = await self.llm_service.get_personality_analysis(prompt)
 
         if not llm_response:
             raise HTTPException(
                 status_code=500, detail="Failed to get analysis from LLM"
             )
 
-        return self.repository.create_personality_analysis(user_id, llm_response)
+        analysis = await self.repository.create_personality_analysis(user_id, llm_response)
+        return PersonalityAnalysisResponse.model_validate({**llm_response, "id": analysis.id})
 
-    def _run_short_analysis(self, submission):
+    async def stream_analyze_tests(self, user_id: int) -> AsyncIterator[str]:
+        # Validation errors are raised here, before the response starts
+        prompt = await self._build_personality_prompt(user_id)
+        return _stream_personality_analysis(user_id, prompt)
+
+    async def run_short_analysis(self, submission_id: int):
+        await self.repository.update_analysis_status(submission_id, TestSubmissionAnalysisStatus.RUNNING)
+        submission = await self.repository.get_submission_with_answers(submission_id)
         test_results = {
             "test_name": submission.test.name,
             "answers": [
@@ -135,11 +178,46 @@ class TestsService:
             ],
         }
         prompt = build_short_analysis_prompt(test_results)
-        llm_response = self.llm_service.get_short_analysis(prompt)
+        llm_response = await self.llm_service.get_short_analysis(prompt)
+        if not llm_response:
+            # Raising hands the job back to the queue for a retry
+            raise RuntimeError("Failed to get short analysis from LLM")
 
-        if llm_response:
-            self.repository.update_submission_analysis(
-                submission.id,
-                llm_response["analysis_summary"],
-                llm_response["analysis_key_factors"],
-            )
+        await self.repository.update_submission_analysis(
+            submission.id,
+            llm_response["analysis_summary"],
+            llm_response["analysis_key_factors"],
+        )
+
+
+async def _stream_personality_analysis(user_id: int, prompt: dict) -> AsyncIterator[str]:
+    # Runs after the endpoint has returned, so it cannot use the request's session
+    async with new_async_session() as session:
+        service = TestsService(session)
+        async for kind, payload in service.llm_service.stream_personality_analysis(prompt):
+            if kind == "partial":
+                yield format_partial_json_event(payload)
+            elif kind == "result":
+                analysis = await service.repository.create_personality_analysis(user_id, payload)
+                yield format_sse_event(
+                    "result", PersonalityAnalysisResponse.model_validate({**payload, "id": analysis.id})
+                )
+            else:
+                yield format_sse_event("error", {"detail": payload})
+
+
+async def _mark_short_analysis_failed(session: AsyncSession, payload: dict):
+    await TestsRepository(session).update_analysis_status(
+        payload["submission_id"], TestSubmissionAnalysisStatus.FAILED
+    )
+
+
+@register_job_handler(SHORT_ANALYSIS_JOB, on_failure=_mark_short_analysis_failed)
+async def run_short_analysis_job(session: AsyncSession, payload: dict):
+    await TestsService(session).run_short_analysis(payload["submission_id"])
+
+
+def _answered_count(submission) -> int:
+    if not submission:
+        return 0
+    return len({answer.question_id for answer in submission.submitted_answers})
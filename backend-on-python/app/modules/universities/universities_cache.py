@@ -0,0 +1,66 @@
+import asyncio
+import time
+from typing import List, Optional
+
+from pydantic import TypeAdapter
+
+from app.core.config.config import get_settings
+from app.core.utils.etag_utils import compute_etag
+from app.modules.universities.universities_repository import UniversitiesRepository
+from app.modules.universities.universities_schemas import UniversitiesCountryResponse
+
+_COUNTRIES_ADAPTER = TypeAdapter(List[UniversitiesCountryResponse])
+
+
+class CountryCounts:
+    """
+    Encoded /universities/countries response, shared by all requests of a process.
+
+    Args:
+        body: JSON response body.
+        etag: Strong ETag of `body`; identical across workers for identical data.
+    """
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self.loaded_at = time.monotonic()
+
+
+# Institutions are only written by scripts and imports outside the API
+# processes, so there is no invalidation hook: every worker reloads on TTL
+_counts: Optional[CountryCounts] = None
+_lock = asyncio.Lock()
+
+
+def _is_fresh(counts: Optional[CountryCounts]) -> bool:
+    return (
+        counts is not None
+        and time.monotonic() - counts.loaded_at < get_settings().cache.country_counts_ttl_secs
+    )
+
+
+async def get_country_counts(repository: UniversitiesRepository) -> CountryCounts:
+    global _counts
+    counts = _counts
+    if _is_fresh(counts):
+        return counts
+    async with _lock:
+        # Another request may have reloaded it while we waited
+        if _is_fresh(_counts):
+            return _counts
+        rows = await repository.get_countries_with_university_count()
+        body = _COUNTRIES_ADAPTER.dump_json(
+            [
+                UniversitiesCountryResponse(
+                    id=row.id,
+                    name=row.name,
+                    emoji=row.emoji,
+                    universities_count=row.universities_count,
+                )
+                for row in rows
+            ],
+            by_alias=True,
+        )
+        _counts = CountryCounts(body, compute_etag(body))
+        return _counts
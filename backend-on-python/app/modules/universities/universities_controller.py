@@ -1,16 +1,20 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.models.users_model import User
-from app.core.utils.auth_utils import get_current_user
+from app.core.config.config import get_settings
+from app.core.database.session import get_async_session
+from app.core.utils.auth_utils import get_current_claims, get_optional_claims
+from app.core.utils.etag_utils import etag_matches
+from app.core.utils.sse_utils import sse_response
 from app.modules.universities.universities_schemas import (
     UniversitiesCountryResponse,
-    InstitutionResponse,
+    InstitutionCatalogFilter,
+    InstitutionCatalogResponse,
     InstitutionDetailsResponse,
     UniversityAnalysisRequest,
     UniversityAnalysisResponse,
-    InstitutionFilterRequest,
 )
 from app.modules.universities.universities_service import UniversitiesService
 
@@ -22,22 +26,34 @@ router = APIRouter()
     response_model=List[UniversitiesCountryResponse],
     summary="Get list of countries with university counts",
 )
-def get_countries(
-    service: UniversitiesService = Depends(),
+async def get_countries(
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    return service.get_countries_with_university_count()
+    service = UniversitiesService(session)
+    counts = await service.get_countries_with_university_count()
+    headers = {
+        "ETag": counts.etag,
+        "Cache-Control": f"public, max-age={get_settings().cache.country_counts_ttl_secs}",
+    }
+    if etag_matches(if_none_match, counts.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=counts.body, media_type="application/json", headers=headers)
 
 
 @router.get(
     "/institutions",
-    response_model=List[InstitutionResponse],
-    summary="Get list of institutions with optional filters",
+    response_model=InstitutionCatalogResponse,
+    summary="Browse institutions page by page with filters and facet counts",
 )
-def get_institutions(
-    filters: InstitutionFilterRequest = Depends(),
-    service: UniversitiesService = Depends(),
+async def get_institutions(
+    filters: InstitutionCatalogFilter = Depends(),
+    current_user: Optional[dict] = Depends(get_optional_claims),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    return service.get_institutions(filters)
+    # Signed-in users get an admission chance estimate on every card
+    service = UniversitiesService(session)
+    return await service.get_institution_catalog(filters, current_user["id"] if current_user else None)
 
 
 @router.get(
@@ -45,11 +61,12 @@ def get_institutions(
     response_model=InstitutionDetailsResponse,
     summary="Get detailed information about a specific institution",
 )
-def get_institution_details(
+async def get_institution_details(
     institution_id: int,
-    service: UniversitiesService = Depends(),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    institution = service.get_institution_by_id(institution_id)
+    service = UniversitiesService(session)
+    institution = await service.get_institution_by_id(institution_id)
     if not institution:
         raise HTTPException(status_code=404, detail="Institution not found")
     return institution
@@ -60,12 +77,26 @@ def get_institution_details(
     response_model=UniversityAnalysisResponse,
     summary="Perform university analysis based on user profile",
 )
-def analyze_universities(
+async def analyze_universities(
     analysis_request: UniversityAnalysisRequest,
-    current_user: User = Depends(get_current_user),
-    service: UniversitiesService = Depends(),
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    return service.create_university_analysis(current_user.id, analysis_request)
+    service = UniversitiesService(session)
+    return await service.create_university_analysis(current_user["id"], analysis_request)
+
+
+@router.post(
+    "/analyze/stream",
+    summary="Stream university analysis sections as Server-Sent Events",
+)
+async def stream_analyze_universities(
+    analysis_request: UniversityAnalysisRequest,
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
+):
+    service = UniversitiesService(session)
+    return sse_response(await service.stream_university_analysis(current_user["id"], analysis_request))
 
 
 @router.get(
@@ -73,11 +104,12 @@ def analyze_universities(
     response_model=UniversityAnalysisResponse,
     summary="Get the latest university analysis for the current user",
 )
-def get_latest_analysis(
-    current_user: User = Depends(get_current_user),
-    service: UniversitiesService = Depends(),
+async def get_latest_analysis(
+    current_user: dict = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    analysis = service.get_latest_university_analysis(current_user.id)
+    service = UniversitiesService(session)
+    analysis = await service.get_latest_university_analysis(current_user["id"])
     if not analysis:
         raise HTTPException(status_code=404, detail="No analysis found")
     return analysis
@@ -0,0 +1,123 @@
+import logging
+from typing import List, Optional
+
+from app.core.config.config import get_settings
+from app.core.utils.text_utils import estimate_tokens
+from app.modules.llm.prompt_builder import build_university_analysis_prompt, compact_json
+
+logger = logging.getLogger(__name__)
+
+# Fields that say nothing about admission chances
+DROPPED_INSTITUTION_FIELDS = ("website", "email", "contact_number", "address", "image_url")
+DESCRIPTION_CHARS = 400
+MAJOR_DESCRIPTION_CHARS = 120
+
+
+def _truncate(text: Optional[str], limit: int) -> Optional[str]:
+    if not text or len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+def trim_institution(data: dict, aggressive: bool = False) -> dict:
+    """
+    Drops the parts of a serialized institution that cost tokens without
+    informing the analysis.
+
+    Args:
+        data: Output of serialize_institution.
+        aggressive: Also drop all free-text descriptions, for institutions
+            that do not fit the budget otherwise.
+
+    Returns:
+        A trimmed copy; contact details are removed, descriptions shortened
+        and majors repeated under the same name and language merged.
+    """
+    trimmed = {key: value for key, value in data.items() if key not in DROPPED_INSTITUTION_FIELDS}
+    trimmed["description"] = None if aggressive else _truncate(data["description"], DESCRIPTION_CHARS)
+
+    majors = {}
+    for major in data["majors"]:
+        key = (major["name"].strip().lower(), major["learning_language"])
+        if key in majors:
+            continue
+        major = dict(major)
+        major["description"] = None if aggressive else _truncate(major["description"], MAJOR_DESCRIPTION_CHARS)
+        if major["description"] is None:
+            del major["description"]
+        majors[key] = major
+    trimmed["majors"] = list(majors.values())
+    if trimmed["description"] is None:
+        del trimmed["description"]
+    return trimmed
+
+
+def pack_institutions(
+    institutions: List[dict], budget_tokens: int, max_per_batch: int, model: Optional[str] = None
+) -> List[List[dict]]:
+    """
+    Splits serialized institutions into batches that each fit one prompt.
+
+    Institutions keep their order and are packed greedily: a batch is closed
+    once the next institution would exceed `budget_tokens` or the batch holds
+    `max_per_batch` institutions. Institutions that do not fit an empty batch
+    even when trimmed aggressively are left out.
+
+    Args:
+        institutions: serialize_institution outputs.
+        budget_tokens: Tokens available for the universities payload of one prompt.
+        max_per_batch: Most institutions a single completion can analyze.
+        model: Model name used for token counting.
+
+    Returns:
+        Non-empty batches of trimmed institutions.
+    """
+    batches: List[List[dict]] = []
+    batch: List[dict] = []
+    used = 0
+    for data in institutions:
+        trimmed = trim_institution(data)
+        # +1 for the separating comma in the JSON array
+        tokens = estimate_tokens(compact_json(trimmed), model) + 1
+        if tokens > budget_tokens:
+            trimmed = trim_institution(data, aggressive=True)
+            tokens = estimate_tokens(compact_json(trimmed), model) + 1
+            if tokens > budget_tokens:
+                logger.warning(
+                    "Institution %s needs %d tokens, over the %d token budget; skipped",
+                    data["id"], tokens, budget_tokens,
+                )
+                continue
+        if batch and (used + tokens > budget_tokens or len(batch) >= max_per_batch):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(trimmed)
+        used += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def pack_analysis_batches(user_profile: dict, universities_data: List[dict]) -> List[List[dict]]:
+    """
+    Packs institutions for a university analysis using the LLM settings.
+
+    Whatever the template, schema and profile leave of the context window
+    after reserving the completion goes to institutions. A batch holds at most
+    institutions_per_analysis_call institutions, and no more than the
+    completion has room to answer for.
+    """
+    settings = get_settings().llm
+    overhead = build_university_analysis_prompt(user_profile, [])["tokens"]
+    return pack_institutions(
+        universities_data,
+        budget_tokens=settings.context_window_tokens - settings.max_tokens - overhead,
+        max_per_batch=max(
+            1,
+            min(
+                settings.institutions_per_analysis_call,
+                settings.max_tokens // settings.output_tokens_per_institution,
+            ),
+        ),
+        model=settings.model,
+    )
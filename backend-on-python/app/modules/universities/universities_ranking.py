@@ -0,0 +1,315 @@
+import asyncio
+import re
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config.config import get_settings
+from app.core.models.interests_model import InterestsEnum
+from app.core.models.universities_models import Institution, InstitutionMajorCategory
+from app.core.models.users_model import LanguageLevel, User
+from app.modules.universities.universities_repository import UniversitiesRepository
+
+CATEGORIES = list(InstitutionMajorCategory)
+CATEGORY_INDEX = {category: index for index, category in enumerate(CATEGORIES)}
+
+SCORE_METRICS = ("gpa", "sat", "ielts", "toefl")
+# Missing a threshold by this much makes the academic fit for that score 0
+SCORE_SCALES = np.array([1.0, 200.0, 1.5, 20.0])
+
+INTEREST_CATEGORIES = {
+    InterestsEnum.MATHEMATICS: InstitutionMajorCategory.STEM,
+    InterestsEnum.PHYSICS: InstitutionMajorCategory.STEM,
+    InterestsEnum.CHEMISTRY: InstitutionMajorCategory.STEM,
+    InterestsEnum.BIOLOGY: InstitutionMajorCategory.MEDICINE,
+    InterestsEnum.COMPUTER_SCIENCE: InstitutionMajorCategory.STEM,
+    InterestsEnum.HISTORY: InstitutionMajorCategory.HUMANITIES,
+    InterestsEnum.GEOGRAPHY: InstitutionMajorCategory.HUMANITIES,
+    InterestsEnum.LITERATURE: InstitutionMajorCategory.HUMANITIES,
+    InterestsEnum.LANGUAGES: InstitutionMajorCategory.HUMANITIES,
+    InterestsEnum.ART: InstitutionMajorCategory.ARTS,
+    InterestsEnum.MUSIC: InstitutionMajorCategory.ARTS,
+    InterestsEnum.ECONOMICS: InstitutionMajorCategory.BUSINESS,
+    InterestsEnum.PSYCHOLOGY: InstitutionMajorCategory.HUMANITIES,
+    InterestsEnum.MEDICINE: InstitutionMajorCategory.MEDICINE,
+    InterestsEnum.ENGINEERING: InstitutionMajorCategory.STEM,
+    InterestsEnum.BUSINESS: InstitutionMajorCategory.BUSINESS,
+    InterestsEnum.DESIGN: InstitutionMajorCategory.ARTS,
+    InterestsEnum.AI_MACHINE_LEARNING: InstitutionMajorCategory.STEM,
+    InterestsEnum.DATA_SCIENCE: InstitutionMajorCategory.STEM,
+    InterestsEnum.CYBERSECURITY: InstitutionMajorCategory.STEM,
+    InterestsEnum.GAME_DEVELOPMENT: InstitutionMajorCategory.STEM,
+    InterestsEnum.DIGITAL_CONTENT_CREATION: InstitutionMajorCategory.ARTS,
+    InterestsEnum.ROBOTICS: InstitutionMajorCategory.STEM,
+    InterestsEnum.GRAPHIC_DESIGN: InstitutionMajorCategory.ARTS,
+    InterestsEnum.FASHION: InstitutionMajorCategory.ARTS,
+    InterestsEnum.ENTREPRENEURSHIP: InstitutionMajorCategory.BUSINESS,
+    InterestsEnum.ENVIRONMENTAL_STUDIES: InstitutionMajorCategory.STEM,
+    InterestsEnum.MENTAL_WELLBEING: InstitutionMajorCategory.MEDICINE,
+    InterestsEnum.FINANCE: InstitutionMajorCategory.BUSINESS,
+}
+
+LANGUAGE_LEVEL_WEIGHTS = {
+    LanguageLevel.NATIVE: 1.0,
+    LanguageLevel.FLUENT: 1.0,
+    LanguageLevel.BEGINNER: 0.3,
+}
+
+# Admission chance model: CHANCE_BASE when the user is exactly at every known
+# threshold, scaled by one factor per required score. The factor is 2 * logistic of
+# the margin (in SCORE_SCALES): 1 at the threshold, up to 2 above it, down to 0
+# below it, so a met requirement never scores lower than an absent one
+CHANCE_BASE = 0.6
+CHANCE_SLOPE = 2.0
+# Factor for a required score the user has not reported
+CHANCE_UNREPORTED = 0.5
+CHANCE_MIN, CHANCE_MAX = 1.0, 95.0
+
+INTEREST_WEIGHT = 0.5
+ACADEMIC_WEIGHT = 0.35
+LANGUAGE_WEIGHT = 0.15
+
+_METRIC = re.compile(r"\b(gpa|sat|ielts|toefl)\b")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+
+
+def parse_score_requirement(name: str, value: Optional[str]) -> Optional[Tuple[str, float]]:
+    """
+    Reads a minimum test score out of a free-form enrollment requirement.
+
+    Args:
+        name: Requirement name, e.g. "IELTS" or "Minimum GPA".
+        value: Requirement value, e.g. "6.5" or "from 1200".
+
+    Returns:
+        (metric, threshold) with metric one of SCORE_METRICS, or None if the
+        requirement is not a recognizable score threshold.
+    """
+    metric = _METRIC.search(f"{name} {value or ''}".lower())
+    number = _NUMBER.search(value or "") or _NUMBER.search(name)
+    if metric is None or number is None:
+        return None
+    return metric.group(1), float(number.group().replace(",", "."))
+
+
+def requirement_thresholds(requirements: Iterable[Tuple[str, Optional[str]]]) -> np.ndarray:
+    """The highest minimum per SCORE_METRICS among (name, value) requirements, NaN where none."""
+    thresholds = np.full(len(SCORE_METRICS), np.nan)
+    for name, value in requirements:
+        parsed = parse_score_requirement(name, value)
+        if parsed is not None:
+            column = SCORE_METRICS.index(parsed[0])
+            thresholds[column] = np.fmax(thresholds[column], parsed[1])
+    return thresholds
+
+
+def user_scores(user: User) -> np.ndarray:
+    """The user's GPA/SAT/IELTS/TOEFL in SCORE_METRICS order, NaN where unknown."""
+    academic = user.academic_info
+    return np.array(
+        [
+            getattr(academic, metric) if academic is not None and getattr(academic, metric) is not None else np.nan
+            for metric in SCORE_METRICS
+        ],
+        dtype=np.float64,
+    )
+
+
+def estimate_chances(thresholds: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """
+    Admission chance from test scores alone.
+
+    Args:
+        thresholds: (institutions, SCORE_METRICS) minimums, NaN when not required.
+        scores: The user's scores from user_scores.
+
+    Returns:
+        Chance per institution in percent, rounded to one decimal; NaN where no
+        required score can be compared with one the user reported.
+    """
+    margin = (scores - thresholds) / SCORE_SCALES
+    factors = 2 / (1 + np.exp(-CHANCE_SLOPE * margin))
+    factors = np.where(np.isnan(scores), CHANCE_UNREPORTED, factors)
+    factors = np.where(np.isnan(thresholds), 1.0, factors)
+    chances = np.clip(100 * CHANCE_BASE * factors.prod(axis=-1), CHANCE_MIN, CHANCE_MAX)
+    compared = (~np.isnan(thresholds) & ~np.isnan(scores)).any(axis=-1)
+    return np.where(compared, np.round(chances, 1), np.nan)
+
+
+def _percentages(chances: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(chance) else chance for chance in chances.tolist()]
+
+
+def institution_chances(user: User, institutions: Sequence[Institution]) -> Dict[int, Optional[float]]:
+    """Estimated admission chances for loaded institutions, from their current requirements."""
+    thresholds = np.array(
+        [
+            requirement_thresholds(
+                (requirement.name, requirement.value) for requirement in institution.enrollment_requirements
+            )
+            for institution in institutions
+        ]
+    ).reshape(-1, len(SCORE_METRICS))
+    chances = estimate_chances(thresholds, user_scores(user))
+    return {institution.id: chance for institution, chance in zip(institutions, _percentages(chances))}
+
+
+class InstitutionFeatures:
+    """
+    Feature matrices for the whole catalog, one row per institution.
+
+    Args:
+        ids: Institution ids, aligned with the rows of every matrix.
+        categories: Share of each institution's majors per InstitutionMajorCategory.
+        languages: 1 where some major is taught in the language (columns per language_index).
+        language_index: Column of each lower-cased learning language.
+        thresholds: Minimum score per SCORE_METRICS, NaN when not required.
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        categories: np.ndarray,
+        languages: np.ndarray,
+        language_index: dict,
+        thresholds: np.ndarray,
+    ):
+        self.ids = ids
+        self.row_of = {institution_id: row for row, institution_id in enumerate(ids.tolist())}
+        self.categories = categories
+        self.languages = languages
+        self.language_index = language_index
+        self.thresholds = thresholds
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def build(cls, institution_ids: Iterable[int], majors: Iterable[tuple], requirements: Iterable[tuple]):
+        """
+        Args:
+            institution_ids: Every institution of the catalog.
+            majors: (institution_id, category, learning_language) rows.
+            requirements: (institution_id, name, value) rows.
+        """
+        ids = np.asarray(list(institution_ids), dtype=np.int64)
+        row_of = {institution_id: row for row, institution_id in enumerate(ids.tolist())}
+        count = len(ids)
+
+        majors = [major for major in majors if major[0] in row_of]
+        language_index = {}
+        for _, _, language in majors:
+            if language:
+                language_index.setdefault(language.strip().lower(), len(language_index))
+        rows = np.array([row_of[major[0]] for major in majors], dtype=np.int64)
+
+        categories = np.zeros((count, len(CATEGORIES)))
+        columns = np.array([CATEGORY_INDEX[major[1]] for major in majors], dtype=np.int64)
+        np.add.at(categories, (rows, columns), 1)
+        totals = categories.sum(axis=1, keepdims=True)
+        categories = np.divide(categories, totals, out=np.zeros_like(categories), where=totals > 0)
+
+        languages = np.zeros((count, len(language_index)))
+        with_language = np.array([index for index, major in enumerate(majors) if major[2]], dtype=np.int64)
+        columns = np.array(
+            [language_index[majors[index][2].strip().lower()] for index in with_language], dtype=np.int64
+        )
+        languages[rows[with_language], columns] = 1
+
+        by_institution = defaultdict(list)
+        for institution_id, name, value in requirements:
+            by_institution[institution_id].append((name, value))
+        thresholds = np.full((count, len(SCORE_METRICS)), np.nan)
+        for institution_id, institution_requirements in by_institution.items():
+            if institution_id in row_of:
+                thresholds[row_of[institution_id]] = requirement_thresholds(institution_requirements)
+
+        return cls(ids, categories, languages, language_index, thresholds)
+
+    def _interest_vector(self, user: User) -> np.ndarray:
+        vector = np.zeros(len(CATEGORIES))
+        for interest in user.interests or []:
+            category = INTEREST_CATEGORIES.get(interest)
+            if category is not None:
+                vector[CATEGORY_INDEX[category]] += 1
+        if not vector.any():
+            return np.full(len(CATEGORIES), 1 / len(CATEGORIES))
+        return vector / vector.sum()
+
+    def _language_vector(self, user: User) -> np.ndarray:
+        vector = np.zeros(len(self.language_index))
+        for proficiency in user.language_proficiencies:
+            column = self.language_index.get(proficiency.language.strip().lower())
+            if column is not None:
+                vector[column] = max(vector[column], LANGUAGE_LEVEL_WEIGHTS.get(proficiency.level, 0.0))
+        return vector
+
+    def score(self, user: User) -> np.ndarray:
+        """Relevance of every institution to `user`, in [0, 1], aligned with `ids`."""
+        interest = self.categories @ self._interest_vector(user)
+
+        # Per score: 1 when met, falling linearly to 0 at one SCORE_SCALES below the
+        # threshold; 0.5 when required but the user has not reported it. Institutions
+        # with no known thresholds get a neutral 0.5, below ones the user qualifies for
+        scores = user_scores(user)
+        fit = np.clip(1 - (self.thresholds - scores) / SCORE_SCALES, 0, 1)
+        fit = np.where(np.isnan(scores), 0.5, fit)
+        required = ~np.isnan(self.thresholds)
+        required_count = required.sum(axis=1)
+        academic = np.where(
+            required_count > 0,
+            np.where(required, fit, 0).sum(axis=1) / np.maximum(required_count, 1),
+            0.5,
+        )
+
+        # Institutions with no language data get a neutral 0.5
+        language = np.minimum(self.languages @ self._language_vector(user), 1)
+        language = np.where(self.languages.any(axis=1), language, 0.5)
+
+        return INTEREST_WEIGHT * interest + ACADEMIC_WEIGHT * academic + LANGUAGE_WEIGHT * language
+
+    def top_k(self, user: User, k: int) -> List[int]:
+        """Ids of the `k` institutions most relevant to `user`, best first."""
+        scores = self.score(user)
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return self.ids[order].tolist()
+
+    def chances(self, user: User, institution_ids: Sequence[int]) -> Dict[int, Optional[float]]:
+        """
+        Estimated admission chances of `user` in percent, by institution id.
+
+        None where there is nothing to estimate from; institutions added after
+        the snapshot was built are left out.
+        """
+        rows = [self.row_of[institution_id] for institution_id in institution_ids if institution_id in self.row_of]
+        chances = estimate_chances(self.thresholds[rows], user_scores(user))
+        return dict(zip(self.ids[rows].tolist(), _percentages(chances)))
+
+
+# Like the country counts, rebuilt on TTL only: the catalog is not written by the API
+_features: Optional[InstitutionFeatures] = None
+_lock = asyncio.Lock()
+
+
+def _is_fresh(features: Optional[InstitutionFeatures]) -> bool:
+    return (
+        features is not None
+        and time.monotonic() - features.loaded_at < get_settings().cache.institution_features_ttl_secs
+    )
+
+
+async def get_institution_features(repository: UniversitiesRepository) -> InstitutionFeatures:
+    global _features
+    features = _features
+    if _is_fresh(features):
+        return features
+    async with _lock:
+        # Another request may have rebuilt it while we waited
+        if _is_fresh(_features):
+            return _features
+        _features = InstitutionFeatures.build(*await repository.get_institution_feature_rows())
+        return _features
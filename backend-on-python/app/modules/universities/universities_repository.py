@@ -1,67 +1,277 @@
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import String, cast, exists, func, literal, select, text, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.models.countries_model import Country
 from app.core.models.universities_models import (
+    CountryUniversityCount,
     Institution,
+    InstitutionEnrollmentRequirement,
+    InstitutionMajor,
     UniversitiesAnalysis,
+    UniversitiesAnalysisInstitutes,
+    UniversitiesAnalysisResultsAttributes,
+    UniversitiesAnalysisResultsPlan,
 )
-from app.modules.universities.universities_schemas import (
-    InstitutionFilterRequest,
-    UniversityAnalysisRequest,
+from app.modules.universities.universities_schemas import InstitutionCatalogFilter
+
+CATALOG_FACETS = ("city_id", "financing_type", "type", "has_dorm", "major_category", "learning_language")
+
+# Everything InstitutionDetailsResponse and serialize_institution read. selectinload
+# costs one extra query per relationship regardless of how many institutions are
+# loaded, where joinedload on the three collections multiplies rows.
+INSTITUTION_DETAILS = (
+    selectinload(Institution.city),
+    selectinload(Institution.country),
+    selectinload(Institution.majors),
+    selectinload(Institution.enrollment_documents),
+    selectinload(Institution.enrollment_requirements),
+)
+
+_ANALYSIS_INSTITUTES = selectinload(UniversitiesAnalysis.institutes)
+ANALYSIS_DETAILS = (
+    _ANALYSIS_INSTITUTES.selectinload(UniversitiesAnalysisInstitutes.institution).selectinload(Institution.city),
+    _ANALYSIS_INSTITUTES.selectinload(UniversitiesAnalysisInstitutes.institution).selectinload(Institution.country),
+    _ANALYSIS_INSTITUTES.selectinload(UniversitiesAnalysisInstitutes.attributes),
+    _ANALYSIS_INSTITUTES.selectinload(UniversitiesAnalysisInstitutes.plan),
 )
 
 
 class UniversitiesRepository:
-    def __init__(self, db: Session):
-        self.db = db
+    def __init__(self, session: AsyncSession):
+        self.session = session
 
-    def get_countries_with_university_count(self):
-        return (
-            self.db.query(
+    async def get_countries_with_university_count(self):
+        # Reads the trigger-maintained counters: one row per country, no scan of institutions
+        result = await self.session.execute(
+            select(
                 Country.id,
                 Country.name,
                 Country.emoji,
-                func.count(Institution.id).label("universities_count"),
+                CountryUniversityCount.universities_count,
+            )
+            .join(CountryUniversityCount, Country.id == CountryUniversityCount.country_id)
+            .where(CountryUniversityCount.universities_count > 0)
+            .order_by(Country.id)
+        )
+        return result.all()
+
+    async def rebuild_country_university_counts(self) -> int:
+        """
+        Recomputes the country counters from institutions.
+
+        Writers to institutions wait while it runs, so no trigger update can
+        interleave with the recount; readers are not blocked.
+
+        Returns:
+            How many counters were corrected.
+        """
+        await self.session.execute(text("LOCK TABLE institutions IN SHARE MODE"))
+        result = await self.session.execute(
+            text(
+                """
+                INSERT INTO country_university_counts AS c (country_id, universities_count)
+                SELECT countries.id, count(institutions.id)
+                FROM countries
+                LEFT JOIN institutions ON institutions.country_id = countries.id
+                GROUP BY countries.id
+                ON CONFLICT (country_id) DO UPDATE
+                SET universities_count = EXCLUDED.universities_count
+                WHERE c.universities_count <> EXCLUDED.universities_count
+                """
             )
-            .join(Institution, Country.id == Institution.country_id)
-            .group_by(Country.id, Country.name, Country.emoji)
-            .all()
         )
+        await self.session.commit()
+        return result.rowcount
 
-    def get_institutions(self, filters: InstitutionFilterRequest):
-        query = self.db.query(Institution)
+    def _catalog_conditions(self, filters: InstitutionCatalogFilter) -> list:
+        conditions = []
         if filters.country_id:
-            query = query.filter(Institution.country_id == filters.country_id)
+            conditions.append(Institution.country_id == filters.country_id)
+        if filters.city_id:
+            conditions.append(Institution.city_id == filters.city_id)
+        if filters.financing_type:
+            conditions.append(Institution.financing_type == filters.financing_type)
+        if filters.type:
+            conditions.append(Institution.type == filters.type)
+        if filters.has_dorm is not None:
+            conditions.append(Institution.has_dorm == filters.has_dorm)
         if filters.search:
-            query = query.filter(Institution.name.ilike(f"%{filters.search}%"))
-        return query.all()
-
-    def get_institution_by_id(self, institution_id: int):
-        return (
-            self.db.query(Institution)
-            .options(
-                joinedload(Institution.majors),
-                joinedload(Institution.enrollment_documents),
-                joinedload(Institution.enrollment_requirements),
+            # Served by the trigram index on institutions.name
+            conditions.append(Institution.name.ilike(f"%{filters.search}%"))
+
+        major_conditions = []
+        if filters.major_category:
+            major_conditions.append(InstitutionMajor.category == filters.major_category)
+        if filters.min_price is not None:
+            major_conditions.append(InstitutionMajor.price >= filters.min_price)
+        if filters.max_price is not None:
+            major_conditions.append(InstitutionMajor.price <= filters.max_price)
+        if filters.learning_language:
+            major_conditions.append(InstitutionMajor.learning_language == filters.learning_language)
+        if major_conditions:
+            conditions.append(
+                exists().where(InstitutionMajor.institution_id == Institution.id, *major_conditions)
+            )
+        return conditions
+
+    async def get_institutions_page(
+        self, filters: InstitutionCatalogFilter, after: Optional[Tuple[str, int]]
+    ) -> List[Institution]:
+        # Keyset pagination over (name, id); served by ix_institutions_name_id.
+        # Fetches one extra row so the caller can tell whether a next page exists.
+        stmt = (
+            select(Institution)
+            .options(selectinload(Institution.city), selectinload(Institution.country))
+            .where(*self._catalog_conditions(filters))
+            .order_by(Institution.name, Institution.id)
+        )
+        if after:
+            stmt = stmt.where(tuple_(Institution.name, Institution.id) > tuple_(*after))
+        result = await self.session.execute(stmt.limit(filters.page_size + 1))
+        return result.scalars().all()
+
+    async def get_catalog_facets(self, filters: InstitutionCatalogFilter) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Counts matching institutions per value of every facet in one statement.
+
+        Returns:
+            {facet: [(value, count), ...]} with the most frequent values first.
+        """
+        matched = (
+            select(
+                Institution.id,
+                Institution.city_id,
+                Institution.financing_type,
+                Institution.type,
+                Institution.has_dorm,
+            )
+            .where(*self._catalog_conditions(filters))
+            .cte("matched")
+        )
+
+        def institution_facet(name: str, column):
+            return (
+                select(literal(name).label("facet"), cast(column, String).label("value"), func.count().label("count"))
+                .where(column.is_not(None))
+                .group_by(column)
+            )
+
+        def major_facet(name: str, column):
+            return (
+                select(
+                    literal(name).label("facet"),
+                    cast(column, String).label("value"),
+                    func.count(func.distinct(InstitutionMajor.institution_id)).label("count"),
+                )
+                .join(matched, matched.c.id == InstitutionMajor.institution_id)
+                .where(column.is_not(None))
+                .group_by(column)
+            )
+
+        stmt = union_all(
+            institution_facet("city_id", matched.c.city_id),
+            institution_facet("financing_type", matched.c.financing_type),
+            institution_facet("type", matched.c.type),
+            institution_facet("has_dorm", matched.c.has_dorm),
+            major_facet("major_category", InstitutionMajor.category),
+            major_facet("learning_language", InstitutionMajor.learning_language),
+        )
+        facets: Dict[str, List[Tuple[str, int]]] = {name: [] for name in CATALOG_FACETS}
+        for row in await self.session.execute(stmt):
+            facets[row.facet].append((row.value, row.count))
+        for values in facets.values():
+            values.sort(key=lambda item: (-item[1], item[0]))
+        return facets
+
+    async def get_institution_feature_rows(self) -> Tuple[List[int], list, list]:
+        """
+        Loads the columns the local pre-ranker needs for the whole catalog.
+
+        Returns:
+            (institution ids, (institution_id, category, learning_language) major rows,
+            (institution_id, name, value) enrollment requirement rows).
+        """
+        ids = await self.session.execute(select(Institution.id).order_by(Institution.id))
+        majors = await self.session.execute(
+            select(InstitutionMajor.institution_id, InstitutionMajor.category, InstitutionMajor.learning_language)
+        )
+        requirements = await self.session.execute(
+            select(
+                InstitutionEnrollmentRequirement.institution_id,
+                InstitutionEnrollmentRequirement.name,
+                InstitutionEnrollmentRequirement.value,
             )
-            .filter(Institution.id == institution_id)
-            .first()
         )
+        return ids.scalars().all(), majors.all(), requirements.all()
 
-    def create_university_analysis(
+    async def get_institution_by_id(self, institution_id: int) -> Optional[Institution]:
+        result = await self.session.execute(
+            select(Institution)
+            .options(*INSTITUTION_DETAILS)
+            .where(Institution.id == institution_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_institutions_by_ids(self, institution_ids: List[int]) -> List[Institution]:
+        """
+        Loads institutions with all their details in a fixed number of queries.
+
+        Returns:
+            Institutions in the order of `institution_ids`, each once; unknown ids are skipped.
+        """
+        if not institution_ids:
+            return []
+        result = await self.session.execute(
+            select(Institution)
+            .options(*INSTITUTION_DETAILS)
+            .where(Institution.id.in_(set(institution_ids)))
+        )
+        by_id = {institution.id: institution for institution in result.scalars().all()}
+        return [
+            by_id[institution_id]
+            for institution_id in dict.fromkeys(institution_ids)
+            if institution_id in by_id
+        ]
+
+    async def get_university_analysis_by_id(self, analysis_id: int) -> Optional[UniversitiesAnalysis]:
+        result = await self.session.execute(
+            select(UniversitiesAnalysis)
+            .options(*ANALYSIS_DETAILS)
+            .where(UniversitiesAnalysis.id == analysis_id)
+            # Objects just created in this session are refreshed, relationships included
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def create_university_analysis(
         self, user_id: int, analysis_data: dict
     ) -> UniversitiesAnalysis:
-        new_analysis = UniversitiesAnalysis(user_id=user_id, **analysis_data)
-        self.db.add(new_analysis)
-        self.db.commit()
-        self.db.refresh(new_analysis)
-        return new_analysis
-
-    def get_latest_university_analysis(self, user_id: int):
-        return (
-            self.db.query(UniversitiesAnalysis)
-            .filter(UniversitiesAnalysis.user_id == user_id)
+        new_analysis = UniversitiesAnalysis(
+            user_id=user_id,
+            institutes=[
+                UniversitiesAnalysisInstitutes(
+                    institution_id=item["institution_id"],
+                    chance_percentage=item["chance_percentage"],
+                    attributes=[UniversitiesAnalysisResultsAttributes(**attr) for attr in item["attributes"]],
+                    plan=[UniversitiesAnalysisResultsPlan(**step) for step in item["plan"]],
+                )
+                for item in analysis_data["institutes"]
+            ],
+        )
+        self.session.add(new_analysis)
+        await self.session.commit()
+        # Reloaded with the institutions the response model embeds
+        return await self.get_university_analysis_by_id(new_analysis.id)
+
+    async def get_latest_university_analysis(self, user_id: int) -> Optional[UniversitiesAnalysis]:
+        result = await self.session.execute(
+            select(UniversitiesAnalysis)
+            .options(*ANALYSIS_DETAILS)
+            .where(UniversitiesAnalysis.user_id == user_id)
             .order_by(UniversitiesAnalysis.created_at.desc())
-            .first()
+            .limit(1)
         )
+        return result.scalar_one_or_none()
@@ -1,8 +1,10 @@
 from datetime import datetime
 from typing import List, Optional
 
+from fastapi import Query
 from pydantic import BaseModel, Field
 
+from app.core.schemas.common import BaseSchema, CursorFilter, CursorPaginatedResponse
 from app.modules.cities.cities_schemas import CityResponse
 from app.modules.countries.countries_schemas import CountryResponse
 from app.core.models.universities_models import (
@@ -58,12 +60,18 @@ class InstitutionEnrollmentRequirementResponse(BaseModel):
         from_attributes = True
 
 
-class InstitutionFilterRequest(BaseModel):
-    country_id: Optional[int] = Field(None, alias="countryId")
-    search: Optional[str] = None
-
-    class Config:
-        validate_by_name = True
+class InstitutionCatalogFilter(CursorFilter):
+    country_id: Optional[int] = Query(None, description="Filter by country ID")
+    city_id: Optional[int] = Query(None, description="Filter by city ID")
+    financing_type: Optional[InstitutionFinancingType] = Query(None, description="Filter by financing type")
+    type: Optional[InstitutionType] = Query(None, description="Filter by institution type")
+    has_dorm: Optional[bool] = Query(None, description="Filter by dormitory availability")
+    search: Optional[str] = Query(None, description="Search by name")
+    # Major filters are combined: one major has to match all of them
+    major_category: Optional[InstitutionMajorCategory] = Query(None, description="Has a major in this category")
+    min_price: Optional[float] = Query(None, ge=0, description="Has a major priced at least this")
+    max_price: Optional[float] = Query(None, ge=0, description="Has a major priced at most this")
+    learning_language: Optional[str] = Query(None, description="Has a major taught in this language")
 
 
 class InstitutionResponse(BaseModel):
@@ -82,12 +90,35 @@ class InstitutionResponse(BaseModel):
     address: str
     has_dorm: bool = Field(..., alias="hasDorm")
     image_url: str = Field(..., alias="imageUrl")
+    # Score-based estimate for the signed-in user; catalog pages only
+    chance_percentage: Optional[float] = Field(None, alias="chancePercentage")
 
     class Config:
         from_attributes = True
         validate_by_name = True
 
 
+class InstitutionFacetValue(BaseSchema):
+    value: str
+    count: int
+
+
+class InstitutionCatalogFacets(BaseSchema):
+    """Matching institutions per value of each filter, under the current filters."""
+
+    city_id: List[InstitutionFacetValue]
+    financing_type: List[InstitutionFacetValue]
+    type: List[InstitutionFacetValue]
+    has_dorm: List[InstitutionFacetValue]
+    major_category: List[InstitutionFacetValue]
+    learning_language: List[InstitutionFacetValue]
+
+
+class InstitutionCatalogResponse(CursorPaginatedResponse[InstitutionResponse]):
+    # Only computed for the first page; they do not change while paging
+    facets: Optional[InstitutionCatalogFacets] = None
+
+
 class InstitutionDetailsResponse(InstitutionResponse):
     majors: List[InstitutionMajorResponse]
     enrollment_documents: List[InstitutionEnrollmentDocumentResponse] = Field(
@@ -130,7 +161,8 @@ class UniversitiesAnalysisResultsPlanResponse(BaseModel):
 
 class UniversitiesAnalysisInstitutesResponse(BaseModel):
     institution: InstitutionResponse
-    chance_percentage: float = Field(..., alias="chancePercentage")
+    # None when the user's scores cannot be compared with any known requirement
+    chance_percentage: Optional[float] = Field(None, alias="chancePercentage")
     attributes: List[UniversitiesAnalysisResultsAttributesResponse]
     plan: List[UniversitiesAnalysisResultsPlanResponse]
 
@@ -147,3 +179,15 @@ class UniversityAnalysisResponse(BaseModel):
     class Config:
         from_attributes = True
         validate_by_name = True
+
+
+# LLM output for a university analysis; chances come from the local estimator and
+# ids and institution details are filled in when persisted
+class UniversityAnalysisInstituteResult(BaseModel):
+    institution_id: int
+    attributes: List[UniversitiesAnalysisResultsAttributesResponse]
+    plan: List[UniversitiesAnalysisResultsPlanResponse]
+
+
+class UniversityAnalysisResult(BaseModel):
+    institutes: List[UniversityAnalysisInstituteResult]
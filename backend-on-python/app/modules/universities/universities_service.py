@@ -1,14 +1,31 @@
-from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import logging
+from typing import Any, AsyncIterator, List, Optional, Tuple
 
-from app.core.database.session import get_async_session
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config.config import get_settings
+from app.core.database.session import new_async_session
+from app.core.utils.json_stream_utils import JSONStreamEvent
+from app.core.utils.pagination_utils import decode_name_cursor, encode_name_cursor
+from app.core.utils.sse_utils import format_partial_json_event, format_sse_event
 from app.modules.llm.llm_service import LLMService
 from app.modules.llm.prompt_builder import build_university_analysis_prompt
+from app.modules.universities.universities_cache import CountryCounts, get_country_counts
+from app.modules.universities.universities_packing import pack_analysis_batches
+from app.modules.universities.universities_ranking import get_institution_features, institution_chances
 from app.modules.universities.universities_repository import UniversitiesRepository
 from app.modules.universities.universities_schemas import (
-    InstitutionFilterRequest,
+    InstitutionCatalogFacets,
+    InstitutionCatalogFilter,
+    InstitutionCatalogResponse,
+    InstitutionFacetValue,
+    InstitutionResponse,
     UniversityAnalysisRequest,
-    UniversitiesCountryResponse,
+    UniversityAnalysisInstituteResult,
+    UniversityAnalysisResponse,
 )
 from app.core.utils.serialization_utils import (
     serialize_institution,
@@ -16,62 +33,230 @@ from app.core.utils.serialization_utils import (
 )
 from app.modules.users.users_repository import UserRepository
 
+logger = logging.getLogger(__name__)
+
 
 class UniversitiesService:
-    def __init__(self, db: Session = Depends(get_async_session)):
-        self.repository = UniversitiesRepository(db)
-        self.users_repository = UserRepository(db)
+    def __init__(self, session: AsyncSession):
+        self.repository = UniversitiesRepository(session)
+        self.users_repository = UserRepository(session)
         self.llm_service = LLMService()
 
-    def get_countries_with_university_count(self):
-        countries_data = self.repository.get_countries_with_university_count()
-        return [
-            UniversitiesCountryResponse(
-                id=row.id,
-                name=row.name,
-                emoji=row.emoji,
-                universities_count=row.universities_count,
+    async def get_countries_with_university_count(self) -> CountryCounts:
+        return await get_country_counts(self.repository)
+
+    async def get_institution_catalog(
+        self, filters: InstitutionCatalogFilter, user_id: Optional[int] = None
+    ) -> InstitutionCatalogResponse:
+        after = decode_name_cursor(filters.cursor) if filters.cursor else None
+        institutions = await self.repository.get_institutions_page(filters, after)
+        next_cursor = None
+        if len(institutions) > filters.page_size:
+            institutions = institutions[:filters.page_size]
+            next_cursor = encode_name_cursor(institutions[-1].name, institutions[-1].id)
+
+        facets = None
+        if after is None:
+            facet_counts = await self.repository.get_catalog_facets(filters)
+            facets = InstitutionCatalogFacets(
+                **{
+                    facet: [InstitutionFacetValue(value=value, count=count) for value, count in values]
+                    for facet, values in facet_counts.items()
+                }
             )
-            for row in countries_data
-        ]
+        items = [InstitutionResponse.model_validate(institution) for institution in institutions]
+        if user_id is not None:
+            await self._add_chances(user_id, items)
+        return InstitutionCatalogResponse(
+            page_size=filters.page_size,
+            next_cursor=next_cursor,
+            items=items,
+            facets=facets,
+        )
 
-    def get_institutions(self, filters: InstitutionFilterRequest):
-        return self.repository.get_institutions(filters)
+    async def _add_chances(self, user_id: int, items: List[InstitutionResponse]) -> None:
+        # Read from the cached catalog features: no requirement rows are loaded per page
+        user = await self.users_repository.get_user_profile(user_id)
+        if not user:
+            return
+        features = await get_institution_features(self.repository)
+        chances = features.chances(user, [item.id for item in items])
+        for item in items:
+            item.chance_percentage = chances.get(item.id)
 
-    def get_institution_by_id(self, institution_id: int):
-        return self.repository.get_institution_by_id(institution_id)
+    async def get_institution_by_id(self, institution_id: int):
+        return await self.repository.get_institution_by_id(institution_id)
 
-    def create_university_analysis(
+    async def _build_analysis_prompts(
         self, user_id: int, analysis_request: UniversityAnalysisRequest
-    ):
-        user = self.users_repository.get_user_by_id(user_id)
+    ) -> List[dict]:
+        user = await self.users_repository.get_user_profile(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        if analysis_request.institution_ids:
-            institutions = [
-                self.get_institution_by_id(inst_id)
-                for inst_id in analysis_request.institution_ids
-            ]
-        else:
-            institutions = self.repository.get_institutions(
-                InstitutionFilterRequest()
-            )[: self.llm_service.settings.llm.max_universities_for_analysis]
+        institution_ids = analysis_request.institution_ids
+        if not institution_ids:
+            # Narrow the catalog locally so the LLM only sees the best candidates
+            features = await get_institution_features(self.repository)
+            institution_ids = features.top_k(user, self.llm_service.settings.llm.max_universities_for_analysis)
+        institutions = await self.repository.get_institutions_by_ids(institution_ids)
 
+        # Chances are estimated locally; the LLM only writes attributes and plans
+        chances = institution_chances(user, institutions)
         user_profile = serialize_user_profile(user)
         universities_data = [
-            serialize_institution(inst) for inst in institutions
+            {**serialize_institution(inst), "estimated_chance_percentage": chances[inst.id]}
+            for inst in institutions
         ]
 
-        prompt = build_university_analysis_prompt(user_profile, universities_data)
-        llm_response = self.llm_service.get_university_analysis(prompt)
+        batches = pack_analysis_batches(user_profile, universities_data)
+        if not batches:
+            raise HTTPException(status_code=404, detail="No institutions to analyze")
+        return [
+            {
+                **build_university_analysis_prompt(user_profile, batch),
+                "institution_ids": [institution["id"] for institution in batch],
+                "chances": {institution["id"]: institution["estimated_chance_percentage"] for institution in batch},
+            }
+            for batch in batches
+        ]
+
+    async def create_university_analysis(
+        self, user_id: int, analysis_request: UniversityAnalysisRequest
+    ):
+        prompts = await self._build_analysis_prompts(user_id, analysis_request)
+        if len(prompts) == 1:
+            responses = [await self.llm_service.get_university_analysis(prompts[0])]
+        else:
+            slots = asyncio.Semaphore(self.llm_service.settings.llm.analysis_fan_out)
+            responses = await asyncio.gather(*(_analyze_batch(prompt, slots) for prompt in prompts))
 
-        if not llm_response:
+        analysis_data = merge_university_analyses(prompts, responses)
+        if not analysis_data["institutes"]:
             raise HTTPException(
                 status_code=500, detail="Failed to get analysis from LLM"
             )
 
-        return self.repository.create_university_analysis(user_id, llm_response)
+        return await self.repository.create_university_analysis(user_id, analysis_data)
+
+    async def stream_university_analysis(
+        self, user_id: int, analysis_request: UniversityAnalysisRequest
+    ) -> AsyncIterator[str]:
+        # Validation errors are raised here, before the response starts
+        prompts = await self._build_analysis_prompts(user_id, analysis_request)
+        return _stream_university_analysis(user_id, prompts)
+
+    async def get_latest_university_analysis(self, user_id: int):
+        return await self.repository.get_latest_university_analysis(user_id)
+
+
+def _valid_institute(institute: Any) -> bool:
+    try:
+        UniversityAnalysisInstituteResult.model_validate(institute)
+    except ValidationError as e:
+        logger.warning("Dropping invalid institute analysis: %s", e)
+        return False
+    return True
+
+
+def _prompt_chances(prompts: List[dict]) -> dict:
+    return {institution_id: chance for prompt in prompts for institution_id, chance in prompt["chances"].items()}
+
+
+def merge_university_analyses(prompts: List[dict], responses: List[dict]) -> dict:
+    """
+    Combines the per-batch LLM results into one analysis.
+
+    Each institute is validated on its own, so one malformed or failed piece
+    only costs that institution. Institutes the model invented or repeated
+    are dropped: only ids that were sent in some batch are kept, each once.
+    Chances are taken from the estimates the prompts were built with.
+    """
+    chances = _prompt_chances(prompts)
+    sent_ids = set(chances)
+    institutes = {}
+    for response in responses:
+        for institute in (response or {}).get("institutes", []):
+            if not _valid_institute(institute) or institute["institution_id"] not in sent_ids:
+                continue
+            institutes.setdefault(
+                institute["institution_id"],
+                {**institute, "chance_percentage": chances[institute["institution_id"]]},
+            )
+    missing = sent_ids - institutes.keys()
+    if missing:
+        logger.warning("University analysis is missing institutions %s", sorted(missing))
+    return {"institutes": list(institutes.values())}
+
+
+async def _analyze_batch(prompt: dict, slots: asyncio.Semaphore) -> dict:
+    async with slots:
+        return await LLMService().get_university_analysis(prompt)
+
+
+async def _stream_batch(prompt: dict, slots: asyncio.Semaphore, events: asyncio.Queue) -> None:
+    try:
+        async with slots:
+            async for event in LLMService().stream_university_analysis(prompt):
+                await events.put(event)
+    except Exception:
+        logger.exception("University analysis batch failed")
+    finally:
+        await events.put(None)
+
+
+async def _stream_batches(prompts: List[dict]) -> AsyncIterator[Tuple[str, Any]]:
+    # All batches stream concurrently; institutes are numbered in the order they complete
+    slots = asyncio.Semaphore(get_settings().llm.analysis_fan_out)
+    chances = _prompt_chances(prompts)
+    events: asyncio.Queue = asyncio.Queue()
+    tasks = [asyncio.create_task(_stream_batch(prompt, slots, events)) for prompt in prompts]
+    responses = []
+    streamed = set()
+    index = 0
+    try:
+        running = len(tasks)
+        while running:
+            event = await events.get()
+            if event is None:
+                running -= 1
+                continue
+            kind, payload = event
+            if kind == "partial" and payload.is_item:
+                # Same rules as merge_university_analyses: only sent ids, first one wins
+                if not _valid_institute(payload.value):
+                    continue
+                institution_id = payload.value["institution_id"]
+                if institution_id not in chances or institution_id in streamed:
+                    continue
+                streamed.add(institution_id)
+                institute = {**payload.value, "chance_percentage": chances[institution_id]}
+                yield kind, JSONStreamEvent(payload.key, institute, index)
+                index += 1
+            elif kind == "result":
+                responses.append(payload)
+            elif kind == "error":
+                logger.warning("University analysis batch failed: %s", payload)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    analysis_data = merge_university_analyses(prompts, responses)
+    if analysis_data["institutes"]:
+        yield "result", analysis_data
+    else:
+        yield "error", "Failed to get analysis from LLM"
+
 
-    def get_latest_university_analysis(self, user_id: int):
-        return self.repository.get_latest_university_analysis(user_id)
+async def _stream_university_analysis(user_id: int, prompts: List[dict]) -> AsyncIterator[str]:
+    # Runs after the endpoint has returned, so it cannot use the request's session
+    async with new_async_session() as session:
+        service = UniversitiesService(session)
+        async for kind, payload in _stream_batches(prompts):
+            if kind == "partial":
+                yield format_partial_json_event(payload)
+            elif kind == "result":
+                analysis = await service.repository.create_university_analysis(user_id, payload)
+                yield format_sse_event("result", UniversityAnalysisResponse.model_validate(analysis))
+            else:
+                yield format_sse_event("error", {"detail": payload})
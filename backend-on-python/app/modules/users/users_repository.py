@@ -7,7 +7,7 @@ from typing import List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.core.models.users_model import User
 from app.modules.users.users_schemas import UserUpdate, UserFilter
@@ -64,6 +64,27 @@ class UserRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_user_profile(self, user_id: int) -> Optional[User]:
+        # Everything serialize_user_profile reads, loaded up front
+        stmt = (
+            select(User)
+            .where(User.id == user_id)
+            .options(
+                selectinload(User.academic_info),
+                selectinload(User.language_proficiencies),
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_users_by_ids(self, user_ids: List[int]) -> List[User]:
+        if not user_ids:
+            return []
+        result = await self.session.execute(
+            select(User).where(User.id.in_(set(user_ids)))
+        )
+        return result.scalars().all()
+
     async def update_user(self, user: User, user_data: UserUpdate) -> User:
         update_data = user_data.model_dump(exclude_unset=True, by_alias=True)
         for field, value in update_data.items():
@@ -3,7 +3,8 @@ from typing import List
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security.password import hash_password
+from app.core.security.password import hash_password_async
+from app.core.utils.auth_utils import invalidate_user_profile
 from app.modules.users.users_repository import UserRepository
 from app.modules.users.users_schemas import UserUpdate, UserProfileResponse, UserFilter
 
@@ -58,8 +59,9 @@ class UserService:
                 detail="User not found",
             )
         if user_data.password:
-            user_data.password = hash_password(user_data.password)
+            user_data.password = await hash_password_async(user_data.password)
         updated_user = await self.repository.update_user(user, user_data)
+        invalidate_user_profile(user_id)
         return UserProfileResponse(
             id=updated_user.id,
             firstName=updated_user.first_name,
@@ -81,3 +83,4 @@ class UserService:
                 detail="User not found",
             )
         await self.repository.delete_user(user)
+        invalidate_user_profile(user_id)
@@ -0,0 +1,92 @@
+"""Throughput benchmark for request authentication strategies.
+
+Compares, on an in-process ASGI transport (no network, no database):
+
+* dependency      - `get_current_claims` decodes the cookie itself
+* base-http       - the previous BaseHTTPMiddleware-style decode + dependency
+* asgi-middleware - `AuthMiddleware` decodes once, the dependency reuses it
+
+The session-validity cache is pre-warmed so every variant measures the
+steady state rather than the `user_sessions` lookup.
+
+    python app/scripts/benchmark_auth.py --requests 20000 --concurrency 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.database.session import get_async_session
+from app.core.middleware.auth_middleware import AuthMiddleware
+from app.core.models.users_model import SubscriptionType, UserRole
+from app.core.utils import auth_utils
+from app.core.utils.auth_utils import create_session_token, decode_session_token, get_current_claims
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        try:
+            request.state.legacy_claims = decode_session_token(request.cookies.get("session_token"))
+        except Exception:
+            request.state.legacy_claims = None
+        return await call_next(request)
+
+
+async def _no_session():
+    yield None
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+    app.dependency_overrides[get_async_session] = _no_session
+
+    @app.get("/whoami")
+    async def whoami(claims: dict = Depends(get_current_claims)):
+        return {"id": claims["id"]}
+
+    if variant == "base-http":
+        app.add_middleware(LegacyAuthMiddleware)
+    elif variant == "asgi-middleware":
+        app.add_middleware(AuthMiddleware)
+    return app
+
+
+async def measure(variant: str, token: str, requests: int, concurrency: int) -> float:
+    transport = ASGITransport(app=build_app(variant))
+    async with AsyncClient(transport=transport, base_url="http://bench", cookies={"session_token": token}) as client:
+        queue = asyncio.Queue()
+        for _ in range(requests):
+            queue.put_nowait(None)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                response = await client.get("/whoami")
+                assert response.status_code == 200, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def run(requests: int, concurrency: int):
+    token = create_session_token(1, UserRole.USER, SubscriptionType.FREE)
+    auth_utils._ACTIVE_SESSIONS.set(token, True, ttl=3600)
+    for variant in ("dependency", "base-http", "asgi-middleware"):
+        # Warm-up pass so imports and route compilation are not measured
+        await measure(variant, token, min(requests, 500), concurrency)
+        rps = await measure(variant, token, requests, concurrency)
+        print(f"{variant:<16} {rps:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
@@ -0,0 +1,158 @@
+"""Benchmark the institution catalog at scale.
+
+Seeds synthetic institutions (with majors, spread over a few countries and
+cities) inside a transaction, times catalog pages and facet counts for a set
+of filter combinations through UniversitiesRepository, then rolls everything
+back. Run against a migrated database:
+
+    python app/scripts/benchmark_catalog.py --institutions 50000 --runs 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config.config import get_settings
+from app.core.models.cities_model import City
+from app.core.models.countries_model import Country
+from app.core.models.universities_models import (
+    InstitutionFinancingType,
+    InstitutionMajorCategory,
+    InstitutionType,
+)
+from app.modules.universities.universities_repository import UniversitiesRepository
+from app.modules.universities.universities_schemas import InstitutionCatalogFilter
+
+SEED_INSTITUTIONS_SQL = """
+INSERT INTO institutions (name, short_name, description, foundation_year, financing_type, type,
+                          website, email, contact_number, city_id, country_id, address, has_dorm, image_url)
+SELECT
+    'Bench University ' || md5(g::text),
+    'BU' || g,
+    'Synthetic institution',
+    (1900 + g % 120)::text,
+    (CAST(:financing AS institutionfinancingtype[]))[1 + g % 3],
+    (CAST(:types AS institutiontype[]))[1 + g % 3],
+    'https://example.edu', 'info@example.edu', '+70000000000',
+    (CAST(:city_ids AS bigint[]))[1 + g % array_length(CAST(:city_ids AS bigint[]), 1)],
+    (CAST(:country_ids AS bigint[]))[1 + g % array_length(CAST(:country_ids AS bigint[]), 1)],
+    'Example street', g % 2 = 0, 'https://example.edu/logo.png'
+FROM generate_series(1, :institutions) AS g
+RETURNING id
+"""
+
+SEED_MAJORS_SQL = """
+INSERT INTO institution_majors (name, duration_years, learning_language, description, price, category, institution_id)
+SELECT
+    'Major ' || m,
+    4,
+    (ARRAY['English', 'Russian', 'Kazakh'])[1 + (i.id + m) % 3],
+    'Synthetic major',
+    500000 + ((i.id * 7919 + m * 104729) % 40) * 100000,
+    (CAST(:categories AS institutionmajorcategory[]))[1 + (i.id + m) % 7],
+    i.id
+FROM institutions i, generate_series(1, :majors) AS m
+WHERE i.id = ANY(CAST(:institution_ids AS integer[]))
+"""
+
+CASES = {
+    "first page": {},
+    "country": {"country_id": "COUNTRY"},
+    "city + dorm": {"city_id": "CITY", "has_dorm": True},
+    "financing + type": {"financing_type": InstitutionFinancingType.PRIVATE, "type": InstitutionType.UNIVERSITY},
+    "search": {"search": "abc"},
+    "major category + price": {
+        "major_category": InstitutionMajorCategory.MEDICINE,
+        "min_price": 1_000_000,
+        "max_price": 2_000_000,
+    },
+    "language": {"learning_language": "Kazakh"},
+}
+
+
+def percentiles(timings: list) -> str:
+    timings.sort()
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    return f"p50={statistics.median(timings):7.1f}ms p95={p95:7.1f}ms"
+
+
+async def timed(call, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def run(institutions: int, majors: int, runs: int):
+    engine = create_async_engine(get_settings().sqlalchemy_database_uri)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        suffix = uuid.uuid4().hex[:8]
+        countries = [Country(name=f"bench-country-{suffix}-{i}") for i in range(4)]
+        session.add_all(countries)
+        await session.flush()
+        cities = [
+            City(name=f"bench-city-{suffix}-{i}", country_id=countries[i % len(countries)].id) for i in range(20)
+        ]
+        session.add_all(cities)
+        await session.flush()
+
+        started = time.perf_counter()
+        result = await session.execute(
+            text(SEED_INSTITUTIONS_SQL),
+            {
+                "institutions": institutions,
+                "financing": [member.value for member in InstitutionFinancingType],
+                "types": [member.value for member in InstitutionType],
+                "city_ids": [city.id for city in cities],
+                "country_ids": [country.id for country in countries],
+            },
+        )
+        institution_ids = result.scalars().all()
+        await session.execute(
+            text(SEED_MAJORS_SQL),
+            {
+                "majors": majors,
+                "categories": [member.value for member in InstitutionMajorCategory],
+                "institution_ids": institution_ids,
+            },
+        )
+        await session.execute(text("ANALYZE institutions"))
+        await session.execute(text("ANALYZE institution_majors"))
+        print(f"seeded {institutions} institutions x {majors} majors in {time.perf_counter() - started:.1f}s\n")
+
+        repository = UniversitiesRepository(session)
+        for name, case in CASES.items():
+            case = {
+                key: countries[0].id if value == "COUNTRY" else cities[0].id if value == "CITY" else value
+                for key, value in case.items()
+            }
+            filters = InstitutionCatalogFilter(page_size=20, **case)
+            page = await repository.get_institutions_page(filters, None)
+            last = page[min(len(page), filters.page_size) - 1] if page else None
+            after = (last.name, last.id) if last else None
+
+            first = await timed(lambda: repository.get_institutions_page(filters, None), runs)
+            following = await timed(lambda: repository.get_institutions_page(filters, after), runs)
+            facets = await timed(lambda: repository.get_catalog_facets(filters), runs)
+            print(f"{name:<24} page 1   {percentiles(first)}")
+            print(f"{'':<24} page 2   {percentiles(following)}")
+            print(f"{'':<24} facets   {percentiles(facets)}")
+        await session.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--institutions", type=int, default=50_000)
+    parser.add_argument("--majors", type=int, default=6, help="Majors per institution")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.institutions, args.majors, args.runs))
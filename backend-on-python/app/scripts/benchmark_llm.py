@@ -0,0 +1,56 @@
+"""Load benchmark for LLMService against the fake LLM server.
+
+Start the fake server first, then fire concurrent analyses through the
+shared client and report throughput and latency percentiles:
+
+    python app/scripts/fake_llm_server.py --latency 0.5 --error-rate 0.05 &
+    LLM__BASE_URL=http://localhost:8001/v1 python app/scripts/benchmark_llm.py --requests 500 --concurrency 100
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.modules.llm.llm_service import LLMService
+from app.modules.llm.prompt_builder import build_short_analysis_prompt
+
+
+async def run(requests: int, concurrency: int):
+    service = LLMService(db_cache=False)
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(index: int):
+        nonlocal failures
+        # Distinct prompts, so every call misses the response cache
+        prompt = build_short_analysis_prompt(
+            {"test_name": "Benchmark", "answers": [{"question": "Q?", "answer": str(index)}]}
+        )
+        async with gate:
+            started = time.perf_counter()
+            result = await service.get_short_analysis(prompt)
+            latencies.append(time.perf_counter() - started)
+            if not result:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"requests      {requests} ({failures} failed after retries)")
+    print(f"throughput    {requests / elapsed:.1f} req/s")
+    print(f"p50 latency   {statistics.median(latencies) * 1000:.0f} ms")
+    print(f"p95 latency   {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
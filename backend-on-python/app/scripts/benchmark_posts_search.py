@@ -0,0 +1,100 @@
+"""Benchmark post search: legacy ILIKE vs. full-text search.
+
+Builds a temporary copy of the `posts` table (same columns and indexes, no
+foreign keys), fills it with synthetic multilingual posts and times both
+search strategies. Nothing is written to the real tables.
+
+    python app/scripts/benchmark_posts_search.py --rows 1000000 --runs 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config.config import get_settings
+
+VOCABULARY = [
+    # English
+    "university", "admission", "scholarship", "physics", "programming", "student", "exam", "research",
+    # Russian
+    "университет", "поступление", "стипендия", "физика", "программирование", "студент", "экзамен", "олимпиада",
+    # Kazakh
+    "университеті", "түсу", "шәкіртақы", "физика", "бағдарламалау", "студенттер", "емтихан", "білім",
+]
+
+SEED_SQL = """
+INSERT INTO bench_posts (author_id, content, tags, mentions, likes_count, comments_count, created_at, updated_at)
+SELECT
+    1,
+    (
+        SELECT string_agg(words[1 + floor(random() * array_length(words, 1))::int], ' ')
+        FROM generate_series(1, 20 + (g % 40))
+    ),
+    ARRAY[]::varchar[],
+    ARRAY[]::varchar[],
+    0,
+    0,
+    now() - (g || ' seconds')::interval,
+    now()
+FROM generate_series(1, :rows) AS g, (SELECT CAST(:words AS text[]) AS words) AS vocab
+"""
+
+QUERIES = {
+    "ilike": """
+        SELECT id FROM bench_posts
+        WHERE content ILIKE :pattern
+        ORDER BY created_at DESC
+        LIMIT 20
+    """,
+    "fulltext": """
+        SELECT id FROM bench_posts
+        WHERE search_vector @@ websearch_to_tsquery(CAST(:config AS regconfig), :term)
+        ORDER BY ts_rank_cd(search_vector, websearch_to_tsquery(CAST(:config AS regconfig), :term)) DESC, created_at DESC
+        LIMIT 20
+    """,
+}
+
+SEARCHES = [
+    ("english", "scholarship"),
+    ("russian", "стипендии"),
+    ("simple", "шәкіртақы"),
+]
+
+
+async def run(rows: int, runs: int):
+    engine = create_async_engine(get_settings().sqlalchemy_database_uri)
+    async with engine.connect() as conn:
+        await conn.execute(text("CREATE TEMP TABLE bench_posts (LIKE posts INCLUDING ALL)"))
+        started = time.perf_counter()
+        await conn.execute(text(SEED_SQL), {"rows": rows, "words": VOCABULARY})
+        await conn.execute(text("ANALYZE bench_posts"))
+        print(f"seeded {rows} posts in {time.perf_counter() - started:.1f}s")
+
+        for config, term in SEARCHES:
+            for name, sql in QUERIES.items():
+                params = {"pattern": f"%{term}%", "config": config, "term": term}
+                timings = []
+                for _ in range(runs):
+                    started = time.perf_counter()
+                    await conn.execute(text(sql), params)
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+                print(
+                    f"{config:<8} {term:<16} {name:<9} "
+                    f"p50={statistics.median(timings):8.1f}ms p95={p95:8.1f}ms"
+                )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.runs))
@@ -0,0 +1,117 @@
+"""Micro-benchmark for prompt building.
+
+Compares the compiled prompt templates against the previous approach
+(schema regenerated and everything pretty-printed on every call) on a
+synthetic university analysis payload, reporting time per build and
+estimated prompt tokens, then shows how the payload is packed into
+token-budgeted prompts:
+
+    python app/scripts/benchmark_prompts.py --universities 50 --iterations 2000
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config.config import get_settings
+from app.core.utils.text_utils import estimate_tokens
+from app.modules.llm.prompt_builder import build_university_analysis_prompt
+from app.modules.llm.prompt_registry import UNIVERSITY_ANALYSIS_PROMPT
+from app.modules.universities.universities_packing import pack_analysis_batches
+from app.modules.universities.universities_schemas import UniversityAnalysisResult
+
+
+def build_prompt_uncompiled(user_profile: dict, universities_data: list) -> dict:
+    # The builder as it was before templates were compiled
+    json_format = json.dumps(UniversityAnalysisResult.model_json_schema(), indent=2)
+    user_prompt = UNIVERSITY_ANALYSIS_PROMPT["user"].format(
+        user_profile=json.dumps(user_profile, indent=2),
+        universities_data=json.dumps(universities_data, indent=2),
+        json_format=json_format,
+    )
+    return {"system": UNIVERSITY_ANALYSIS_PROMPT["system"], "user": user_prompt}
+
+
+def sample_payload(universities: int):
+    user_profile = {
+        "first_name": "Айгерим",
+        "last_name": "Серикова",
+        "email": "student@example.com",
+        "username": "aigerim",
+        "date_of_birth": "2007-04-12",
+        "interests": ["математика", "robotics", "debate"],
+        "academic_info": {"gpa": 4.6, "sat": 1380, "ielts": 7.0, "toefl": None},
+        "language_proficiencies": [{"language": "English", "level": "C1"}],
+    }
+    universities_data = [
+        {
+            "id": index,
+            "name": f"University {index}",
+            "short_name": f"U{index}",
+            "description": "Public research university with strong engineering and natural science schools. " * 3,
+            "foundation_year": "1934",
+            "financing_type": "STATE",
+            "type": "UNIVERSITY",
+            "website": f"https://u{index}.example.edu",
+            "email": f"admissions@u{index}.example.edu",
+            "contact_number": "+77270000000",
+            "city": "Алматы",
+            "country": "Казахстан",
+            "address": "71 al-Farabi Ave",
+            "has_dorm": True,
+            "image_url": f"https://u{index}.example.edu/logo.png",
+            "majors": [
+                {
+                    "name": f"Major {major}",
+                    "duration_years": 4,
+                    "learning_language": "English",
+                    "description": "Fundamentals, applied projects and an industry internship.",
+                    "price": 2500000,
+                    "category": "ENGINEERING",
+                }
+                for major in range(8)
+            ],
+            "enrollment_documents": ["Passport", "Transcript", "Motivation letter"],
+            "enrollment_requirements": [
+                {"name": "IELTS", "type": "MIN_SCORE", "value": "6.0"},
+                {"name": "UNT", "type": "MIN_SCORE", "value": "100"},
+            ],
+        }
+        for index in range(universities)
+    ]
+    return user_profile, universities_data
+
+
+def measure(build, args, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build(*args)
+    return (time.perf_counter() - started) / iterations
+
+
+def run(universities: int, iterations: int):
+    model = get_settings().llm.model
+    payload = sample_payload(universities)
+    # Warm-up, which also compiles the template
+    build_university_analysis_prompt(*payload)
+
+    print(f"{'builder':<12}{'us/build':>12}{'prompt chars':>16}{'tokens':>10}")
+    for name, build in (("uncompiled", build_prompt_uncompiled), ("compiled", build_university_analysis_prompt)):
+        prompt = build(*payload)
+        tokens = estimate_tokens(prompt["system"], model) + estimate_tokens(prompt["user"], model)
+        per_build = measure(build, payload, iterations)
+        print(f"{name:<12}{per_build * 1e6:>12.1f}{len(prompt['user']):>16}{tokens:>10}")
+
+    batches = pack_analysis_batches(*payload)
+    packed = [build_university_analysis_prompt(payload[0], batch)["tokens"] for batch in batches]
+    print(f"packed into {len(batches)} prompts of {min(packed)}-{max(packed)} tokens ({sum(packed)} total)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--universities", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.universities, args.iterations)
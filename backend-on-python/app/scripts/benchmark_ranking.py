@@ -0,0 +1,90 @@
+"""Micro-benchmark for the local institution pre-ranker.
+
+Builds InstitutionFeatures for a synthetic catalog (majors spread over every
+category and a few languages, score requirements on a share of institutions)
+and reports build time, time per top-k query and time to estimate admission
+chances over the whole catalog for a sample profile:
+
+    python app/scripts/benchmark_ranking.py --institutions 50000 --iterations 200
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.models.interests_model import InterestsEnum
+from app.core.models.universities_models import InstitutionMajorCategory
+from app.core.models.users_model import LanguageLevel
+from app.modules.universities.universities_ranking import InstitutionFeatures
+
+LANGUAGES = ("English", "Russian", "Kazakh", "German")
+REQUIREMENTS = (("IELTS", "{:.1f}", 5.0, 7.5), ("Minimum GPA", "{:.1f}", 2.5, 4.5), ("SAT", "from {:.0f}", 1000, 1500))
+
+
+def sample_catalog(institutions: int, majors: int, seed: int = 0):
+    rng = random.Random(seed)
+    categories = list(InstitutionMajorCategory)
+    major_rows = [
+        (institution_id, rng.choice(categories), rng.choice(LANGUAGES))
+        for institution_id in range(institutions)
+        for _ in range(majors)
+    ]
+    requirement_rows = []
+    for institution_id in range(institutions):
+        for name, template, low, high in rng.sample(REQUIREMENTS, rng.randint(0, len(REQUIREMENTS))):
+            requirement_rows.append((institution_id, name, template.format(rng.uniform(low, high))))
+    return list(range(institutions)), major_rows, requirement_rows
+
+
+def sample_user():
+    # Quacks like the User rows the service passes in; no database needed
+    return SimpleNamespace(
+        interests=[InterestsEnum.MATHEMATICS, InterestsEnum.ROBOTICS, InterestsEnum.ECONOMICS],
+        academic_info=SimpleNamespace(gpa=3.6, sat=1380, ielts=7.0, toefl=None),
+        language_proficiencies=[
+            SimpleNamespace(language="English", level=LanguageLevel.FLUENT),
+            SimpleNamespace(language="Kazakh", level=LanguageLevel.NATIVE),
+        ],
+    )
+
+
+def timed(call, iterations: int) -> list:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def percentiles(timings: list) -> str:
+    timings.sort()
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    return f"p50={statistics.median(timings):.2f}ms p95={p95:.2f}ms"
+
+
+def main(institutions: int, majors: int, k: int, iterations: int):
+    rows = sample_catalog(institutions, majors)
+    started = time.perf_counter()
+    features = InstitutionFeatures.build(*rows)
+    print(f"built features for {institutions} institutions x {majors} majors in "
+          f"{(time.perf_counter() - started) * 1000:.1f}ms")
+
+    user = sample_user()
+    print(f"top_{k}:   {percentiles(timed(lambda: features.top_k(user, k), iterations))}")
+    all_ids = features.ids.tolist()
+    print(f"chances: {percentiles(timed(lambda: features.chances(user, all_ids), iterations))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--institutions", type=int, default=50_000)
+    parser.add_argument("--majors", type=int, default=6, help="Majors per institution")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    main(args.institutions, args.majors, args.k, args.iterations)
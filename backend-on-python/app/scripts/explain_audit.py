@@ -0,0 +1,143 @@
+"""EXPLAIN every hot repository query and fail on sequential scans.
+
+Run against a seeded database (see app/scripts/seed.py):
+
+    python app/scripts/explain_audit.py
+
+Each case calls a repository method, captures the SELECT statements it sends
+and re-runs them as `EXPLAIN (FORMAT JSON)` with `enable_seqscan = off`, so a
+remaining Seq Scan on a hot table means no usable index exists, regardless of
+how small the seeded tables are. Exits with status 1 if any case fails.
+"""
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config.config import get_settings
+from app.core.models import Post, TestSubmission, User
+from app.core.schemas.common import CursorFilter
+from app.modules.posts.posts_repository import PostsRepository
+from app.modules.posts.posts_schemas import PostCursorFilter, PostFilter
+from app.modules.tests.tests_repository import TestsRepository
+from app.modules.universities.universities_repository import UniversitiesRepository
+from app.modules.universities.universities_schemas import InstitutionCatalogFilter
+from app.modules.users.users_repository import UserRepository
+
+HOT_TABLES = {
+    "posts",
+    "post_likes",
+    "post_comments",
+    "users",
+    "test_submission",
+    "test_submission_question",
+    "questions",
+    "institutions",
+    "institution_majors",
+}
+
+
+def find_seq_scans(plan: dict) -> list:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        scans.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+def build_cases(post: Post, user: User, tag: str, mention: str, submission: TestSubmission):
+    return {
+        "posts.get_posts[tags]": lambda s: PostsRepository(s).get_posts(PostFilter(tags=[tag])),
+        "posts.get_posts[mentions]": lambda s: PostsRepository(s).get_posts(PostFilter(mentions=[mention])),
+        "posts.get_posts[user_id]": lambda s: PostsRepository(s).get_posts(PostFilter(user_id=user.id)),
+        "posts.get_posts[search]": lambda s: PostsRepository(s).get_posts(PostFilter(search=post.content.split()[0])),
+        "posts.count_posts[tags]": lambda s: PostsRepository(s).count_posts(PostFilter(tags=[tag])),
+        "posts.get_posts_page": lambda s: PostsRepository(s).get_posts_page(
+            PostCursorFilter(), (post.created_at, post.id)
+        ),
+        "posts.get_post_by_id": lambda s: PostsRepository(s).get_post_by_id(post.id),
+        "posts.get_liked_post_ids": lambda s: PostsRepository(s).get_liked_post_ids([post.id], user.id),
+        "posts.get_like": lambda s: PostsRepository(s).get_like(post.id, user.id),
+        "posts.get_comments_page": lambda s: PostsRepository(s).get_comments_page(post.id, CursorFilter(), None),
+        "posts.count_comments_for_post": lambda s: PostsRepository(s).count_comments_for_post(post.id, CursorFilter()),
+        "users.get_user_by_id": lambda s: UserRepository(s).get_user_by_id(user.id),
+        "users.get_users_by_ids": lambda s: UserRepository(s).get_users_by_ids([user.id]),
+        "users.interests overlap": lambda s: s.execute(
+            select(User).where(User.interests.overlap(user.interests or []))
+        ),
+        "tests.get_user_test_submission": lambda s: TestsRepository(s).get_user_test_submission(
+            submission.user_id, submission.test_id
+        ),
+        "tests.get_tests_progress": lambda s: TestsRepository(s).get_tests_progress(submission.user_id),
+        "tests.get_test_content": lambda s: TestsRepository(s).get_test_content(),
+        "tests.count_answered_questions": lambda s: TestsRepository(s).count_answered_questions(submission.id),
+        "tests.get_submission_with_answers": lambda s: TestsRepository(s).get_submission_with_answers(submission.id),
+        "universities.get_institutions_page": lambda s: UniversitiesRepository(s).get_institutions_page(
+            InstitutionCatalogFilter(), ("", 0)
+        ),
+        "universities.get_institutions_page[country]": lambda s: UniversitiesRepository(s).get_institutions_page(
+            InstitutionCatalogFilter(country_id=1), None
+        ),
+        "universities.get_institutions_page[search]": lambda s: UniversitiesRepository(s).get_institutions_page(
+            InstitutionCatalogFilter(search="univ"), None
+        ),
+        "universities.get_institutions_by_ids": lambda s: UniversitiesRepository(s).get_institutions_by_ids([1, 2]),
+    }
+
+
+async def explain_case(session: AsyncSession, call) -> list:
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await call(session)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+
+    connection = await session.connection()
+    scans = []
+    for statement, parameters in captured:
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar_one()[0]["Plan"]
+        scans.extend(find_seq_scans(plan))
+    return scans
+
+
+async def run() -> int:
+    engine = create_async_engine(get_settings().sqlalchemy_database_uri)
+    failures = 0
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        post = (await session.execute(select(Post).where(Post.tags != []).limit(1))).scalar_one()
+        user = (await session.execute(select(User).limit(1))).scalar_one()
+        submission = (await session.execute(select(TestSubmission).limit(1))).scalar_one_or_none()
+        if submission is None:
+            submission = TestSubmission(id=0, user_id=user.id, test_id=0)
+        mention = post.mentions[0] if post.mentions else user.username
+
+        connection = await session.connection()
+        await connection.exec_driver_sql("SET enable_seqscan = off")
+
+        for name, call in build_cases(post, user, post.tags[0], mention, submission).items():
+            scans = await explain_case(session, call)
+            if scans:
+                failures += 1
+                print(f"FAIL {name}: Seq Scan on {', '.join(sorted(set(scans)))}")
+            else:
+                print(f"ok   {name}")
+        await session.rollback()
+    await engine.dispose()
+
+    print(f"\n{failures} failing queries")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run()))
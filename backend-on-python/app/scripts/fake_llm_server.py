@@ -0,0 +1,162 @@
+"""Local stand-in for the OpenAI chat completions API.
+
+Answers `POST /v1/chat/completions` (plain or `stream: true`) with canned
+JSON that validates against the analysis schemas, after a configurable
+latency and with optional injected failures, so LLM code paths can be exercised and load-tested
+without network access or spend:
+
+    python app/scripts/fake_llm_server.py --port 8001 --latency 0.8 --error-rate 0.05
+    LLM__BASE_URL=http://localhost:8001/v1 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SHORT_ANALYSIS = {
+    "analysis_summary": "Prefers structured, analytical work and weighs options carefully.",
+    "analysis_key_factors": ["analytical thinking", "planning", "independence"],
+}
+
+PERSONALITY_ANALYSIS = {
+    "id": 0,
+    "mbti": {
+        "title": "The Architect",
+        "description": "Imaginative and strategic thinker with a plan for everything.",
+        "mbti_code": "INTJ",
+        "mbti_name": "Architect",
+        "short_attributes": ["strategic", "independent"],
+        "work_styles": ["deep focus", "long-term planning"],
+        "introversion_percentage": 70,
+        "thinking_percentage": 65,
+        "creativity_percentage": 60,
+        "intuition_percentage": 72,
+        "planning_percentage": 80,
+        "leading_percentage": 55,
+    },
+    "professions": [{"profession_id": 1, "percentage": 85}],
+    "majors": [{"category": "ENGINEERING"}],
+    "attributes": [
+        {"type": "PROS", "name": "Focus", "description": "Sustains attention.", "recommendations": "Pick deep-work roles."},
+        {"type": "CONS", "name": "Rigidity", "description": "Dislikes plan changes.", "recommendations": "Practice iteration."},
+    ],
+}
+
+UNIVERSITY_INSTITUTE = {
+    "attributes": [{"name": "Strong math", "type": "PROS", "recommendation": "Highlight olympiads."}],
+    "plan": [{"order": 1, "name": "IELTS", "description": "Reach 6.5.", "duration_month": 3}],
+}
+UNIVERSITY_ANALYSIS = {"institutes": []}
+
+# Institutions in a university analysis prompt, serialized as compact JSON
+INSTITUTION_ID = re.compile(r'\{"id":(\d+),"name"')
+
+# Matched against the system prompt of each request
+FIXTURES = [
+    ("admissions", UNIVERSITY_ANALYSIS),
+    ("personality", PERSONALITY_ANALYSIS),
+    ("short analysis", SHORT_ANALYSIS),
+]
+
+app = FastAPI()
+app.state.latency = 0.5
+app.state.jitter = 0.2
+app.state.error_rate = 0.0
+app.state.ttft = 0.2
+app.state.chunk_chars = 16
+
+
+def pick_fixture(messages: list) -> dict:
+    system = next((m["content"] for m in messages if m["role"] == "system"), "").lower()
+    for keyword, fixture in FIXTURES:
+        if keyword in system:
+            if fixture is UNIVERSITY_ANALYSIS:
+                # Answer for exactly the institutions that were asked about
+                user = next((m["content"] for m in messages if m["role"] == "user"), "")
+                return {
+                    "institutes": [
+                        {"institution_id": int(institution_id), **UNIVERSITY_INSTITUTE}
+                        for institution_id in INSTITUTION_ID.findall(user)
+                    ]
+                }
+            return fixture
+    return {}
+
+
+async def stream_chunks(completion_id: str, model: str, content: str):
+    # Total generation time still follows --latency, spread across the chunks
+    pieces = [content[i:i + app.state.chunk_chars] for i in range(0, len(content), app.state.chunk_chars)]
+    delay = max(0.0, random.gauss(app.state.latency, app.state.jitter)) / max(len(pieces), 1)
+    for index, piece in enumerate(pieces + [None]):
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": piece} if piece is not None else {},
+                    "finish_reason": None if piece is not None else "stop",
+                }
+            ],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        if piece is not None:
+            await asyncio.sleep(delay)
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stream = body.get("stream", False)
+    await asyncio.sleep(
+        app.state.ttft if stream else max(0.0, random.gauss(app.state.latency, app.state.jitter))
+    )
+    if random.random() < app.state.error_rate:
+        status = random.choice([429, 500, 503])
+        return JSONResponse({"error": {"message": "injected failure", "type": "fake"}}, status_code=status)
+
+    completion_id = f"chatcmpl-fake-{random.getrandbits(32):x}"
+    content = json.dumps(pick_fixture(body.get("messages", [])))
+    if stream:
+        return StreamingResponse(
+            stream_chunks(completion_id, body.get("model", "fake"), content), media_type="text/event-stream"
+        )
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latency standard deviation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 429/5xx")
+    parser.add_argument("--ttft", type=float, default=0.2, help="Time to first chunk for streamed requests")
+    parser.add_argument("--chunk-chars", type=int, default=16, help="Characters per streamed chunk")
+    args = parser.parse_args()
+    app.state.latency = args.latency
+    app.state.jitter = args.jitter
+    app.state.error_rate = args.error_rate
+    app.state.ttft = args.ttft
+    app.state.chunk_chars = args.chunk_chars
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,34 @@
+"""LLM response cache report.
+
+Prints live entries and accumulated database hits per prompt family from the
+`llm_response_cache` table, optionally purging expired entries first. The
+per-process memory/db/miss split is available from
+`app.modules.llm.llm_cache.get_llm_cache_report()`.
+
+    python app/scripts/llm_cache_report.py [--purge]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.database.session import new_async_session
+from app.modules.llm.llm_repository import LLMCacheRepository
+
+
+async def run(purge: bool):
+    async with new_async_session() as session:
+        repository = LLMCacheRepository(session)
+        if purge:
+            print(f"Purged {await repository.delete_expired()} expired entries\n")
+        print(f"{'family':<24} {'entries':>8} {'hits':>8} {'hits/entry':>11}")
+        for row in await repository.get_family_stats():
+            print(f"{row.family:<24} {row.entries:>8} {row.hits:>8} {row.hits / row.entries:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--purge", action="store_true", help="Delete expired entries before reporting")
+    args = parser.parse_args()
+    asyncio.run(run(args.purge))
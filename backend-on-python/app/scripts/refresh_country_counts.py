@@ -0,0 +1,27 @@
+"""Recount institutions per country.
+
+The country_university_counts table is kept current by triggers on
+institutions; this rebuilds it from scratch, e.g. after restoring data with
+triggers disabled. Readers keep being served while it runs:
+
+    python app/scripts/refresh_country_counts.py
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.database.session import new_async_session
+from app.modules.universities.universities_repository import UniversitiesRepository
+
+
+async def run():
+    async with new_async_session() as session:
+        corrected = await UniversitiesRepository(session).rebuild_country_university_counts()
+    print(f"Corrected {corrected} country counters")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    asyncio.run(run())
@@ -0,0 +1,42 @@
+"""Background job worker.
+
+Polls the `jobs` table and runs due jobs, claiming them with
+`FOR UPDATE SKIP LOCKED` so any number of workers can run side by side.
+
+    python app/scripts/run_jobs_worker.py          # run until interrupted
+    python app/scripts/run_jobs_worker.py --once   # drain due jobs and exit
+"""
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.modules.jobs.jobs_worker import load_job_handlers, process_available_jobs, run_worker
+
+
+async def drain() -> None:
+    load_job_handlers()
+    total = 0
+    while processed := await process_available_jobs():
+        total += processed
+    print(f"Processed {total} jobs")
+
+
+async def main(once: bool) -> None:
+    if once:
+        await drain()
+        return
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await run_worker(stop)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--once", action="store_true", help="Process the jobs that are due and exit")
+    args = parser.parse_args()
+    asyncio.run(main(args.once))